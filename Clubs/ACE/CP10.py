@@ -1,6 +1,9 @@
 import re
+from time import perf_counter_ns
 from typing import List, Optional
 
+import parse_stats
+
 # --- Node class ---
 class Node:
     def __init__(self, type_: str, value: Optional[str] = None, require_grade: bool = False):
@@ -21,6 +24,9 @@ class Node:
 
 # --- Tokenizer ---
 def tokenize_segment(segment: str) -> List[str]:
+    stats = parse_stats.ACTIVE
+    if stats is not None:
+        start = perf_counter_ns()
     # Normalize and mark Grade phrases as a single token 'GRADE'
     seg = segment.strip()
     # common grade patterns -> single 'GRADE' token
@@ -52,6 +58,9 @@ def tokenize_segment(segment: str) -> List[str]:
             tokens.append(f"{m.group(1).upper()} {m.group(2)}")
         else:
             tokens.append(t.lower())
+    if stats is not None:
+        stats.add_time("tokenize", perf_counter_ns() - start)
+        stats.count("tokens", len(tokens))
     return tokens
 
 
@@ -61,6 +70,9 @@ def parse_segment(segment: str) -> Optional[Node]:
     if not tokens:
         return None
     pos = 0
+    stats = parse_stats.ACTIVE
+    if stats is not None:
+        start = perf_counter_ns()
 
     def peek(offset=0):
         return tokens[pos + offset] if pos + offset < len(tokens) else None
@@ -74,6 +86,8 @@ def parse_segment(segment: str) -> Optional[Node]:
 
     # factor: course (maybe cross-list A/B/... -> returns OR), concurrent, classification, exam
     def parse_factor() -> Optional[Node]:
+        if stats is not None:
+            stats.count("parse_factor")
         tk = peek()
         if tk is None:
             return None
@@ -111,6 +125,8 @@ def parse_segment(segment: str) -> Optional[Node]:
 
     # term: factors joined by AND (commas or 'and')
     def parse_term() -> Optional[Node]:
+        if stats is not None:
+            stats.count("parse_term")
         first = parse_factor()
         if first is None:
             return None
@@ -133,6 +149,8 @@ def parse_segment(segment: str) -> Optional[Node]:
 
     # expression: terms joined by OR (lowest precedence)
     def parse_expression() -> Optional[Node]:
+        if stats is not None:
+            stats.count("parse_expression")
         # handle leading GRADE flags: if present, we apply to the next term (and any OR composed of terms)
         grade_flag = False
         while peek() == 'grade':
@@ -179,12 +197,23 @@ def parse_segment(segment: str) -> Optional[Node]:
         # do not overwrite existing child flags; group-level flag is enough.
 
     root = parse_expression()
+    if stats is not None:
+        stats.add_time("descent", perf_counter_ns() - start)
+        if pos < len(tokens):
+            stats.count("tokens_dropped", len(tokens) - pos)
     return root
 
 
 # --- Top-level: split segments by ; and . and combine with AND at root ---
 def parse_text_to_tree(text: str) -> Node:
+    stats = parse_stats.ACTIVE
+    if stats is not None:
+        start = perf_counter_ns()
     raw_segments = [s.strip() for s in re.split(r'[;\.]', text) if s.strip()]
+    if stats is not None:
+        stats.add_time("split", perf_counter_ns() - start)
+        stats.count("texts")
+        stats.count("segments", len(raw_segments))
     children = []
     for seg in raw_segments:
         node = parse_segment(seg)
@@ -194,14 +223,15 @@ def parse_text_to_tree(text: str) -> Node:
         # ensure concurrent shows up as an OR child at same level by treating parse_segment result as a term.
         # (But parse_factor already returns CONCURRENT when present.)
         children.append(node)
-    if not children:
-        return Node("ROOT")
-    if len(children) == 1:
-        return Node("ROOT", children=children)
     root = Node("ROOT")
-    root.add(Node("AND"))
-    for c in children:
-        root.children[0].add(c)
+    if len(children) == 1:
+        root.add(children[0])
+    elif children:
+        root.add(Node("AND"))
+        for c in children:
+            root.children[0].add(c)
+    if stats is not None:
+        stats.add_time("parse_text_to_tree", perf_counter_ns() - start)
     return root
 
 
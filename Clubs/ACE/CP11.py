@@ -0,0 +1,347 @@
+"""
+CP11: CP10's grammar as a table-driven precedence-climbing (Pratt) parser.
+
+Produces the same Node trees as CP10.parse_text_to_tree, faster:
+
+- One regex scan per description (not four substitutions, two rewrites,
+  a findall and two re.match calls per token per segment). Each token is an
+  integer kind, plus its match for the span in the original text; "." and ";"
+  are BREAK tokens, so segments are ranges of the token array.
+- The parser never looks at token text except to build a COURSE value, and
+  dispatches on kind through tables: NUD (what a token starts), LBP (how
+  tightly an operator binds) and PREFIX (flags that may precede an operand).
+
+    level 1   expression   terms joined by "or"         OR node
+    level 2   term         factors joined by "," "and"  AND node
+    level 3   factor       NUD[kind]
+
+CP10's tolerance is kept exactly: an unknown token where a factor should be
+is consumed and yields nothing, an operand that yields nothing is skipped,
+and tokens left over at the end of a segment are dropped.
+"""
+import re
+from array import array
+from operator import attrgetter
+from time import perf_counter_ns
+from typing import NamedTuple, Optional
+
+import parse_stats
+from CP10 import Node, print_tree
+
+# --- Token kinds ---
+(T_END, T_GRADE, T_COURSE, T_OR, T_AND, T_SLASH, T_COMMA, T_BREAK, T_CONCURRENT, T_EXAM,
+ T_FRESHMAN, T_SOPHOMORE, T_JUNIOR, T_SENIOR, T_WORD) = range(15)
+
+# IGNORECASE makes sre fold the case of every character it compares, which is
+# most of the scan's cost, so the pattern spells case out instead: _ci("or") is
+# "[oO][rR]", plus the non-ASCII characters IGNORECASE also folds onto ASCII
+# letters (dotted/dotless i, long s, Kelvin sign), so it matches exactly what
+# CP10's IGNORECASE patterns match.
+_FOLD = {"i": "iI\u0130\u0131", "s": "sS\u017f", "k": "kK\u212a"}
+_LETTER = "A-Za-z\u0130\u0131\u017f\u212a"
+
+
+def _ci(word: str) -> str:
+    return "".join(f"[{_FOLD.get(c, c + c.upper())}]" if c.isalpha() else c for c in word)
+
+
+# Group n of TOKEN_RE is token kind n. The GRADE phrases are CP10's four substitutions
+# in the order CP10 applies them (under one shared "grade" prefix), then a bare
+# "grade"; the rest is CP10's token_re, with "\\s*" standing in for "\\s?" after CP10
+# collapses runs of whitespace. The leading lookaheads only fail fast: most positions in
+# a description are inside words, spaces or digits, where nothing can start.
+#
+# CP10 runs its substitutions one after another over the rewritten text, which
+# this single scan has to reproduce:
+# - A later substitution can match starting at the " GRADE " an earlier one
+#   put in ("grade of C or better in c or better in ..." is one GRADE), so a
+#   phrase absorbs what later substitutions would: _AFTER[n] is substitution n
+#   with its "grade" already matched.
+# - Substitution 2 runs on substitution 1's output: the space before a " GRADE "
+#   can be the one its "of" needs ("grade ofgrade of C or better in ..."), and
+#   it steps over each " GRADE " whole instead of finding "or better" inside.
+# - The spaces around " GRADE " end the word before it, so "seniorgrade of C or
+#   better" is "senior GRADE" to CP10: a keyword's \b also holds before a phrase.
+# - CP10 strips each segment before substituting, so the whitespace after a
+#   phrase's "in" can't be the whitespace that ends a segment.
+_CLASS = f"[{_LETTER}0-9\\/\\s]"
+_BETTER = f"{_ci('or')}\\s+{_ci('better')}"
+_PHRASE = f"{_CLASS}*?{_BETTER}"
+_IN = f"\\s+{_ci('in')}\\s+(?=[^\\s.;])"
+_C = f"{_ci('c')}\\s+{_BETTER}"
+_FIRST = f"{_ci('grade')}\\s+{_ci('of')}\\s+{_PHRASE}{_IN}"
+_AFTER = [None,
+          f"{_ci('of')}\\s+{_PHRASE}{_IN}",
+          f"{_ci('of')}(?:\\s+|(?={_FIRST}))(?:{_FIRST}|(?!{_FIRST}){_CLASS})*?{_BETTER}\\s*",
+          f"{_C}{_IN}",
+          f"{_C}\\s*"]
+
+
+def _then(first: int) -> str:
+    """Substitution `first`, then whatever the later substitutions absorb after its " GRADE " """
+    return f"\\s+{_AFTER[first]}" + "".join(f"(?:{_AFTER[n]})?" for n in range(first + 1, 5))
+
+
+_GRADE = f"{_ci('grade')}(?:{'|'.join(_then(n) for n in range(1, 5))})?"
+_END = f"(?:\\b|(?={_ci('grade')}\\s+(?:{_ci('of')}\\s+{_PHRASE}|{_AFTER[2]}|{_C})))"
+_OPERATORS = [f"({_ci('or')}{_END})", f"({_ci('and')}{_END})", "(/)", "(,)", "([;.])"]
+_KEYWORDS = [f"({_ci(word)}{_END})" for word in ("concurrent", "exam", "freshman", "sophomore", "junior", "senior")]
+_STARTS = "".join(_FOLD.get(c, c + c.upper()) for c in "oacefsj") + "/,;."
+TOKEN_RE = re.compile(
+    f"(?=[{_LETTER}/,;.])(?:"
+    f"({_GRADE})"
+    f"|([{_LETTER}]{{2,4}}\\s*\\d{{3}})"
+    f"|(?=[{_STARTS}])(?:{'|'.join(_OPERATORS + _KEYWORDS)}))")
+
+_kind = attrgetter("lastindex")
+CLASSIFICATION = {T_FRESHMAN: "Freshman", T_SOPHOMORE: "Sophomore", T_JUNIOR: "Junior", T_SENIOR: "Senior"}
+
+
+class Tokens(NamedTuple):
+    text: str
+    kinds: array        # "B": token kinds, ending with T_END
+    matches: list       # matches[i].span() is token i's span in text
+
+
+def tokenize(text: str) -> Tokens:
+    stats = parse_stats.ACTIVE
+    if stats is not None:
+        start = perf_counter_ns()
+    matches = list(TOKEN_RE.finditer(text))
+    kinds = array("B", map(_kind, matches))
+    if not text.isascii():
+        _unfold(kinds, matches)
+    kinds.append(T_END)
+    if stats is not None:
+        stats.add_time("tokenize", perf_counter_ns() - start)
+        stats.count("tokens", len(matches))
+    return Tokens(text, kinds, matches)
+
+
+def _unfold(kinds, matches):
+    """
+    A course code or keyword spelled with a non-ASCII fold (ſenior, CSCİ 221)
+    is one CP10 matches but then doesn't recognize: it becomes T_WORD. Digits
+    and whitespace in a course code may be any Unicode ones, as in CP10.
+    """
+    for i, kind in enumerate(kinds):
+        if kind == T_COURSE:
+            word = matches[i].group()[:-3]
+        elif kind != T_GRADE:
+            word = matches[i].group()
+        else:
+            continue
+        if not word.isascii():
+            kinds[i] = T_WORD
+
+
+def course_value(tokens: Tokens, i: int) -> str:
+    """'ecen\\n314' -> 'ECEN 314': letters, optional whitespace, three digits"""
+    raw = tokens.matches[i].group()
+    return raw[:-3].rstrip().upper() + " " + raw[-3:]
+
+
+# --- Tables ---
+N_KINDS = 15
+EXPRESSION, TERM = 1, 2
+OPERATOR = ("", "OR", "AND")                # level -> node type
+LBP = [0] * N_KINDS                         # level an infix token continues (0: it doesn't)
+LBP[T_OR] = EXPRESSION
+LBP[T_AND] = LBP[T_COMMA] = TERM
+PREFIX = [0] * N_KINDS                      # level whose operands a token may prefix
+PREFIX[T_GRADE] = EXPRESSION
+STOP = [False] * N_KINDS                    # a factor here yields nothing and consumes nothing
+STOP[T_END] = STOP[T_BREAK] = True
+
+
+def _nud_course(tokens, pos):
+    first = course_value(tokens, pos)
+    pos += 1
+    kinds = tokens.kinds
+    if kinds[pos] != T_SLASH:
+        return Node("COURSE", first), pos
+    # cross-listing: course (/ course)* -> OR of the courses
+    node = Node("OR")
+    node.add(Node("COURSE", first))
+    while kinds[pos] == T_SLASH:
+        pos += 1
+        if kinds[pos] != T_COURSE:
+            break
+        node.add(Node("COURSE", course_value(tokens, pos)))
+        pos += 1
+    return node, pos
+
+
+def _nud_concurrent(tokens, pos):
+    return Node("CONCURRENT/PASSED"), pos + 1
+
+
+def _nud_exam(tokens, pos):
+    return Node("COURSE", "EXAM"), pos + 1
+
+
+def _nud_classification(tokens, pos):
+    return Node("CLASSIFICATION", CLASSIFICATION[tokens.kinds[pos]]), pos + 1
+
+
+NUD = [None] * N_KINDS
+NUD[T_COURSE] = _nud_course
+NUD[T_CONCURRENT] = _nud_concurrent
+NUD[T_EXAM] = _nud_exam
+for _level in CLASSIFICATION:
+    NUD[_level] = _nud_classification
+
+
+# --- Parser ---
+def parse_expression(tokens: Tokens, pos: int):
+    """
+    (node or None, next position) for one expression starting at pos.
+
+    The two operator levels are loops rather than recursive calls (with two
+    levels the recursion is most of the cost), and a factor is NUD[kind] with
+    the common case, a lone course code, handled inline.
+    """
+    kinds, matches = tokens.kinds, tokens.matches
+    flagged = inner = False
+    while PREFIX[kinds[pos]] == EXPRESSION:
+        pos += 1
+        flagged = True
+    terms = []
+    while True:
+        factors = []
+        while True:
+            # factor
+            kind = kinds[pos]
+            if kind == T_COURSE and kinds[pos + 1] != T_SLASH:
+                raw = matches[pos].group()
+                node = Node("COURSE", raw[:-3].rstrip().upper() + " " + raw[-3:])
+                pos += 1
+            elif NUD[kind] is not None:
+                node, pos = NUD[kind](tokens, pos)
+            else:
+                node = None
+                if not STOP[kind]:
+                    pos += 1
+            if node is not None:
+                factors.append(node)
+            elif not factors:
+                break               # a term whose first factor yields nothing yields nothing
+            if LBP[kinds[pos]] != TERM:
+                break
+            pos += 1
+        if factors:
+            if len(factors) == 1:
+                term = factors[0]
+            else:
+                term = Node(OPERATOR[TERM])
+                term.children = factors
+            if inner:
+                term.require_grade = True
+            terms.append(term)
+        elif not terms:
+            return None, pos        # and so does an expression whose first term does
+        if LBP[kinds[pos]] != EXPRESSION:
+            break
+        pos += 1
+        inner = False
+        while PREFIX[kinds[pos]] == EXPRESSION:
+            pos += 1
+            inner = True
+    if len(terms) == 1:
+        result = terms[0]
+    else:
+        result = Node(OPERATOR[EXPRESSION])
+        result.children = terms
+    if flagged:
+        result.require_grade = True
+    return result, pos
+
+
+def parse_tokens(tokens: Tokens) -> Node:
+    """ROOT over every segment of a token array, as CP10.parse_text_to_tree builds it"""
+    kinds = tokens.kinds
+    children = []
+    pos = 0
+    end = len(kinds) - 1
+    segments = 0
+    while pos <= end:
+        if kinds[pos] != T_BREAK and kinds[pos] != T_END:
+            segments += 1
+            node, pos = parse_expression(tokens, pos)
+            if node is not None:
+                children.append(node)
+            while kinds[pos] != T_BREAK and kinds[pos] != T_END:
+                pos += 1        # dropped, as CP10 drops a segment's leftover tokens
+        pos += 1
+    root = Node("ROOT")
+    if len(children) == 1:
+        root.add(children[0])
+    elif children:
+        group = Node("AND")
+        group.children = children
+        root.add(group)
+    stats = parse_stats.ACTIVE
+    if stats is not None:
+        stats.count("segments", segments)
+    return root
+
+
+def parse_text_to_tree(text: str) -> Node:
+    stats = parse_stats.ACTIVE
+    if stats is not None:
+        start = perf_counter_ns()
+        stats.count("texts")
+    tokens = tokenize(text)
+    if stats is not None:
+        descent = perf_counter_ns()
+    root = parse_tokens(tokens)
+    if stats is not None:
+        now = perf_counter_ns()
+        stats.add_time("descent", now - descent)
+        stats.add_time("parse_text_to_tree", now - start)
+    return root
+
+
+def same_tree(a: Optional[Node], b: Optional[Node]) -> bool:
+    """Structural equality of two Node trees (Node has no __eq__)"""
+    if a is None or b is None:
+        return a is b
+    if (a.type, a.value, a.require_grade, len(a.children)) != (b.type, b.value, b.require_grade, len(b.children)):
+        return False
+    return all(same_tree(x, y) for x, y in zip(a.children, b.children))
+
+
+# ------------------ Tests ------------------
+if __name__ == "__main__":
+    import CP10
+
+    tests = [
+        "Prerequisites: Grade of C or better in COMM 205 or COMM 243 or ENGL 210; "
+        "grade of C or better in ECEN 314, ECEN 325, and ECEN 350/CSCE 350 or CSCE 350/ECEN 350; "
+        "grade of C or better in ECEN 303, ECEN 322, and ECEN 370, or grade C or better in CSCE 315 or CSCE 331, "
+        "and ECEN 303 or STAT 211, and ECEN 449 or CSCE 462, or concurrent enrollment; senior classification.",
+        "Prerequisite: ACCT 209 or ACCT 229.",
+        "Prerequisite: MATH 151 or acceptable score on exam; junior or senior classification.",
+        "Or ECEN 314, or CSCE 221.",                    # leading operator: segment yields nothing
+        "CSCE 221, or MATH 304 and, STAT 211",          # operand that yields nothing is skipped
+        "ECEN 350/ or CSCE350/csce 351/ENGR",           # dangling slash, unspaced and lowercase codes
+        "Grade of B or better in CSCE  221\nor MATH 151; major in engineering or better in CS 101.",
+        "Prerequisites: none.",
+        "",
+        "grade of C or better or concurrent enrollment in ECEN 314 or grade of B or better in MATH 151",
+        "Upgraded standing; sophomore, junior and senior; demand 123 or 456",
+        "ſenior or junior, CSCİ 221 or MATH\u00a0151",  # folds CP10 matches but doesn't recognize
+        # repeated and glued grade phrases, which CP10 rewrites one substitution at a time
+        "grade C or better in C or better in ecen 314 better C",
+        "grade of C or better in of grade of C or better in , better CSCE 221",
+        "Grade of B or better better MATH151 grade C or better in . in . exam in and",
+        "grade ofgrade of C or better in\nMATH 151/CSCE 221ofgrade C or better in",
+        "examgrade c or better; seniorgrade of C or better in CSCE 221 orgrade C or better in MATH 151",
+    ]
+    for text in tests:
+        assert same_tree(parse_text_to_tree(text), CP10.parse_text_to_tree(text)), text
+    print_tree(parse_text_to_tree(tests[0]))
+    tokens = tokenize("Grade of C or better in ECEN 314/CSCE 314.")
+    assert list(tokens.kinds) == [T_GRADE, T_COURSE, T_SLASH, T_COURSE, T_BREAK, T_END]
+    assert tokens.matches[1].span() == (24, 32) and course_value(tokens, 1) == "ECEN 314"
+    print("ok")
@@ -1,6 +1,7 @@
 import { useEffect, useState } from "react";
 import { parsePrereqs } from "./diagram_parser";
 import { evaluateTree } from "./evaluateTree";
+import { loadCourseTree } from "./loadChunk";
 import { RenderNode } from "./RenderNode";
 import type { Node, RootNode } from "./types";
 
@@ -18,6 +19,12 @@ export default function App({ course }: {course:string}) {
 
   useEffect(() => {
     async function load() {
+      const exported = await loadCourseTree(course);
+      if (exported) {
+        setRoot(exported);
+        return;
+      }
+
       const prereqJson = await fetch("/data_Spring2026_Prereq_test.json").then(
         (r) => r.json()
       );
@@ -42,7 +49,7 @@ export default function App({ course }: {course:string}) {
     }
 
     load();
-  }, []);
+  }, [course]);
 
   if (!root) return <div>Loading...</div>;
 
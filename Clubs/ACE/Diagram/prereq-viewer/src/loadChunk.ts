@@ -0,0 +1,42 @@
+import type { RootNode } from "./types";
+
+// Pre-evaluated trees written by `CommandLineTool.py export-viewer` into public/trees:
+// one <DEPT>.json chunk per department plus manifest.json. Statuses are already set,
+// so these roots can go straight to <RenderNode> without evaluateTree. App.tsx falls
+// back to parsing the full prereq file when nothing has been exported.
+
+interface Manifest {
+  catalog: string;
+  transcript: string;
+  departments: Record<string, { file: string; courses: number; met: number }>;
+}
+
+const BASE = "/trees";
+let manifest: Promise<Manifest> | null = null;
+const chunks = new Map<string, Promise<Record<string, RootNode>>>();
+
+function getManifest(): Promise<Manifest> {
+  // no export yet: the dev server answers with index.html, so r.json() rejects
+  manifest ??= fetch(`${BASE}/manifest.json`)
+    .then((r) => r.json())
+    .catch(() => ({ catalog: "", transcript: "", departments: {} }));
+  return manifest;
+}
+
+/**
+ * @param course "ECEN_403"
+ * @returns the course's annotated root, fetching only its department's chunk;
+ * null when the department or course wasn't exported
+ */
+export async function loadCourseTree(course: string): Promise<RootNode | null> {
+  const dept = course.split("_")[0];
+  const entry = (await getManifest()).departments[dept];
+  if (!entry) return null;
+
+  let chunk = chunks.get(dept);
+  if (!chunk) {
+    chunk = fetch(`${BASE}/${entry.file}`).then((r) => r.json());
+    chunks.set(dept, chunk);
+  }
+  return (await chunk)[course] ?? null;
+}
@@ -1,4 +1,5 @@
-export type NodeStatus = "met" | "needed";
+// "concurrent": met only through current enrollment (set by prereq_checker/viewer_export.py)
+export type NodeStatus = "met" | "needed" | "concurrent";
 
 export interface SingleNode {
   type: "single";
@@ -1,46 +1,152 @@
+import os
 import sys
+import json
 import argparse
 from pathlib import Path
+from pprint import pprint
 
 # Add parent directory to path so we can import from prereq_checker
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from prereq_checker import prereqchecker, parse_prereq, saveCoursesTaken, getCoursesTaken, updateTaken
+# and Clubs/ACE for the CP10 parser
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from prereq_checker import saveCoursesTaken, getCoursesTaken, updateTaken, load_catalog
+from prereq_checker.cache import cache_for
+from prereq_checker.diff import diff_catalogs, format_edit
+from prereq_checker.graph import CourseGraph, load_graph, rank_by_in_degree, department_degrees
+from prereq_checker.semesters import min_semesters
+from prereq_checker.near import distances, missing_courses, near_eligible
+from prereq_checker.simulate import Simulator
+from prereq_checker.eligibility import EligibilityMatrix, load_matrix
+from prereq_checker.index import CatalogIndex, parse_filter
+from prereq_checker.prefix import key_for, normalize_prefix, prefix_index_for, resolve
+from prereq_checker.compiled import evaluate
+from prereq_checker.compiled import Transcript, normalize_code
+from prereq_parser.coursecode import CourseCode
+from prereq_checker.viewer_export import export_viewer
+from CommandLine import TranscriptStore
+from prereq_parser.bulk_parse import parse_catalog, load_descriptions
+from prereq_parser.engines import get_engine
+import CP10
+import cpu_profile
+import memory_stats
+import parse_stats
 
 # Use absolute path relative to this script's location
 script_dir = Path(__file__).parent
 courses_file = script_dir / "coursesTaken.json"
 prereq_data_file = script_dir.parent / "data_Spring2026_Prereq_test (1).json"
+transcripts_db = script_dir / "transcripts.db"
+eligibility_file = script_dir / "eligibility.npy"
+
+FILTER_HELP = "Filter terms: CSCE, 'CSCE 4xx', 300-499, senior, class:junior, grade:B"
 
 
 def cmd_check(args):
     """Check if prerequisites are met for a course"""
-    coursesTaken, coursesEnrolled = getCoursesTaken(str(courses_file))
-    if coursesTaken is False:
-        print("Error: Could not load courses file")
+    try:
+        index = prefix_index_for(str(prereq_data_file))
+    except (OSError, ValueError):
+        index = None        # no catalog to search: the input has to be an exact code
+    if index is not None:
+        match = resolve(index, args.course)
+        if match.code is None:
+            if match.suggestions:
+                print(f"Error: {args.course} doesn't name one course. Did you mean:")
+                for code in match.suggestions:
+                    print(f"  {key_for(code)}")
+            else:
+                print(f"Error: Could not find {args.course} in the catalog")
+            return
+        course_name = key_for(match.code)
+        if normalize_prefix(args.course) != match.code:
+            print(f"Using {course_name}")
+    else:
+        course = CourseCode.parse(args.course)
+        if course is None:
+            print(f"Error: {args.course} is not a course code")
+            return
+        course_name = course.key
+    try:
+        cache = cache_for(str(prereq_data_file))
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load catalog: {e}")
+        return
+    try:
+        can_take = cache.check_file(str(courses_file), course_name, args.classification)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not read your courses: {e}")
         return
     
-    course_name = args.course.upper().replace(" ", "_")
-    prereq_bucket = parse_prereq(str(prereq_data_file), course_name)
-    
-    if prereq_bucket is False:
+    if can_take is None:
         print(f"Error: Could not find prerequisites for {course_name}")
         return
     
-    can_take = prereqchecker(coursesTaken, coursesEnrolled, prereq_bucket)
     print(f"\n{course_name} {'can be taken' if can_take else 'can NOT be taken'}")
 
 
+def cmd_complete(args):
+    """Course codes starting with a prefix, one per line, for shell completion"""
+    try:
+        index = prefix_index_for(args.catalog)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load catalog: {e}", file=sys.stderr)
+        return
+    for code in index.complete(args.prefix, args.limit):
+        print(key_for(code))
+
+
 def cmd_update_taken(args):
-    """Add courses to the taken list"""
-    courses = [c.upper().replace(" ", "_") for c in args.courses]
+    """
+    Add courses to the taken list. Each course takes its own grade ("CSCE221 B")
+    or else --grade; a course added with neither is ungraded, which check and
+    eligible both count as a D.
+    """
+    courses = [CourseCode.parse(c) for c in args.courses]
+    invalid = [raw for raw, c in zip(args.courses, courses) if c is None]
+    if invalid:
+        print(f"Error: not course codes: {', '.join(invalid)}")
+        return
+    grade = args.grade.upper() if args.grade else None
+    if grade is not None and grade not in ("A", "B", "C", "D", "F"):
+        print(f"Error: grade must be one of A, B, C, D, F (got {args.grade})")
+        return
+    courses = [str(c._replace(grade=c.grade or grade, concurrent=False)) for c in courses]
     if updateTaken(str(courses_file), courses):
         print(f"Successfully added: {', '.join(courses)}")
+        ungraded = [c for c in courses if " " not in c]
+        if ungraded:
+            print(f"No grade for {', '.join(ungraded)}: counted as a D (use --grade or 'CSCE221 B')")
     else:
         print("Error updating courses")
 
 
+def _select(args):
+    """(catalog, codes matching args.filter), or None after printing an error"""
+    try:
+        query = parse_filter(" ".join(args.filter))
+    except ValueError as e:
+        print(f"Error: {e}")
+        return None
+    try:
+        catalog = load_catalog(args.catalog)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load catalog: {e}")
+        return None
+    return catalog, CatalogIndex(catalog).select(query)
+
+
 def cmd_list(args):
-    """List all taken and enrolled courses"""
+    """List all taken and enrolled courses, or catalog courses matching a filter"""
+    if args.filter:
+        selected = _select(args)
+        if selected is None:
+            return
+        catalog, codes = selected
+        print(f"{len(codes)} courses match:")
+        for code in codes:
+            print(f"  - {catalog.name(code)}")
+        return
+
     coursesTaken, coursesEnrolled = getCoursesTaken(str(courses_file))
     if coursesTaken is False:
         print("Error: Could not load courses file")
@@ -55,30 +161,508 @@ def cmd_list(args):
         print(f"  - {course}")
 
 
+def cmd_eligible(args):
+    """Courses you can take now, optionally narrowed by a filter ("CSCE 4xx", "ECEN senior")"""
+    coursesTaken, coursesEnrolled = getCoursesTaken(str(courses_file))
+    if coursesTaken is False:
+        print("Error: Could not load courses file")
+        return
+    selected = _select(args)
+    if selected is None:
+        return
+    catalog, codes = selected
+    transcript = Transcript(coursesTaken, coursesEnrolled, args.classification, catalog.crosslist)
+    eligible = [code for code in codes if transcript.resolve(code) not in transcript.grades and evaluate(catalog.courses[code], transcript)]
+    print(f"You can take {len(eligible)} of {len(codes)} matching courses:")
+    for code in eligible:
+        print(f"  - {catalog.name(code)}")
+
+
+def cmd_near(args):
+    """Courses you are at most k courses away from being able to take, nearest first"""
+    coursesTaken, coursesEnrolled = getCoursesTaken(str(courses_file))
+    if coursesTaken is False:
+        print("Error: Could not load courses file")
+        return
+    selected = _select(args)
+    if selected is None:
+        return
+    catalog, codes = selected
+    transcript = Transcript(coursesTaken, coursesEnrolled, args.classification, catalog.crosslist)
+    distance = distances(catalog, transcript)
+    ranked = near_eligible(catalog, transcript, args.k, codes, distance)
+    near = [(code, d) for code, d in ranked if d > 0]
+    print(f"You can take {len(ranked) - len(near)} of {len(codes)} matching courses now (see eligible); "
+          f"{len(near)} more are within {args.k} course(s):")
+    for code, d in near[:args.limit]:
+        plan = ", ".join(catalog.name(c) for c in missing_courses(catalog, transcript, code, distance))
+        print(f"  {int(d)}  {catalog.name(code):<10} take {plan}")
+    if len(near) > args.limit:
+        print(f"  ... {len(near) - args.limit} more")
+
+
+def cmd_parse(args):
+    """Parse prerequisite text (or a descriptions file) with CP10, or another engine"""
+    if args.engine or os.environ.get("PREREQ_ENGINE"):
+        try:
+            engine = get_engine(args.engine)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        if args.file:
+            trees = {course: engine.parse(text) for course, text in load_descriptions(args.text)}
+            print(f"Parsed {len(trees)} courses with {engine.name}")
+        else:
+            pprint(engine.parse(args.text))
+        return
+
+    stats = parse_stats.ParseStats() if args.stats else None
+    if args.file:
+        trees = parse_catalog(load_descriptions(args.text), stats)
+        print(f"Parsed {len(trees)} courses")
+    else:
+        trees = parse_catalog([("input", args.text)], stats)
+        CP10.print_tree(trees["input"])
+
+    if stats is not None:
+        print()
+        print(stats.table())
+        if args.stats != "-":
+            stats.to_json(args.stats)
+            print(f"Saved stats to {args.stats}")
+
+
+def cmd_diff_catalog(args):
+    """Report which courses' prerequisites changed between two catalogs"""
+    try:
+        old = load_catalog(args.old)
+        new = load_catalog(args.new)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load catalog: {e}")
+        return
+
+    result = diff_catalogs(old, new)
+    print(f"{len(result['changed'])} changed, {len(result['added'])} added, "
+          f"{len(result['removed'])} removed, {result['unchanged']} unchanged")
+    for course in result["added"]:
+        print(f"\n+ {course}")
+    for course in result["removed"]:
+        print(f"\n- {course}")
+    for i, (course, edits) in enumerate(result["changed"].items()):
+        if args.limit is not None and i >= args.limit:
+            print(f"\n... {len(result['changed']) - args.limit} more changed courses")
+            break
+        print(f"\n~ {course}")
+        for edit in edits:
+            print(f"    {format_edit(edit)}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=4)
+        print(f"\nSaved diff to {args.json}")
+
+
+def cmd_graph(args):
+    """Build the catalog prerequisite graph, save it as .npz and print summary analytics"""
+    try:
+        if args.catalog.endswith(".npz"):
+            graph = load_graph(args.catalog)
+        else:
+            graph = CourseGraph.from_catalog(load_catalog(args.catalog))
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load catalog: {e}")
+        return
+    print(f"{graph.n} courses, {graph.m} prerequisite edges")
+
+    print("\nMost depended-on courses:")
+    for code, count in rank_by_in_degree(graph, args.top):
+        print(f"  {code:<10} {count}")
+
+    print("\nDepartments by fan-in (fan-in / fan-out):")
+    degrees = sorted(department_degrees(graph).items(), key=lambda item: -item[1][0])
+    for dept, (fan_in, fan_out) in degrees[:args.top]:
+        print(f"  {dept:<6} {fan_in:>7} / {fan_out}")
+
+    if args.out:
+        graph.save(args.out)
+        print(f"\nSaved graph to {args.out}")
+
+
+def cmd_semesters(args):
+    """Minimum semesters before each course can be taken, from your transcript"""
+    coursesTaken, coursesEnrolled = getCoursesTaken(str(courses_file))
+    if coursesTaken is False:
+        print("Error: Could not load courses file")
+        return
+    try:
+        catalog = load_catalog(args.catalog)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load catalog: {e}")
+        return
+
+    if catalog.integrity.cycles:
+        print(f"Warning: {len(catalog.integrity.cyclic)} courses are on prerequisite cycles (see the validate command)")
+    earliest = min_semesters(catalog, Transcript(coursesTaken, coursesEnrolled, args.classification, catalog.crosslist))
+    if not args.classification:
+        print("Note: no --classification given, so classification requirements count as never met")
+    if args.courses:
+        for course in args.courses:
+            code = normalize_code(course)
+            if code not in earliest:
+                print(f"Error: Could not find prerequisites for {course}")
+                continue
+            value = earliest[code]
+            when = "never (requirement can't be met)" if value == float("inf") else f"{int(value)} semester(s)"
+            print(f"{catalog.name(code)}: {when}")
+        return
+
+    counts = {}
+    for value in earliest.values():
+        counts[value] = counts.get(value, 0) + 1
+    print("Semesters until eligible:")
+    for value in sorted(counts):
+        label = "never" if value == float("inf") else int(value)
+        print(f"  {label:>5}: {counts[value]} courses")
+
+
+def cmd_simulate(args):
+    """Rank schedules of candidate courses by how many courses they unlock the term after"""
+    coursesTaken, coursesEnrolled = getCoursesTaken(str(courses_file))
+    if coursesTaken is False:
+        print("Error: Could not load courses file")
+        return
+    try:
+        catalog = load_catalog(args.catalog)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load catalog: {e}")
+        return
+
+    simulator = Simulator(catalog, args.grade)
+    schedules = simulator.run(Transcript(coursesTaken, coursesEnrolled, args.classification, catalog.crosslist),
+                              args.courses, args.load, args.top)
+    for course, reason in simulator.skipped.items():
+        print(f"Skipping {course}: {reason}")
+    if not schedules:
+        print("Error: No schedule can be built from these courses")
+        return
+    for rank, schedule in enumerate(schedules, 1):
+        names = ", ".join(catalog.name(code) for code in schedule.courses)
+        print(f"\n{rank}. {names}: unlocks {len(schedule.unlocked)}")
+        for code in schedule.unlocked:
+            print(f"     {catalog.name(code)}")
+    stats = simulator.stats()
+    print(f"\n{stats['schedules']} schedules scored, {stats['pruned']} branches pruned, "
+          f"{stats['evaluations']} evaluations ({stats['memo_hits']} memoized)")
+
+
+def cmd_validate(args):
+    """Report prerequisite cycles and references to courses missing from the catalog"""
+    try:
+        catalog = load_catalog(args.catalog)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load catalog: {e}")
+        return
+
+    report = catalog.integrity
+    print(f"{len(catalog)} courses: {report.summary()}")
+    if report.cycles:
+        print("\nCycles:")
+        for cycle in report.cycles[:args.limit]:
+            names = [catalog.name(code) for code in cycle]
+            print(f"  {', '.join(names)} depend on each other" if len(names) > 1 else f"  {names[0]} requires itself")
+    if report.dangling:
+        print("\nMissing from the catalog:")
+        for course, missing in list(report.dangling.items())[:args.limit]:
+            print(f"  {course}: {', '.join(missing)}")
+
+
+def cmd_export_viewer(args):
+    """Write per-department, status-annotated tree chunks for the prereq viewer"""
+    coursesTaken, coursesEnrolled = getCoursesTaken(str(courses_file))
+    if coursesTaken is False:
+        print("Error: Could not load courses file")
+        return
+    try:
+        catalog = load_catalog(args.catalog)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load catalog: {e}")
+        return
+
+    departments = {d.upper() for d in args.departments} if args.departments else None
+    manifest = export_viewer(catalog, Transcript(coursesTaken, coursesEnrolled, args.classification, catalog.crosslist), args.out, departments)
+    courses = sum(d["courses"] for d in manifest["departments"].values())
+    print(f"Exported {courses} courses in {len(manifest['departments'])} department chunks to {args.out}")
+
+
+def cmd_import(args):
+    """Stream a registrar CSV (student, course, grade, status) into the transcript store"""
+    def progress(rows, rejected, seconds):
+        rate = rows / seconds if seconds else 0
+        print(f"  {rows:,} rows imported, {rejected:,} rejected ({rate:,.0f} rows/sec)")
+
+    conn = TranscriptStore.openStore(args.db)
+    try:
+        result = TranscriptStore.importCsv(conn, args.csv, args.batch_size, progress)
+        if result is False:
+            print("Error: Could not import transcripts")
+            return
+        print(f"Imported {result[0]:,} rows for {TranscriptStore.countStudents(conn):,} students into {args.db}")
+    finally:
+        conn.close()
+
+
+def cmd_load_student(args):
+    """Replace coursesTaken.json with one student's courses from the transcript store"""
+    conn = TranscriptStore.openStore(args.db)
+    try:
+        if TranscriptStore.exportStudent(conn, args.student, str(courses_file)):
+            print(f"Loaded {args.student} into {courses_file.name}")
+        else:
+            print(f"Error: Could not load student {args.student}")
+    finally:
+        conn.close()
+
+
+def cmd_eligibility(args):
+    """Advisor queries against the precomputed students x courses eligibility matrix"""
+    if args.build or args.update:
+        try:
+            catalog = load_catalog(args.catalog)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not load catalog: {e}")
+            return
+        conn = TranscriptStore.openStore(args.db)
+        try:
+            if args.build:
+                transcripts = {student: {"taken": taken, "enrolled": enrolled}
+                               for student, taken, enrolled in TranscriptStore.iterStudents(conn)}
+                matrix = EligibilityMatrix.build(catalog, transcripts)
+                matrix.save(args.matrix)
+                print(f"Saved eligibility for {len(matrix):,} students x {len(matrix.codes):,} courses to {args.matrix}")
+            else:
+                matrix = load_matrix(args.matrix)
+                for student in args.update:
+                    taken, enrolled = TranscriptStore.getStudentCourses(conn, student)
+                    matrix.update(student, {"taken": taken, "enrolled": enrolled}, catalog)
+                matrix.save(args.matrix)
+                print(f"Updated {len(args.update)} student(s) in {args.matrix}")
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+        finally:
+            conn.close()
+        return
+
+    try:
+        matrix = load_matrix(args.matrix)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load eligibility matrix (run eligibility --build first): {e}")
+        return
+    if args.course:
+        try:
+            students = matrix.column(args.course)
+        except KeyError:
+            print(f"Error: {args.course} is not in the catalog")
+            return
+        print(f"{len(students)} of {len(matrix)} students can take {args.course}:")
+        for student in students[:args.limit]:
+            print(f"  {student}")
+    elif args.student:
+        if args.student not in matrix.rows:
+            print(f"Error: No student {args.student} in the matrix")
+            return
+        courses = matrix.row(args.student)
+        print(f"{args.student} can take {len(courses)} courses:")
+        for code in courses[:args.limit]:
+            print(f"  {code}")
+    else:
+        counts = matrix.column_counts()
+        print(f"{len(matrix):,} students x {len(matrix.codes):,} courses")
+        print("Courses the most students can take:")
+        for j in sorted(range(len(counts)), key=lambda j: -counts[j])[:args.limit]:
+            print(f"  {matrix.codes[j]:<10} {counts[j]}")
+
+
+def _bare_flags(argv, flags, commands):
+    """`--profile check ...` is the flag without a value, not a profile file named check"""
+    argv = list(argv)
+    for i, arg in enumerate(argv[:-1]):
+        if arg in commands:
+            break
+        if arg in flags and argv[i + 1] in commands:
+            argv[i] = f"{arg}={flags[arg]}"
+    return argv
+
+
+def _run(args):
+    """Dispatch the command, under cProfile with --profile (the pstats file is written even if it fails)"""
+    if not args.profile:
+        args.func(args)
+        return
+    out = None if args.profile == "-" else args.profile
+    result = cpu_profile.run(args.func, args, out=out, sample=args.profile_sample)
+    if result.stats is not None:
+        print()
+        print(f"Profile of {args.command} ({result.seconds:.3f} s):")
+        print(result.table(args.profile_top))
+        if out:
+            print(f"Saved profile to {out}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Course Prerequisite Checker")
+    parser.add_argument("--profile", nargs="?", const=cpu_profile.DEFAULT_OUT, metavar="OUT",
+                        help=f"Run the command under cProfile; write pstats to OUT (default {cpu_profile.DEFAULT_OUT}, "
+                             "'-' prints only the summary)")
+    parser.add_argument("--profile-top", type=int, default=cpu_profile.TOP, metavar="N",
+                        help="Rows in the --profile summary, by cumulative time")
+    parser.add_argument("--profile-sample", type=float, default=1.0, metavar="FRACTION",
+                        help="Profile only this fraction of runs (e.g. 0.05 in a scheduled job)")
+    parser.add_argument("--profile-memory", nargs="?", const="-", metavar="OUT",
+                        help="Trace memory while the command runs (catalog loading by phase); "
+                             "write JSON to OUT ('-' prints only the table)")
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
     # Check command
     check_parser = subparsers.add_parser("check", help="Check if you can take a course")
     check_parser.add_argument("course", help="Course code (e.g., CSCE_222 or 'CSCE 222')")
+    check_parser.add_argument("--classification", help="Your classification (Freshman ... Senior)")
     check_parser.set_defaults(func=cmd_check)
     
+    # Complete command
+    complete_parser = subparsers.add_parser("complete", help="Complete a course code (for shell completion)")
+    complete_parser.add_argument("prefix", nargs="?", default="", help="What has been typed so far (e.g. 'csce 2')")
+    complete_parser.add_argument("--catalog", default=str(prereq_data_file), help="Catalog file (bucket JSON or descriptions .jsonl)")
+    complete_parser.add_argument("--limit", type=int, default=50, help="Most completions to print")
+    complete_parser.set_defaults(func=cmd_complete)
+
     # Update taken command
     update_parser = subparsers.add_parser("updateTaken", help="Add courses to taken list")
-    update_parser.add_argument("courses", nargs="+", help="Course codes to add")
+    update_parser.add_argument("courses", nargs="+", help="Course codes to add, optionally with a grade ('CSCE221 B')")
+    update_parser.add_argument("--grade", help="Grade for courses given without one (A-F); ungraded courses count as a D")
     update_parser.set_defaults(func=cmd_update_taken)
     
     # List command
-    list_parser = subparsers.add_parser("list", help="List all courses")
+    list_parser = subparsers.add_parser("list", help="List all courses, or catalog courses matching a filter")
+    list_parser.add_argument("filter", nargs="*", help=FILTER_HELP)
+    list_parser.add_argument("--catalog", default=str(prereq_data_file), help="Catalog file (bucket JSON or descriptions .jsonl)")
     list_parser.set_defaults(func=cmd_list)
+
+    # Eligible command
+    eligible_parser = subparsers.add_parser("eligible", help="Courses you can take now, optionally filtered")
+    eligible_parser.add_argument("filter", nargs="*", help=FILTER_HELP)
+    eligible_parser.add_argument("--catalog", default=str(prereq_data_file), help="Catalog file (bucket JSON or descriptions .jsonl)")
+    eligible_parser.add_argument("--classification", help="Your classification (Freshman ... Senior)")
+    eligible_parser.set_defaults(func=cmd_eligible)
+
+    # Near command
+    near_parser = subparsers.add_parser("near", help="Courses you are one or two courses away from, nearest first")
+    near_parser.add_argument("filter", nargs="*", help=FILTER_HELP)
+    near_parser.add_argument("--k", type=int, default=2, help="Most courses still to take")
+    near_parser.add_argument("--catalog", default=str(prereq_data_file), help="Catalog file (bucket JSON or descriptions .jsonl)")
+    near_parser.add_argument("--classification", help="Your classification (Freshman ... Senior)")
+    near_parser.add_argument("--limit", type=int, default=50, help="Rows to show")
+    near_parser.set_defaults(func=cmd_near)
+
+    # Parse command
+    parse_parser = subparsers.add_parser("parse", help="Parse prerequisite text into a tree")
+    parse_parser.add_argument("text", help="Prerequisite text, or a descriptions file with --file")
+    parse_parser.add_argument("--file", action="store_true", help="Treat TEXT as a descriptions file (JSON lines or catalog JSON)")
+    parse_parser.add_argument("--stats", nargs="?", const="-", help="Print per-phase timings; also write JSON to this file")
+    parse_parser.add_argument("--engine", help="Parser engine to use (default: $PREREQ_ENGINE, else CP10 with its Node tree)")
+    parse_parser.set_defaults(func=cmd_parse)
+
+    # Diff catalog command
+    diff_parser = subparsers.add_parser("diff-catalog", help="Show prerequisite changes between two catalogs")
+    diff_parser.add_argument("old", help="Earlier catalog (bucket JSON, or descriptions .jsonl)")
+    diff_parser.add_argument("new", help="Later catalog")
+    diff_parser.add_argument("--limit", type=int, help="Print at most this many changed courses")
+    diff_parser.add_argument("--json", help="Also write the full diff as JSON to this file")
+    diff_parser.set_defaults(func=cmd_diff_catalog)
+
+    # Graph command
+    graph_parser = subparsers.add_parser("graph", help="Export the prerequisite graph and show graph analytics")
+    graph_parser.add_argument("catalog", help="Catalog (bucket JSON or descriptions .jsonl), or a saved graph .npz")
+    graph_parser.add_argument("--out", help="Save the CSR arrays to this .npz file")
+    graph_parser.add_argument("--top", type=int, default=10, help="Rows to show per ranking")
+    graph_parser.set_defaults(func=cmd_graph)
+
+    # Semesters command
+    semesters_parser = subparsers.add_parser("semesters", help="Minimum semesters before you can take each course")
+    semesters_parser.add_argument("courses", nargs="*", help="Courses to report (default: a summary of the whole catalog)")
+    semesters_parser.add_argument("--catalog", default=str(prereq_data_file), help="Catalog file (bucket JSON or descriptions .jsonl)")
+    semesters_parser.add_argument("--classification", help="Your classification (Freshman ... Senior)")
+    semesters_parser.set_defaults(func=cmd_semesters)
+
+    # Simulate command
+    simulate_parser = subparsers.add_parser("simulate", help="What-if: which candidate courses next term unlock the most the term after")
+    simulate_parser.add_argument("courses", nargs="+", help="Candidate courses for next term")
+    simulate_parser.add_argument("--load", type=int, default=4, help="Courses per schedule")
+    simulate_parser.add_argument("--top", type=int, default=5, help="Schedules to show")
+    simulate_parser.add_argument("--grade", default="C", type=str.upper, choices=list("ABCDF"),
+                                 help="Grade assumed for scheduled and enrolled courses")
+    simulate_parser.add_argument("--catalog", default=str(prereq_data_file), help="Catalog file (bucket JSON or descriptions .jsonl)")
+    simulate_parser.add_argument("--classification", help="Your classification (Freshman ... Senior)")
+    simulate_parser.set_defaults(func=cmd_simulate)
+
+    # Validate command
+    validate_parser = subparsers.add_parser("validate", help="Find prerequisite cycles and dangling course references")
+    validate_parser.add_argument("--catalog", default=str(prereq_data_file), help="Catalog file (bucket JSON or descriptions .jsonl)")
+    validate_parser.add_argument("--limit", type=int, default=20, help="Rows to show per section")
+    validate_parser.set_defaults(func=cmd_validate)
+
+    # Export viewer command
+    export_parser = subparsers.add_parser("export-viewer", help="Export status-annotated trees for the prereq viewer")
+    export_parser.add_argument("--catalog", default=str(prereq_data_file), help="Catalog file (bucket JSON or descriptions .jsonl)")
+    export_parser.add_argument("--out", default=str(script_dir.parent.parent / "Diagram" / "prereq-viewer" / "public" / "trees"),
+                               help="Output directory for <DEPT>.json chunks and manifest.json")
+    export_parser.add_argument("--departments", nargs="+", help="Only export these departments")
+    export_parser.add_argument("--classification", help="Your classification (Freshman ... Senior)")
+    export_parser.set_defaults(func=cmd_export_viewer)
+
+    # Import command
+    import_parser = subparsers.add_parser("import", help="Import a registrar CSV into the transcript store")
+    import_parser.add_argument("csv", help="CSV of student, course, grade, status (header row optional)")
+    import_parser.add_argument("--db", default=str(transcripts_db), help="Transcript store (SQLite)")
+    import_parser.add_argument("--batch-size", type=int, default=50000, help="Rows per transaction")
+    import_parser.set_defaults(func=cmd_import)
+
+    # Load student command
+    load_parser = subparsers.add_parser("loadStudent", help="Use a student from the transcript store as coursesTaken.json")
+    load_parser.add_argument("student", help="Student id as it appears in the imported CSV")
+    load_parser.add_argument("--db", default=str(transcripts_db), help="Transcript store (SQLite)")
+    load_parser.set_defaults(func=cmd_load_student)
+    
+    # Eligibility command
+    eligibility_parser = subparsers.add_parser("eligibility", help="Which students can take a course / what a student can take")
+    eligibility_parser.add_argument("--course", help="List students who can take this course")
+    eligibility_parser.add_argument("--student", help="List courses this student can take")
+    eligibility_parser.add_argument("--build", action="store_true", help="Rebuild the matrix from the transcript store (no classifications: those clauses count as unmet)")
+    eligibility_parser.add_argument("--update", nargs="+", metavar="STUDENT", help="Recompute these students from the transcript store")
+    eligibility_parser.add_argument("--matrix", default=str(eligibility_file), help="Eligibility matrix (.npy, with a .json alongside)")
+    eligibility_parser.add_argument("--db", default=str(transcripts_db), help="Transcript store (SQLite)")
+    eligibility_parser.add_argument("--catalog", default=str(prereq_data_file), help="Catalog file (bucket JSON or descriptions .jsonl)")
+    eligibility_parser.add_argument("--limit", type=int, default=50, help="Rows to show")
+    eligibility_parser.set_defaults(func=cmd_eligibility)
     
-    args = parser.parse_args()
+    flags = {"--profile": cpu_profile.DEFAULT_OUT, "--profile-memory": "-"}
+    args = parser.parse_args(_bare_flags(sys.argv[1:], flags, subparsers.choices))
     
     if args.command is None:
         parser.print_help()
+    elif args.profile_memory:
+        profile = memory_stats.enable()
+        try:
+            _run(args)
+        finally:
+            memory_stats.mark(args.command)
+            memory_stats.disable()
+            print()
+            print(profile.table())
+            if args.profile_memory != "-":
+                profile.to_json(args.profile_memory)
+                print(f"Saved memory profile to {args.profile_memory}")
     else:
-        args.func(args)
+        _run(args)
 
 
 if __name__ == "__main__":
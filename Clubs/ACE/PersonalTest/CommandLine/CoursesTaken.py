@@ -1,5 +1,18 @@
 import json
 
+from prereq_parser.coursecode import CourseCode
+
+# Called as listener(filename, taken, enrolled) after every successful save
+_saveListeners = []
+
+def addSaveListener(listener):
+    if listener not in _saveListeners:
+        _saveListeners.append(listener)
+
+def removeSaveListener(listener):
+    if listener in _saveListeners:
+        _saveListeners.remove(listener)
+
 def getCoursesTaken(filename):
     with open(filename, "r") as f:
         try:
@@ -10,23 +23,37 @@ def getCoursesTaken(filename):
         except Exception as e:
             print(f"error loading classes history: {e}")
             return False
+
+def getCourseCodes(filename):
+    """(taken, enrolled) as CourseCode lists; entries that aren't course codes are dropped"""
+    courses = getCoursesTaken(filename)
+    if courses is False:
+        return False
+    taken, enrolled = courses
+    return ([c for c in map(CourseCode.parse, taken) if c],
+            [c for c in map(CourseCode.parse, enrolled) if c])
         
 def saveCoursesTaken(filename, taken, enrolled):
     try:
         with open(filename, "w") as f:
             data = {"taken": taken, "enrolled": enrolled}
             json.dump(data, f, indent=4)
-        return True
     except Exception as e:
         print(f"error saving json {e}")
         return False
+    for listener in list(_saveListeners):
+        try:
+            listener(filename, taken, enrolled)
+        except Exception as e:
+            print(f"error in save listener: {e}")
+    return True
 
 def updateTaken(filename, newTaken):
     try:
         taken, enrolled = getCoursesTaken(filename)
         if taken is False:
             return False
-        taken.extend(newTaken)
+        taken.extend(map(str, newTaken))
         return saveCoursesTaken(filename, taken, enrolled)
     except Exception as e:
         print(f"error updating classes: {e}")
@@ -37,7 +64,7 @@ def updateEnrolled(filename, newEnrolled):
         taken, enrolled = getCoursesTaken(filename)
         if enrolled is False:
             return False
-        enrolled.extend(newEnrolled)
+        enrolled.extend(map(str, newEnrolled))
         return saveCoursesTaken(filename, taken, enrolled)
     except Exception as e:
         print(f"error updating classes: {e}")
@@ -48,8 +75,8 @@ def updateTakenEnrolled(filename, newTaken=[], newEnrolled=[]):
         taken, enrolled = getCoursesTaken(filename)
         if taken or enrolled is False:
             return False
-        taken.extend(newTaken)
-        enrolled.extend(newEnrolled)
+        taken.extend(map(str, newTaken))
+        enrolled.extend(map(str, newEnrolled))
         return saveCoursesTaken(filename, taken, enrolled)
     except Exception as e:
         print(f"error updating classes: {e}")
@@ -0,0 +1,198 @@
+"""
+SQLite transcript store for whole cohorts.
+
+coursesTaken.json holds one student; registrar exports hold hundreds of
+thousands of rows. importCsv streams a CSV (student, course, grade, status)
+into the store in large batched transactions, so memory stays at one batch
+whatever the file size. Course codes are normalized to the checker's format
+("CSCE 221", "csce_221" -> "CSCE221"); a retaken course keeps its best grade.
+A taken row must carry a letter grade A-F ("B+" and "C-" count as B and C) or
+none at all; W, Q, I, NG, S/U and the like never satisfy a prerequisite, so
+those rows are rejected rather than stored as ungraded (which counts as a D).
+
+getStudentCourses returns (taken, enrolled) in the same shape as
+getCoursesTaken, and exportStudent writes a coursesTaken.json for one student.
+"""
+import csv
+import sqlite3
+import time
+from itertools import groupby
+
+from CommandLine.CoursesTaken import saveCoursesTaken
+from prereq_parser.coursecode import CourseCode
+
+TAKEN_STATUSES = {"taken", "completed", "complete", "passed", "graded", "transfer"}
+ENROLLED_STATUSES = {"enrolled", "in progress", "in-progress", "inprogress", "current", "registered"}
+GRADES = set("ABCDF")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    student TEXT NOT NULL,
+    course  TEXT NOT NULL,
+    grade   TEXT,
+    status  TEXT NOT NULL,
+    PRIMARY KEY (student, course, status)
+)
+"""
+
+# keep the best grade when a course shows up twice ('A' < 'B' < ... < 'F')
+UPSERT = """
+INSERT INTO courses (student, course, grade, status) VALUES (?, ?, ?, ?)
+ON CONFLICT (student, course, status) DO UPDATE SET grade = CASE
+    WHEN excluded.grade IS NOT NULL AND (grade IS NULL OR excluded.grade < grade) THEN excluded.grade
+    ELSE grade END
+"""
+
+
+def openStore(filename):
+    conn = sqlite3.connect(filename)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(SCHEMA)
+    return conn
+
+
+def normalizeCourse(raw):
+    """'CSCE 221', 'csce_221', 'CSCE221' -> 'CSCE221', or None"""
+    course = CourseCode.parse(raw)
+    if course is None or course.grade or course.concurrent:
+        return None
+    return course.code
+
+
+def normalizeRow(row):
+    """(student, course, grade, status) -> a store row, or None if it can't be used"""
+    if len(row) < 4:
+        return None
+    student, course, grade, status = (field.strip() for field in row[:4])
+    code = normalizeCourse(course)
+    status = status.lower()
+    if not student or code is None:
+        return None
+    if status in TAKEN_STATUSES:
+        status = "taken"
+    elif status in ENROLLED_STATUSES:
+        status = "enrolled"
+    else:
+        return None
+    if status == "enrolled":
+        return (student, code, None, status)
+    grade = grade.upper().rstrip("+-")
+    if not grade:
+        return (student, code, None, status)
+    if grade not in GRADES:
+        return None
+    return (student, code, grade, status)
+
+
+def _rows(f):
+    """CSV rows as [student, course, grade, status]; a header row may name the columns in any order"""
+    reader = csv.reader(f)
+    first = next(reader, None)
+    if first is None:
+        return
+    names = [name.strip().lower() for name in first]
+    if "student" in names and "course" in names:
+        order = [names.index(col) if col in names else None for col in ("student", "course", "grade", "status")]
+        for row in reader:
+            yield [row[i] if i is not None and i < len(row) else "" for i in order]
+    else:
+        yield first
+        yield from reader
+
+
+def importCsv(conn, filename, batchSize=50000, progress=None):
+    """
+    Stream filename into the store, committing every batchSize rows.
+    progress(rows, rejected, seconds) is called after each batch.
+    Returns (rows imported, rows rejected), or False if the file can't be read.
+    """
+    imported = rejected = 0
+    start = time.perf_counter()
+    try:
+        with open(filename, newline="") as f:
+            batch = []
+            for row in _rows(f):
+                normalized = normalizeRow(row)
+                if normalized is None:
+                    rejected += 1
+                    continue
+                batch.append(normalized)
+                if len(batch) >= batchSize:
+                    with conn:
+                        conn.executemany(UPSERT, batch)
+                    imported += len(batch)
+                    batch.clear()
+                    if progress:
+                        progress(imported, rejected, time.perf_counter() - start)
+            if batch:
+                with conn:
+                    conn.executemany(UPSERT, batch)
+                imported += len(batch)
+            if progress:
+                progress(imported, rejected, time.perf_counter() - start)
+    except (OSError, csv.Error, sqlite3.Error) as e:
+        print(f"error importing transcripts: {e}")
+        return False
+    return (imported, rejected)
+
+
+def _split(rows):
+    """(course, grade, status) rows -> (taken, enrolled) in the checker's formats ("CSCE221 A", "CSCE313 ^")"""
+    taken, enrolled = [], []
+    for course, grade, status in rows:
+        if status == "taken":
+            taken.append(f"{course} {grade}" if grade else course)
+        else:
+            enrolled.append(f"{course} ^")
+    return (taken, enrolled)
+
+
+def getStudentCourses(conn, student):
+    """(taken, enrolled) for one student in the checker's formats ("CSCE221 A", "CSCE313 ^")"""
+    return _split(conn.execute(
+        "SELECT course, grade, status FROM courses WHERE student = ? ORDER BY course", (student,)))
+
+
+def iterStudents(conn):
+    """(student, taken, enrolled) for every student, in one pass over the store"""
+    rows = conn.execute("SELECT student, course, grade, status FROM courses ORDER BY student, course")
+    for student, group in groupby(rows, key=lambda row: row[0]):
+        taken, enrolled = _split(row[1:] for row in group)
+        yield (student, taken, enrolled)
+
+
+def exportStudent(conn, student, filename):
+    """Write one student's courses as a coursesTaken.json"""
+    taken, enrolled = getStudentCourses(conn, student)
+    if not taken and not enrolled:
+        print(f"error exporting transcript: no courses for student {student}")
+        return False
+    return saveCoursesTaken(filename, taken, enrolled)
+
+
+def countStudents(conn):
+    return conn.execute("SELECT COUNT(DISTINCT student) FROM courses").fetchone()[0]
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    assert normalizeRow(["s1", "CSCE 221", "B+", "Completed"]) == ("s1", "CSCE221", "B", "taken")
+    assert normalizeRow(["s1", "CSCE 221", "", "transfer"]) == ("s1", "CSCE221", None, "taken")
+    assert normalizeRow(["s1", "CSCE 313", "IP", "enrolled"]) == ("s1", "CSCE313", None, "enrolled")
+    for grade in ("W", "Q", "I", "NG", "S", "U", "DR"):
+        assert normalizeRow(["s1", "CSCE 221", grade, "taken"]) is None, grade
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csvFile = os.path.join(tmp, "cohort.csv")
+        with open(csvFile, "w", newline="") as f:
+            csv.writer(f).writerows([["student", "course", "grade", "status"],
+                                     ["s1", "CSCE 221", "W", "taken"], ["s1", "CSCE 221", "C", "taken"],
+                                     ["s1", "CSCE 120", "Q", "taken"], ["s1", "CSCE 313", "", "enrolled"]])
+        conn = openStore(os.path.join(tmp, "store.db"))
+        assert importCsv(conn, csvFile) == (2, 2)
+        assert getStudentCourses(conn, "s1") == (["CSCE221 C"], ["CSCE313 ^"])
+        conn.close()
+    print("ok")
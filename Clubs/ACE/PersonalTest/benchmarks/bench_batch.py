@@ -0,0 +1,59 @@
+"""
+Batch eligibility throughput against worker count.
+
+Generates a synthetic catalog and transcripts, then times
+prereq_checker.batch.evaluate_batch with each --processes value.
+
+    python benchmarks/bench_batch.py --courses 5000 --students 2000 --processes 1 2 4 8
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from prereq_checker.batch import evaluate_batch
+from prereq_checker.catalog import catalog_from_json
+from synthetic.generator import generate_catalog_entry, generate_transcripts
+
+
+def run(courses, students, processes, seed=0):
+    catalog = catalog_from_json(dict(generate_catalog_entry(i, seed, courses) for i in range(courses)))
+    transcripts = list(generate_transcripts(students, courses, seed))
+    rows = []
+    baseline = None
+    for n in processes:
+        start = time.perf_counter()
+        results = evaluate_batch(catalog, transcripts, processes=n)
+        seconds = time.perf_counter() - start
+        if baseline is None:
+            baseline = results
+        elif results != baseline:
+            raise AssertionError(f"processes={n} disagrees with processes={processes[0]}")
+        rows.append({"processes": n, "seconds": seconds, "students_per_sec": students / seconds})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time batch evaluation across worker counts")
+    parser.add_argument("--courses", type=int, default=5000, help="Catalog size")
+    parser.add_argument("--students", type=int, default=2000, help="Transcripts to evaluate")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to time")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--out", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    rows = run(args.courses, args.students, args.processes, args.seed)
+    base = rows[0]["seconds"]
+    print(f"{'processes':>9} {'seconds':>9} {'students/s':>11} {'speedup':>8}")
+    for row in rows:
+        print(f"{row['processes']:>9} {row['seconds']:>9.2f} {row['students_per_sec']:>11,.0f} {base / row['seconds']:>7.2f}x")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"courses": args.courses, "students": args.students, "results": rows}, f, indent=4)
+        print(f"\nSaved results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
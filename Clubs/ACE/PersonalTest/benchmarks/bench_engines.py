@@ -0,0 +1,116 @@
+"""
+Head-to-head benchmark of every registered parser engine.
+
+Runs each engine in prereq_parser/engines.py on the same synthetic corpus and
+reports throughput, peak memory, accuracy against the generator's expected
+trees and agreement with a reference engine.
+
+    python benchmarks/bench_engines.py --size 5000 --out engines.json
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from prereq_parser.engines import ENGINES, DEFAULT_ENGINE, canonical, EMPTY
+from synthetic.generator import generate_course, generate_expected
+
+
+def build_corpus(size, seed):
+    texts = [generate_course(i, seed, size)[1] for i in range(size)]
+    expected = [canonical(generate_expected(i, seed)) or EMPTY for i in range(size)]
+    return texts, expected
+
+
+def run_engine(engine, texts):
+    """(trees, seconds, errors); a text the engine raises on counts as an error and an empty tree"""
+    trees = []
+    errors = 0
+    gc.collect()
+    start = time.perf_counter()
+    for text in texts:
+        try:
+            trees.append(engine.parse(text))
+        except Exception:
+            errors += 1
+            trees.append(None)
+    return trees, time.perf_counter() - start, errors
+
+
+def peak_memory(engine, texts):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = []
+        for text in texts:
+            try:
+                kept.append(engine.parse_raw(text))
+            except Exception:
+                pass
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return peak
+
+
+def agreement(a, b):
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a) if a else 0.0
+
+
+def run(names, size, seed=0, reference=DEFAULT_ENGINE, memory=True):
+    texts, expected = build_corpus(size, seed)
+    outputs = {}
+    rows = []
+    for name in names:
+        engine = ENGINES[name]
+        trees, seconds, errors = run_engine(engine, texts)
+        outputs[name] = trees
+        rows.append({
+            "engine": name,
+            "size": size,
+            "seconds": seconds,
+            "courses_per_sec": size / seconds if seconds else None,
+            "errors": errors,
+            "accuracy": agreement(trees, expected),
+            "peak_bytes": peak_memory(engine, texts) if memory else None,
+        })
+    ref = outputs.get(reference)
+    for row in rows:
+        row["agreement_with_" + reference] = agreement(outputs[row["engine"]], ref) if ref else None
+    return rows
+
+
+def print_rows(rows, reference):
+    key = "agreement_with_" + reference
+    print(f"{'engine':<18} {'courses/s':>12} {'errors':>7} {'accuracy':>9} {'vs ' + reference:>10} {'peak MiB':>9}")
+    for row in sorted(rows, key=lambda r: (-r["accuracy"], -r["courses_per_sec"])):
+        peak = f"{row['peak_bytes'] / 2**20:9.1f}" if row["peak_bytes"] is not None else "      n/a"
+        vs = f"{row[key]:>10.1%}" if row[key] is not None else "       n/a"
+        print(f"{row['engine']:<18} {row['courses_per_sec']:>12,.0f} {row['errors']:>7} {row['accuracy']:>9.1%} {vs} {peak}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare parser engines on one corpus")
+    parser.add_argument("--size", type=int, default=5000, help="Descriptions to generate")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES), help="Engines to run")
+    parser.add_argument("--reference", default=DEFAULT_ENGINE, help="Engine the agreement rate is measured against")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak memory pass")
+    parser.add_argument("--out", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    rows = run(args.engines, args.size, args.seed, args.reference, memory=not args.no_memory)
+    print_rows(rows, args.reference)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"size": args.size, "seed": args.seed, "reference": args.reference, "results": rows}, f, indent=4)
+        print(f"\nSaved results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
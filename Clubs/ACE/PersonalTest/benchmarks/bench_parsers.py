@@ -0,0 +1,186 @@
+"""
+Parser throughput benchmarks on synthetic catalogs.
+
+Times the tokenizers and parsers of CP10, CP11, CP9_test and CourseParser8_v2 on
+generated catalogs and reports courses/sec, tokens/sec and peak memory.
+
+    python benchmarks/bench_parsers.py --sizes 1000 10000 --out results.json
+    python benchmarks/bench_parsers.py --sizes 1000 --compare results.json
+"""
+import argparse
+import gc
+import json
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# PersonalTest (synthetic/) and Clubs/ACE (CP10, CP11, CP9_test, CourseParser8_v2)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import CP10
+import CP11
+import CP9_test
+import CourseParser8_v2
+from synthetic.generator import generate_descriptions
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def split_segments(text):
+    """Same segment split the tree parsers do before tokenizing"""
+    return [s.strip() for s in re.split(r'[;\.]', text) if s.strip()]
+
+
+# name -> (unit, tokenizer used for the token count, function)
+# unit "segment" targets are fed one segment at a time, "text" targets the full description
+TARGETS = {
+    "CP10.tokenize_segment": ("segment", CP10.tokenize_segment, CP10.tokenize_segment),
+    "CP10.parse_segment": ("segment", CP10.tokenize_segment, CP10.parse_segment),
+    "CP10.parse_text_to_tree": ("text", CP10.tokenize_segment, CP10.parse_text_to_tree),
+    "CP11.tokenize": ("text", CP10.tokenize_segment, CP11.tokenize),
+    "CP11.parse_text_to_tree": ("text", CP10.tokenize_segment, CP11.parse_text_to_tree),
+    "CP9.tokenize_segment": ("segment", CP9_test.tokenize_segment, CP9_test.tokenize_segment),
+    "CP9.parse_segment_to_node": ("segment", CP9_test.tokenize_segment, CP9_test.parse_segment_to_node),
+    "CP9.parse_text_to_tree": ("text", CP9_test.tokenize_segment, CP9_test.parse_text_to_tree),
+    "CP9.parse_prerequisites": ("text", CP9_test.tokenize_segment, CP9_test.parse_prerequisites),
+    "CourseParser8_v2.parse_prerequisites": ("text", CP10.tokenize_segment, CourseParser8_v2.parse_prerequisites),
+}
+
+
+def build_corpus(size, seed):
+    texts = [text for _, text in generate_descriptions(size, seed)]
+    segments = [seg for text in texts for seg in split_segments(text)]
+    return texts, segments
+
+
+def count_tokens(tokenizer, segments):
+    return sum(len(tokenizer(seg)) for seg in segments)
+
+
+def time_target(func, inputs, repeat):
+    """Best wall time over `repeat` runs, with the GC off while timing"""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for item in inputs:
+                func(item)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak_memory(func, inputs):
+    """Peak traced bytes while running `func` over the inputs, keeping every result alive"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        results = [func(item) for item in inputs]
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+    return peak
+
+
+def run(sizes, targets, seed=0, repeat=3, memory=True):
+    results = []
+    for size in sizes:
+        texts, segments = build_corpus(size, seed)
+        token_counts = {}
+        for name in targets:
+            unit, tokenizer, func = TARGETS[name]
+            if tokenizer not in token_counts:
+                token_counts[tokenizer] = count_tokens(tokenizer, segments)
+            inputs = segments if unit == "segment" else texts
+            seconds = time_target(func, inputs, repeat)
+            row = {
+                "target": name,
+                "size": size,
+                "inputs": len(inputs),
+                "seconds": seconds,
+                "courses_per_sec": size / seconds if seconds else None,
+                "tokens_per_sec": token_counts[tokenizer] / seconds if seconds else None,
+                "peak_bytes": peak_memory(func, inputs) if memory else None,
+            }
+            results.append(row)
+            print(format_row(row))
+    return results
+
+
+def format_row(row):
+    peak = f"{row['peak_bytes'] / 2**20:9.1f} MiB" if row["peak_bytes"] is not None else "        n/a"
+    return (f"{row['target']:<38} n={row['size']:<7} {row['seconds']:8.3f}s "
+            f"{row['courses_per_sec']:>12,.0f} courses/s {row['tokens_per_sec']:>13,.0f} tokens/s {peak}")
+
+
+def compare(baseline, results, threshold):
+    """
+    Compare against a saved run. A target regresses when its courses/sec drops,
+    or its peak memory grows, by more than `threshold` (a fraction).
+    """
+    previous = {(r["target"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for row in results:
+        old = previous.get((row["target"], row["size"]))
+        if old is None:
+            continue
+        speed = row["courses_per_sec"] / old["courses_per_sec"] - 1
+        if speed < -threshold:
+            regressions.append(f"{row['target']} n={row['size']}: throughput {speed:+.1%}")
+        if row["peak_bytes"] and old.get("peak_bytes"):
+            mem = row["peak_bytes"] / old["peak_bytes"] - 1
+            if mem > threshold:
+                regressions.append(f"{row['target']} n={row['size']}: peak memory {mem:+.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parser throughput benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Catalog sizes to generate")
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS), help="Functions to time")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per target (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak memory pass")
+    parser.add_argument("--out", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown / memory growth (fraction)")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.targets, seed=args.seed, repeat=args.repeat, memory=not args.no_memory)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"\nSaved results to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.threshold)
+        if regressions:
+            print(f"\nREGRESSIONS (threshold {args.threshold:.0%}):")
+            for r in regressions:
+                print(f"  - {r}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+One shared catalog under concurrent evaluation.
+
+Generates a synthetic catalog once, then has a thread pool evaluate every
+course for every transcript against that same Catalog object, --rounds times
+for each --threads value. Nothing is copied per thread or per check. After each
+run it verifies that
+- every thread's answers match a single-threaded reference,
+- catalog.courses still holds the very same tree objects (`is`, not ==), and
+- every tree is still fully hashable, i.e. built only from tuples, strings and
+  bools, so there is nothing in it a check could have written to.
+
+The raw JSON buckets are also checked concurrently through the legacy
+PreReqChecker.prereqchecker, which must leave them exactly as loaded.
+
+    python benchmarks/bench_threads.py --courses 2000 --students 200 --threads 1 4 8
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from prereq_checker.PreReqChecker import prereqchecker
+from prereq_checker.catalog import catalog_from_json
+from prereq_checker.compiled import Transcript, evaluate
+from synthetic.generator import generate_catalog_entry, generate_transcripts
+
+
+def _eligible(catalog, transcript):
+    return [evaluate(catalog.courses[code], transcript) for code in catalog.codes]
+
+
+def _legacy(data, student):
+    return [prereqchecker(student["taken"], student["enrolled"], entry["info"]["prereqs"]) for entry in data.values()]
+
+
+def run(courses, students, threads, rounds=4, legacy_students=20, seed=0):
+    data = dict(generate_catalog_entry(i, seed, courses) for i in range(courses))
+    raw = json.dumps(data, sort_keys=True)
+    catalog = catalog_from_json(data)
+    trees = dict(catalog.courses)               # the objects every thread must keep seeing
+    fingerprint = hash(tuple(trees[code] for code in catalog.codes))
+    transcripts = [Transcript(s["taken"], s["enrolled"], s["classification"], crosslist=catalog.crosslist)
+                   for s in generate_transcripts(students, courses, seed)]
+    legacy = list(generate_transcripts(legacy_students, courses, seed))
+
+    reference = [_eligible(catalog, t) for t in transcripts]
+    legacy_reference = [_legacy(data, s) for s in legacy]
+
+    rows = []
+    for n in threads:
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            start = time.perf_counter()
+            for _ in range(rounds):
+                results = list(pool.map(lambda t: _eligible(catalog, t), transcripts))
+                if results != reference:
+                    raise AssertionError(f"threads={n} disagrees with the single-threaded reference")
+            seconds = time.perf_counter() - start
+            if list(pool.map(lambda s: _legacy(data, s), legacy)) != legacy_reference:
+                raise AssertionError(f"threads={n}: legacy prereqchecker disagrees with the reference")
+
+        if any(catalog.courses[code] is not tree for code, tree in trees.items()) or len(catalog.courses) != len(trees):
+            raise AssertionError(f"threads={n}: catalog trees were replaced")
+        if hash(tuple(catalog.courses[code] for code in catalog.codes)) != fingerprint:
+            raise AssertionError(f"threads={n}: catalog trees changed")
+        if json.dumps(data, sort_keys=True) != raw:
+            raise AssertionError(f"threads={n}: raw buckets were mutated")
+
+        evaluations = rounds * len(transcripts) * len(catalog)
+        rows.append({"threads": n, "seconds": seconds, "evaluations": evaluations,
+                     "evaluations_per_sec": evaluations / seconds})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate one shared catalog from many threads")
+    parser.add_argument("--courses", type=int, default=2000, help="Catalog size")
+    parser.add_argument("--students", type=int, default=200, help="Transcripts evaluated per round")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8], help="Thread counts to run")
+    parser.add_argument("--rounds", type=int, default=4, help="Passes over the transcripts per thread count")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--out", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    rows = run(args.courses, args.students, args.threads, args.rounds, seed=args.seed)
+    print(f"{'threads':>7} {'seconds':>9} {'evaluations':>12} {'evals/s':>11}")
+    for row in rows:
+        print(f"{row['threads']:>7} {row['seconds']:>9.2f} {row['evaluations']:>12,} {row['evaluations_per_sec']:>11,.0f}")
+    print("\nShared catalog unchanged; no copies made")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"courses": args.courses, "students": args.students, "rounds": args.rounds,
+                       "results": rows}, f, indent=4)
+        print(f"Saved results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Course Checker Package
 
 # Defines this package and where to get the definitions
 from prereq_parser.CourseParser8 import parse_prerequisites
+from prereq_parser.coursecode import CourseCode
 from CommandLine.CoursesTaken import (
     getCoursesTaken,
     saveCoursesTaken,
@@ -15,15 +16,42 @@ from prereq_checker.prerecqchecker2 import (
     prereqchecker,
     parse_prereq
 )
+from prereq_checker.compiled import (
+    compile_tree,
+    compile_bucket,
+    evaluate,
+    Transcript
+)
+from prereq_checker.catalog import (
+    Catalog,
+    load_catalog
+)
+from prereq_checker.batch import (
+    evaluate_batch,
+    eligible_courses
+)
+from prereq_checker.cache import EvaluationCache
+from prereq_checker.crosslist import CrossListing
 
 # When importing all these will be imported
 __all__ = [
     'parse_prerequisites',
+    'CourseCode',
     'prereqchecker',
     'parse_prereq',
     'getCoursesTaken',
     'saveCoursesTaken',
     'updateTaken',
     'updateEnrolled',
-    'updateTakenEnrolled'
+    'updateTakenEnrolled',
+    'compile_tree',
+    'compile_bucket',
+    'evaluate',
+    'Transcript',
+    'Catalog',
+    'load_catalog',
+    'evaluate_batch',
+    'eligible_courses',
+    'EvaluationCache',
+    'CrossListing'
 ]
\ No newline at end of file
@@ -0,0 +1,310 @@
+"""
+Batch eligibility over a process pool, with the catalog in shared memory.
+
+The compiled catalog is flattened once into int32 arrays (plus the interned
+course codes) inside a single multiprocessing.shared_memory block. Workers
+attach to the block by name, so nothing catalog-sized is pickled per worker,
+and evaluate partitions of students. Results come back in student order.
+
+Block layout (all int32 except the code blob):
+
+    header      n_nodes, n_children, n_roots, blob_len
+    kind        per node: COURSE / AND / OR / CLASS
+    arg         COURSE: course id   AND/OR: first child slot   CLASS: level
+    extra       COURSE: grade rank * 2 + concurrent            AND/OR: child count
+    children    node ids, each AND/OR's children contiguous
+    roots       root node per catalog course (Catalog.codes order)
+    blob        "\n".join(interned codes), then one "ALIAS CANONICAL" line per
+                cross-listed code, utf-8
+
+Identical subtrees are hash-consed to one node id, and each student's sweep
+over the catalog memoizes node results, so shared clauses are evaluated once
+per student instead of once per occurrence. Every code of a cross-listing
+maps to its canonical code's id, so transcripts resolve them in the same lookup.
+
+Each student's result is a bitmap: bit i is set when the student is eligible
+for catalog.codes[i].
+
+    results = evaluate_batch(catalog, students, processes=8)
+    eligible_courses(catalog, results[0])
+"""
+import multiprocessing
+import os
+from array import array
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional
+
+from prereq_checker.catalog import Catalog
+from prereq_checker.compiled import AND, CLASS, CLASSIFICATIONS, COURSE, EXAM, FALSE, Transcript, classification_level
+
+K_COURSE, K_AND, K_OR, K_CLASS = 0, 1, 2, 3
+HEADER = 4
+ITEM = 4    # bytes per int32
+
+
+def grade_rank(letter: str) -> int:
+    """'A' -> 0 ... 'F' -> 5; lower is better"""
+    return ord(letter) - ord("A")
+
+
+class FlatCatalog:
+    """A Catalog's compiled trees flattened into int arrays, course codes interned"""
+
+    def __init__(self, catalog: Optional[Catalog] = None):
+        self.codes: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.kind = array("i")
+        self.arg = array("i")
+        self.extra = array("i")
+        self.children = array("i")
+        self.roots = array("i")
+        self.aliases: Dict[str, str] = {}      # cross-listed code -> canonical code
+        self._nodes: Dict[tuple, int] = {}     # compiled subtree -> node id (hash-consing)
+        self.occurrences = 0                    # subtrees added, counting repeats
+        if catalog is not None:
+            for code in catalog.codes:
+                self.intern(code)
+            for code in catalog.codes:
+                self.roots.append(self.add(catalog.courses[code]))
+            for code in catalog.crosslist.parent:
+                canonical = catalog.crosslist.find(code)
+                if canonical != code:
+                    self.intern(canonical)
+                    self.aliases[code] = canonical
+
+    def intern(self, code: str) -> int:
+        course_id = self.ids.get(code)
+        if course_id is None:
+            course_id = self.ids[code] = len(self.codes)
+            self.codes.append(code)
+        return course_id
+
+    def _node(self, kind: int, arg: int, extra: int) -> int:
+        self.kind.append(kind)
+        self.arg.append(arg)
+        self.extra.append(extra)
+        return len(self.kind) - 1
+
+    def add(self, compiled: tuple) -> int:
+        """
+        Append a compiled tree, children before parents; returns its node id.
+        Identical subtrees share one node, so a clause repeated across courses
+        ("ECEN 303 or STAT 211", a Senior classification) is one id and is
+        evaluated once per student.
+        """
+        self.occurrences += 1
+        node_id = self._nodes.get(compiled)
+        if node_id is not None:
+            return node_id
+        kind = compiled[0]
+        if kind == COURSE:
+            _, code, grade, concurrent = compiled
+            node_id = self._node(K_COURSE, self.intern(code), grade_rank(grade) * 2 + bool(concurrent))
+        elif kind == CLASS:
+            node_id = self._node(K_CLASS, CLASSIFICATIONS.index(compiled[1]), 0)
+        elif kind == EXAM:
+            node_id = self.add(FALSE)       # no transcript meets it: an OR with no children
+        else:
+            child_ids = [self.add(c) for c in compiled[1]]
+            start = len(self.children)
+            self.children.extend(child_ids)
+            node_id = self._node(K_AND if kind == AND else K_OR, start, len(child_ids))
+        self._nodes[compiled] = node_id
+        return node_id
+
+    # --- Shared memory ---
+    def to_bytes(self) -> bytes:
+        blob = "\n".join(self.codes + [f"{alias} {code}" for alias, code in self.aliases.items()]).encode()
+        header = array("i", [len(self.kind), len(self.children), len(self.roots), len(blob)])
+        parts = (header, self.kind, self.arg, self.extra, self.children, self.roots)
+        return b"".join(part.tobytes() for part in parts) + blob
+
+    def to_shared(self) -> shared_memory.SharedMemory:
+        """Copy into a new shared memory block; the caller closes and unlinks it"""
+        data = self.to_bytes()
+        shm = shared_memory.SharedMemory(create=True, size=len(data))
+        shm.buf[:len(data)] = data
+        return shm
+
+
+class SharedView:
+    """Read-only int views over a FlatCatalog block (what each worker holds)"""
+
+    def __init__(self, buf):
+        header = buf[:HEADER * ITEM].cast("i")
+        n_nodes, n_children, n_roots, blob_len = header
+        header.release()
+        bounds = [HEADER]
+        for n in (n_nodes, n_nodes, n_nodes, n_children, n_roots):
+            bounds.append(bounds[-1] + n)
+        self._ints = buf[:bounds[-1] * ITEM].cast("i")
+        self.kind, self.arg, self.extra, self.children, self.roots = (
+            self._ints[a:b] for a, b in zip(bounds, bounds[1:]))
+        start = bounds[-1] * ITEM
+        lines = bytes(buf[start:start + blob_len]).decode().split("\n") if blob_len else []
+        codes = [line for line in lines if " " not in line]
+        self.ids = {code: i for i, code in enumerate(codes)}
+        for line in lines[len(codes):]:
+            alias, code = line.split(" ")
+            self.ids[alias] = self.ids[code]
+
+    def release(self):
+        """Drop the views so the block can be closed"""
+        for view in (self.kind, self.arg, self.extra, self.children, self.roots, self._ints):
+            view.release()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block; only the creating process unlinks it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)      # Python 3.13+
+    except TypeError:
+        # older Pythons register the attach with the pool's resource tracker, which is
+        # shared with the parent, so the parent's unlink() clears it
+        return shared_memory.SharedMemory(name=name)
+
+
+# --- Evaluation over the flat arrays ---
+def _eval(i, view, grades, enrolled, level, memo) -> bool:
+    """Truth value of node i; memo (one byte per node: 0 unknown, 1 false, 2 true) spans one student's sweep"""
+    known = memo[i]
+    if known:
+        return known == 2
+    kind = view.kind[i]
+    if kind == K_COURSE:
+        course_id = view.arg[i]
+        extra = view.extra[i]
+        got = grades.get(course_id)
+        result = (got is not None and got <= extra >> 1) or (bool(extra & 1) and course_id in enrolled)
+    elif kind == K_AND:
+        result = True
+        start = view.arg[i]
+        for j in range(start, start + view.extra[i]):
+            if not _eval(view.children[j], view, grades, enrolled, level, memo):
+                result = False
+                break
+    elif kind == K_OR:
+        result = False
+        start = view.arg[i]
+        for j in range(start, start + view.extra[i]):
+            if _eval(view.children[j], view, grades, enrolled, level, memo):
+                result = True
+                break
+    else:
+        result = level >= view.arg[i]
+    memo[i] = 2 if result else 1
+    return result
+
+
+def _student(view, student: dict):
+    """Transcript dict ({"taken", "enrolled", "classification"}) -> (grades by id, enrolled ids, level)"""
+    transcript = Transcript(student.get("taken", ()), student.get("enrolled", ()), student.get("classification"))
+    ids = view.ids
+    grades = {}
+    for code, g in transcript.grades.items():
+        course_id = ids.get(code)
+        if course_id is not None and (course_id not in grades or grade_rank(g) < grades[course_id]):
+            grades[course_id] = grade_rank(g)
+    enrolled = {ids[code] for code in transcript.enrolled if code in ids}
+    level = classification_level(transcript.classification)
+    return grades, enrolled, level
+
+
+def evaluate_student(view, student: dict) -> bytes:
+    grades, enrolled, level = _student(view, student)
+    memo = bytearray(len(view.kind))
+    bits = bytearray((len(view.roots) + 7) // 8)
+    for i, root in enumerate(view.roots):
+        if _eval(root, view, grades, enrolled, level, memo):
+            bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+
+# Worker process state, set once by the pool initializer
+_shm = None
+_view = None
+
+
+def _init_worker(name: str):
+    global _shm, _view
+    _shm = _attach(name)
+    _view = SharedView(_shm.buf)
+
+
+def _evaluate_partition(students: List[dict]) -> List[bytes]:
+    return [evaluate_student(_view, s) for s in students]
+
+
+def evaluate_batch(catalog: Catalog, students: Iterable[dict], processes: Optional[int] = None,
+                   chunk_size: Optional[int] = None) -> List[bytes]:
+    """
+    Eligibility bitmaps for every student, in input order. processes=1 runs in
+    this process (no pool); None uses every core.
+    """
+    students = list(students)
+    flat = FlatCatalog(catalog)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(students) < 2:
+        view = SharedView(memoryview(flat.to_bytes()))
+        try:
+            return [evaluate_student(view, s) for s in students]
+        finally:
+            view.release()
+
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(students) // (processes * 4)))
+    partitions = [students[i:i + chunk_size] for i in range(0, len(students), chunk_size)]
+    shm = flat.to_shared()
+    try:
+        with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(shm.name,)) as pool:
+            results = []
+            for part in pool.imap(_evaluate_partition, partitions):
+                results.extend(part)
+        return results
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def eligible_courses(catalog: Catalog, bits: bytes) -> List[str]:
+    """Decode one student's bitmap into catalog codes"""
+    return [code for i, code in enumerate(catalog.codes) if bits[i >> 3] >> (i & 7) & 1]
+
+
+if __name__ == "__main__":
+    from prereq_checker.compiled import compile_bucket
+    from prereq_checker.catalog import Catalog
+
+    catalog = Catalog({
+        "ECEN403": compile_bucket([["COMM205 C", ".", "COMM243 C"], "ECEN314 C", ["ECEN449 C ^", ".", "CSCE462 C ^"]]),
+        "CSCE221": compile_bucket(["CSCE120 C"]),
+        "CSCE120": compile_bucket([]),
+        "CSCE481": (AND, ((COURSE, "CSCE221", "D", False), (CLASS, "Senior"))),
+    })
+    students = [
+        {"taken": ["COMM243 A", "ECEN314 C", "CSCE120 B"], "enrolled": ["ECEN449 C ^"]},
+        {"taken": ["CSCE120 D", "CSCE_221"], "classification": "senior"},
+        {"taken": [], "enrolled": []},
+    ] * 5
+    expected = [["CSCE120", "CSCE221", "ECEN403"], ["CSCE120", "CSCE481"], ["CSCE120"]] * 5
+    shared = [["ECEN303 C", ".", "STAT211 C"], "ECEN350"]
+    flat = FlatCatalog(Catalog({"ECEN403": compile_bucket(shared + ["ECEN314"]), "ECEN404": compile_bucket(shared)}))
+    assert list(flat.children).count(flat.add(compile_bucket(shared[:1]))) == 2    # one "ECEN 303 or STAT 211" node
+    assert len(flat.kind) == 7 and flat.occurrences == 10
+    for processes in (1, 2):
+        results = evaluate_batch(catalog, students, processes=processes, chunk_size=2)
+        assert [eligible_courses(catalog, bits) for bits in results] == expected
+
+    # either code of a cross-listing meets the (collapsed) leaf, at the best grade taken
+    from prereq_checker.catalog import catalog_from_json
+    crossed = catalog_from_json({
+        "CSCE_350": {"info": {"prereqs": ["CSCE120"], "cross": ["ECEN_350"]}},
+        "ECEN_350": {"info": {"prereqs": ["CSCE120"]}},
+        "ECEN_449": {"info": {"prereqs": [["ECEN350 C", ".", "CSCE350 C"]]}},
+    })
+    assert crossed.courses["ECEN449"] == (COURSE, "CSCE350", "C", False)
+    students = [{"taken": ["ECEN350 B"]}, {"taken": ["CSCE350 D", "ECEN350 A"]}, {"taken": ["ECEN350 D"]}]
+    for processes in (1, 2):
+        results = evaluate_batch(crossed, students, processes=processes)
+        assert [eligible_courses(crossed, bits) for bits in results] == [["ECEN449"], ["ECEN449"], []]
+    print("ok")
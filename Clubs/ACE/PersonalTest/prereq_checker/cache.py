@@ -0,0 +1,292 @@
+"""
+LRU cache of eligibility answers.
+
+Entries are keyed by (transcript fingerprint, course, catalog version). The
+fingerprint hashes the canonical transcript (best grade per normalized code,
+enrolled codes, classification), so "CSCE_221" and "CSCE221 D" share entries
+and list order doesn't matter. Loading a new catalog changes the version, so
+old answers can never be returned.
+
+Transcripts read from a file (check_file) are remembered per file, and when
+saveCoursesTaken rewrites that file the entries for its old transcript are
+dropped.
+
+    cache = EvaluationCache(load_catalog("data.json"), maxsize=50_000)
+    cache.check_file("coursesTaken.json", "ECEN_403")
+    cache.stats()       # {"hits": ..., "misses": ..., "hit_rate": ...}
+
+cache_for(catalog_file) keeps one cache per catalog file for the life of the
+process; the check command asks through it, so repeated checks in one process
+(a viewer or report server importing the CLI) are answered from memory.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from CommandLine import CoursesTaken
+from prereq_checker.catalog import Catalog, load_catalog
+from prereq_checker.compiled import Transcript, evaluate, normalize_code
+
+
+def fingerprint(transcript: Transcript) -> str:
+    """Stable hash of a transcript's canonical form"""
+    parts = [f"{code}:{grade}" for code, grade in sorted(transcript.grades.items())]
+    parts.append("|")
+    parts.extend(sorted(transcript.enrolled))
+    parts.append("|")
+    parts.append(transcript.classification or "")
+    return hashlib.sha1(",".join(parts).encode()).hexdigest()
+
+
+class EvaluationCache:
+    def __init__(self, catalog: Catalog, maxsize: int = 100_000, watch: bool = True):
+        self.catalog = catalog
+        self.maxsize = maxsize
+        self._entries = OrderedDict()               # (fingerprint, code, version) -> bool
+        self._by_fingerprint: Dict[str, Set[tuple]] = {}
+        self._files: Dict[str, str] = {}            # transcript file -> fingerprint of its last read
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        if watch:
+            CoursesTaken.addSaveListener(self._on_save)
+
+    def close(self):
+        """Stop watching saveCoursesTaken"""
+        CoursesTaken.removeSaveListener(self._on_save)
+
+    # --- Lookups ---
+    def check(self, taken: Iterable[str], enrolled: Iterable[str], course: str,
+              classification: Optional[str] = None) -> Optional[bool]:
+        """Eligibility for course, or None if the course isn't in the catalog"""
+        return self.check_transcript(Transcript(taken, enrolled, classification, self.catalog.crosslist), course)
+
+    def check_transcript(self, transcript: Transcript, course: str, fp: Optional[str] = None) -> Optional[bool]:
+        code = normalize_code(course)
+        compiled = self.catalog.courses.get(code) if code else None
+        if compiled is None:
+            return None
+        key = (fp or fingerprint(transcript), code, self.catalog.version)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        result = evaluate(compiled, transcript)
+        with self._lock:
+            self._store(key, result)
+        return result
+
+    def check_file(self, filename: str, course: str, classification: Optional[str] = None) -> Optional[bool]:
+        """
+        check() against a coursesTaken.json file. Raises OSError if the file can't
+        be opened and ValueError if it isn't a coursesTaken.json, so an unreadable
+        transcript is never mistaken for "not eligible".
+        """
+        history = CoursesTaken.getCoursesTaken(filename)
+        if history is False:
+            raise ValueError(f"{filename} is not a readable coursesTaken.json")
+        transcript = Transcript(history[0], history[1], classification, self.catalog.crosslist)
+        fp = fingerprint(transcript)
+        with self._lock:
+            self._files[os.path.abspath(filename)] = fp
+        return self.check_transcript(transcript, course, fp)
+
+    def _store(self, key: tuple, result: bool):
+        if key in self._entries:
+            return
+        self._entries[key] = result
+        self._by_fingerprint.setdefault(key[0], set()).add(key)
+        while len(self._entries) > self.maxsize:
+            old, _ = self._entries.popitem(last=False)
+            self._unindex(old)
+            self.evictions += 1
+
+    def _unindex(self, key: tuple):
+        keys = self._by_fingerprint.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_fingerprint[key[0]]
+
+    # --- Invalidation ---
+    def invalidate(self, fp: str) -> int:
+        """Drop every entry for one transcript fingerprint; returns how many were dropped"""
+        with self._lock:
+            keys = self._by_fingerprint.pop(fp, set())
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def _on_save(self, filename, taken, enrolled):
+        with self._lock:
+            old = self._files.pop(os.path.abspath(filename), None)
+        if old is not None:
+            self.invalidate(old)
+
+    def set_catalog(self, catalog: Catalog):
+        """Switch catalogs; entries for the old version are cleared rather than left to age out"""
+        if catalog.version != self.catalog.version:
+            self.clear()
+        self.catalog = catalog
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_fingerprint.clear()
+            self._files.clear()
+
+    # --- Metrics ---
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# catalog path -> (modification time it was loaded at, its cache)
+_shared: Dict[str, Tuple[float, EvaluationCache]] = {}
+_shared_lock = threading.Lock()
+
+
+def cache_for(catalog_file: str) -> EvaluationCache:
+    """
+    The process-wide cache for catalog_file. The catalog is loaded on first use
+    and reloaded when the file changes, which clears the old version's answers.
+    Raises OSError / ValueError like load_catalog.
+    """
+    path = os.path.abspath(catalog_file)
+    mtime = os.path.getmtime(path)
+    with _shared_lock:
+        loaded = _shared.get(path)
+        if loaded is not None and loaded[0] == mtime:
+            return loaded[1]
+        catalog = load_catalog(path)
+        if loaded is None:
+            cache = EvaluationCache(catalog)
+        else:
+            cache = loaded[1]
+            cache.set_catalog(catalog)
+        _shared[path] = (mtime, cache)
+        return cache
+
+
+if __name__ == "__main__":
+    import json
+    import tempfile
+    from prereq_checker.compiled import compile_bucket
+
+    catalog = Catalog({
+        "ECEN403": compile_bucket([["COMM205 C", ".", "COMM243 C"], "ECEN314 C"]),
+        "CSCE221": compile_bucket(["CSCE120 C"]),
+    }, version="v1")
+    cache = EvaluationCache(catalog, maxsize=3)
+    assert cache.check(["CSCE120 B"], [], "CSCE_221") == True
+    assert cache.check(["CSCE120 B"], [], "CSCE 221") == True
+    assert cache.check(["CSCE120 B", "CSCE120 C"], [], "CSCE221") == True     # same best grade, same fingerprint
+    assert cache.check(["CSCE120 F"], [], "CSCE221") == False
+    assert cache.check([], [], "MATH151") is None
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "coursesTaken.json")
+        CoursesTaken.saveCoursesTaken(path, ["COMM205 B"], [])
+        assert cache.check_file(path, "ECEN403") == False
+        assert cache.check_file(path, "ECEN403") == False
+        CoursesTaken.updateTaken(path, ["ECEN314 A"])
+        assert cache.invalidations == 1
+        assert cache.check_file(path, "ECEN403") == True
+        with open(path, "w") as f:
+            f.write("{not json")
+        for bad in (path, os.path.join(tmp, "missing.json")):
+            try:
+                cache.check_file(bad, "ECEN403")
+            except (OSError, ValueError):
+                pass
+            else:
+                raise AssertionError(f"check_file answered for unreadable {bad}")
+
+    for course in ("ECEN403", "CSCE221"):
+        for grade in "ABCDF":
+            cache.check([f"CSCE120 {grade}", "ECEN314 A", "COMM243 A"], [], course)
+    assert len(cache) == 3 and cache.evictions > 0
+    cache.set_catalog(Catalog(catalog.courses, version="v2"))
+    assert len(cache) == 0
+    cache.close()
+
+    # the shared cache behind the check command: one per catalog file, reloaded when it changes
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog_file = os.path.join(tmp, "catalog.json")
+        courses = os.path.join(tmp, "coursesTaken.json")
+        with open(catalog_file, "w") as f:
+            json.dump({"CSCE_221": {"info": {"prereqs": ["CSCE120 C"]}}}, f)
+        CoursesTaken.saveCoursesTaken(courses, ["CSCE120 B"], [])
+        shared = cache_for(catalog_file)
+        assert shared.check_file(courses, "CSCE_221") == True and cache_for(catalog_file) is shared
+        assert shared.check_file(courses, "CSCE_221") == True and shared.hits == 1
+        CoursesTaken.updateTaken(courses, ["CSCE120 F"])        # saving the file drops its answers
+        assert shared.invalidations == 1 and shared.check_file(courses, "CSCE_221") == True
+        with open(catalog_file, "w") as f:
+            json.dump({"CSCE_221": {"info": {"prereqs": ["CSCE120 A"]}}}, f)
+        os.utime(catalog_file, (0, os.path.getmtime(catalog_file) + 10))
+        assert cache_for(catalog_file) is shared and shared.check_file(courses, "CSCE_221") == False
+        shared.close()
+
+    # The check command, before and after it went through this cache. Before, it
+    # ran prerecqchecker2 on the raw bucket; now it uses the compiled leaf rules,
+    # which differ in two ways: an ungraded taken course counts as a D, and an
+    # enrollment only meets a "^" leaf.
+    import argparse
+    import contextlib
+    import io
+    from CommandLine import CommandLineTool as cli
+    from prereq_checker import prerecqchecker2
+
+    def run_check(course):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            cli.cmd_check(argparse.Namespace(course=course, classification=None))
+        return "can be taken" in out.getvalue()
+
+    def before(taken, enrolled, bucket):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return prerecqchecker2.prereqchecker(taken, enrolled, bucket)
+
+    buckets = {"CSCE_221": ["CSCE120 C"], "CSCE_222": ["CSCE120 C ^"], "CSCE_313": ["CSCE221"]}
+    cases = [   # taken, enrolled, course, before, after
+        (["CSCE120 B"], [], "CSCE_221", True, True),
+        (["CSCE120 F"], [], "CSCE_221", False, False),
+        ([], ["CSCE120"], "CSCE_222", True, True),
+        (["CSCE_221"], [], "CSCE_313", False, True),       # ungraded: now a D
+        ([], ["CSCE120"], "CSCE_221", True, False),        # enrolled, no "^" on the leaf: no longer enough
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        cli.prereq_data_file = os.path.join(tmp, "catalog.json")
+        cli.courses_file = os.path.join(tmp, "coursesTaken.json")
+        with open(cli.prereq_data_file, "w") as f:
+            json.dump({code: {"info": {"prereqs": bucket}} for code, bucket in buckets.items()}, f)
+        for taken, enrolled, course, was, now in cases:
+            CoursesTaken.saveCoursesTaken(cli.courses_file, taken, enrolled)
+            assert before(taken, enrolled, buckets[course]) == was, (taken, enrolled, course)
+            assert run_check(course) == now, (taken, enrolled, course)
+        cache_for(cli.prereq_data_file).close()
+    print(cache.stats())
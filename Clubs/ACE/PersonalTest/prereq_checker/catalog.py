@@ -0,0 +1,163 @@
+"""
+Loaded prerequisite catalog: every course's compiled tree, keyed by normalized code.
+"""
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+# prereq_parser (CP10 descriptions) is imported lazily: bucket catalogs don't need the parsers
+
+from prereq_checker.compiled import (AND, CLASS, OR, _group, compile_bucket,
+                                     compile_tree, normalize_code)
+from prereq_checker.crosslist import CROSS_LISTING, CrossListing, canonical_tree, cross_listings
+from prereq_checker.integrity import IntegrityReport, check_integrity
+from prereq_checker.prefix import PrefixIndex
+
+# memory_stats lives in Clubs/ACE, beside parse_stats
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import memory_stats
+
+
+class Catalog:
+    def __init__(self, courses: Dict[str, tuple], names: Optional[Dict[str, str]] = None, version: str = "",
+                 crosslist: Optional[CrossListing] = None):
+        self.courses = courses              # "ECEN403" -> compiled tree
+        self.names = names or {}            # "ECEN403" -> key as written in the source ("ECEN_403")
+        self.version = version              # content hash of the source, for caches
+        self.crosslist = crosslist or CrossListing()    # trees name courses by their canonical code
+        self.codes = sorted(courses)        # stable course order for batch results
+        self.integrity: Optional[IntegrityReport] = None    # set by load_catalog
+        self.prefix: Optional[PrefixIndex] = None           # set by load_catalog
+
+    def __len__(self):
+        return len(self.courses)
+
+    def __contains__(self, course: str):
+        return normalize_code(course) in self.courses
+
+    def get(self, course: str) -> Optional[tuple]:
+        """Compiled tree for any spelling of a course ("ECEN_403", "ECEN 403", "ecen403")"""
+        code = normalize_code(course)
+        return self.courses.get(code) if code else None
+
+    def name(self, code: str) -> str:
+        return self.names.get(code, code)
+
+
+def _classification_clause(levels) -> tuple:
+    return _group(OR, [(CLASS, level.capitalize()) for level in levels])
+
+
+def _with_crosslist(courses: Dict[str, tuple], names: Dict[str, str], version: str,
+                    crosslist: CrossListing) -> Catalog:
+    """Rewrite every tree to canonical codes, so cross-listed alternatives collapse"""
+    if crosslist:
+        crosslist.flatten()
+        memo = {}
+        courses = {code: canonical_tree(tree, crosslist, memo) for code, tree in courses.items()}
+    return Catalog(courses, names, version, crosslist)
+
+
+def catalog_from_json(data: dict, version: str = "") -> Catalog:
+    """
+    Bucket-format catalog: {"ECEN_403": {"info": {"prereqs": [...]}}, ...}. A
+    "classification" list in info (synthetic catalogs) is ANDed onto the tree.
+    Cross-listings come from a "cross" list in info and from "Cross Listing:"
+    in the description.
+    """
+    courses, names = {}, {}
+    crosslist = CrossListing()
+    for key, entry in data.items():
+        code = normalize_code(key)
+        if code is None:
+            continue
+        info = entry.get("info", {})
+        tree = compile_bucket(info.get("prereqs", []))
+        if info.get("classification"):
+            tree = _group(AND, [tree, _classification_clause(info["classification"])])
+        courses[code] = tree
+        names[code] = key
+        if info.get("cross"):
+            crosslist.add([code, *info["cross"]])
+        for group in cross_listings(info.get("description", "")):
+            crosslist.add(group)
+    return _with_crosslist(courses, names, version, crosslist)
+
+
+def catalog_from_descriptions(descriptions: Iterable[Tuple[str, str]], version: str = "") -> Catalog:
+    """
+    Parse (course, description) pairs with CP10 and compile the trees. The
+    "Cross Listing:" clause is cut before parsing: it names the course's own
+    codes, which CP10 would otherwise read as prerequisites.
+    """
+    from prereq_parser.bulk_parse import CP10
+    courses, names = {}, {}
+    crosslist = CrossListing()
+    for key, text in descriptions:
+        code = normalize_code(key)
+        if code is None:
+            continue
+        courses[code] = compile_tree(CP10.parse_text_to_tree(CROSS_LISTING.sub("", text)))
+        names[code] = key
+        for group in cross_listings(text):
+            crosslist.add(group)
+    return _with_crosslist(courses, names, version, crosslist)
+
+
+def load_catalog(filename: str) -> Catalog:
+    """
+    Load a bucket-format catalog JSON, or a descriptions file (JSON lines of
+    {"course", "text"}) which is parsed with CP10. The catalog comes back with
+    its cycle / dangling reference report in catalog.integrity, a prefix
+    index of its codes in catalog.prefix and its cross-listings in catalog.crosslist.
+
+    Each step is a memory_stats phase: read, decode (the raw JSON dicts) or
+    parse (descriptions), compile, integrity and prefix.
+    """
+    with open(filename, "rb") as f:
+        raw = f.read()
+    version = hashlib.sha1(raw).hexdigest()
+    memory_stats.mark("read")
+    if filename.endswith(".jsonl"):
+        del raw
+        from prereq_parser.bulk_parse import load_descriptions
+        catalog = catalog_from_descriptions(load_descriptions(filename), version)
+        memory_stats.mark("parse")
+    else:
+        data = json.loads(raw)
+        del raw
+        memory_stats.mark("decode")
+        catalog = catalog_from_json(data, version)
+        del data
+        memory_stats.mark("compile")
+    catalog.integrity = check_integrity(catalog)
+    memory_stats.mark("integrity")
+    catalog.prefix = PrefixIndex.from_codes(catalog.codes)
+    memory_stats.mark("prefix")
+    return catalog
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load a catalog and report what it holds")
+    parser.add_argument("catalog", help="Catalog file (bucket JSON or descriptions .jsonl)")
+    parser.add_argument("--profile-memory", nargs="?", const="-", metavar="OUT",
+                        help="Trace memory by load phase; write JSON to OUT ('-' prints only the table)")
+    args = parser.parse_args()
+
+    profile = memory_stats.enable() if args.profile_memory else None
+    catalog = load_catalog(args.catalog)
+    if profile is not None:
+        memory_stats.disable()
+    print(f"Loaded {len(catalog)} courses ({len(catalog.integrity.cycles)} cycles, "
+          f"{len(catalog.integrity.dangling)} courses with dangling references, "
+          f"{len(catalog.crosslist.classes())} cross-listings)")
+    if profile is not None:
+        print()
+        print(profile.table())
+        if args.profile_memory != "-":
+            profile.to_json(args.profile_memory)
+            print(f"Saved memory profile to {args.profile_memory}")
@@ -0,0 +1,261 @@
+"""
+Compiled prerequisite trees.
+
+Both CP10 Node trees (CP10.parse_text_to_tree) and bucket lists from the
+Spring2026 JSON compile into the same nested tuples, which are evaluated
+directly against a Transcript. Leaves are parsed once at compile time, so
+evaluation does no string work.
+
+    ("COURSE", "CSCE221", "C", True)    code, minimum grade, concurrent enrollment allowed
+    ("CLASS", "Senior")
+    ("EXAM",)                           an exam alternative ("or acceptable score on exam"); no transcript meets it
+    ("AND", (child, ...))               empty AND is always met (TRUE)
+    ("OR", (child, ...))                empty OR is never met (FALSE)
+
+Grades compare as letters (A best): a "C" minimum is met by A, B or C. A taken
+course with no grade ("CSCE_221") counts as a D. An enrollment only satisfies
+leaves that allow concurrent enrollment ("^" in buckets, CONCURRENT/PASSED in
+CP10 trees). A transcript with no (or an unrecognized) classification never
+meets a classification clause. prerecqchecker2.prereqchecker keeps its older leaf rules (an
+ungraded course is never met, any enrollment meets any leaf); the two agree on
+transcripts whose taken courses all carry grades and that enroll in nothing.
+"""
+import math
+from typing import Iterable, Optional
+
+from prereq_parser.coursecode import CourseCode
+
+COURSE = "COURSE"
+CLASS = "CLASS"
+EXAM = "EXAM"
+AND = "AND"
+OR = "OR"
+TRUE = (AND, ())
+FALSE = (OR, ())
+EXAM_LEAF = (EXAM,)
+
+DEFAULT_GRADE = "D"     # no grade clause: any passing grade
+GRADE_CLAUSE = "C"      # CP10 only records that a grade clause was present; they are almost all "C or better"
+CLASSIFICATIONS = ("Freshman", "Sophomore", "Junior", "Senior")
+
+
+def classification_level(classification: Optional[str]) -> float:
+    """Index into CLASSIFICATIONS; -inf when missing or unknown, below every clause"""
+    if classification is None or classification.capitalize() not in CLASSIFICATIONS:
+        return -math.inf
+    return CLASSIFICATIONS.index(classification.capitalize())
+
+def normalize_code(raw) -> Optional[str]:
+    """'CSCE 221', 'CSCE_221', 'CSCE221 A', 'csce221' (or a CourseCode) -> 'CSCE221'"""
+    course = CourseCode.parse(raw)
+    return course.code if course else None
+
+
+def _group(kind: str, children) -> tuple:
+    """Build an AND/OR node, flattening same-kind children and collapsing single children"""
+    flat = []
+    for child in children:
+        if child[0] == kind:
+            flat.extend(child[1])
+        else:
+            flat.append(child)
+    if len(flat) == 1:
+        return flat[0]
+    return (kind, tuple(flat))
+
+
+# --- CP10 Node trees ---
+def compile_tree(node, grade: Optional[str] = None, concurrent: bool = False) -> tuple:
+    """Compile a CP10 Node (ROOT, AND, OR, COURSE, CLASSIFICATION, CONCURRENT/PASSED)"""
+    if node.require_grade:
+        grade = GRADE_CLAUSE
+    kind = node.type
+    if kind == "COURSE":
+        if node.value == "EXAM":
+            return EXAM_LEAF
+        code = normalize_code(node.value)
+        if code is None:
+            return FALSE
+        return (COURSE, code, grade or DEFAULT_GRADE, concurrent)
+    if kind == "CLASSIFICATION":
+        return (CLASS, node.value)
+    if kind == "CONCURRENT/PASSED":
+        return TRUE     # only meaningful as an OR alternative, handled below
+    children = node.children
+    if kind == "OR":
+        # "A or B, or concurrent enrollment": the marker lets A and B be taken concurrently
+        markers = [c for c in children if c.type == "CONCURRENT/PASSED"]
+        if markers:
+            children = [c for c in children if c.type != "CONCURRENT/PASSED"]
+            concurrent = True
+            if not children:
+                return TRUE
+        return _group(OR, [compile_tree(c, grade, concurrent) for c in children])
+    # AND and ROOT
+    return _group(AND, [compile_tree(c, grade, concurrent) for c in children])
+
+
+# --- Bucket lists ---
+def compile_leaf(token: str) -> tuple:
+    """'CSCE350 C ^' -> ("COURSE", "CSCE350", "C", True); 'EXAM' -> ("EXAM",)"""
+    if token.strip().upper() == EXAM:
+        return EXAM_LEAF
+    course = CourseCode.parse(token)
+    if course is None:
+        return FALSE
+    return (COURSE, course.code, course.grade or DEFAULT_GRADE, course.concurrent)
+
+
+def compile_bucket(bucket) -> tuple:
+    """
+    Compile a bucket the way prerecqchecker2.evaluate_bucket reads it: entries
+    are ANDed, and "." ORs the entries on either side of it.
+    """
+    if isinstance(bucket, bool):
+        return TRUE if bucket else FALSE
+    if isinstance(bucket, str):
+        return compile_leaf(bucket)
+    terms = []          # AND of OR-chains
+    chain = None        # current OR-chain
+    join = False
+    for element in bucket:
+        if isinstance(element, str) and element.strip() == ".":
+            join = chain is not None
+            continue
+        compiled = compile_bucket(element)
+        if join:
+            chain.append(compiled)
+        else:
+            chain = [compiled]
+            terms.append(chain)
+        join = False
+    return _group(AND, [_group(OR, chain) for chain in terms])
+
+
+# --- Evaluation ---
+class Transcript:
+    """
+    Taken / enrolled course lists indexed for compiled evaluation.
+    Accepts CourseCodes or any of their spellings ("CSCE120 A", "CSCE_221", "ECEN449 C ^").
+    With a crosslist (a catalog's CrossListing) courses are stored under their
+    canonical code, matching the catalog's trees, so "ECEN350 B" meets a CSCE350 leaf.
+    """
+    __slots__ = ("grades", "enrolled", "classification", "crosslist")
+
+    def __init__(self, taken: Iterable[str] = (), enrolled: Iterable[str] = (), classification: Optional[str] = None,
+                 crosslist=None):
+        self.crosslist = crosslist if crosslist else None
+        self.grades = {}        # code -> best grade letter
+        for entry in taken:
+            course = CourseCode.parse(entry)
+            if course is None:
+                continue
+            code = self.resolve(course.code)
+            grade = course.grade or DEFAULT_GRADE
+            if code not in self.grades or grade < self.grades[code]:
+                self.grades[code] = grade
+        self.enrolled = {self.resolve(code) for code in map(normalize_code, enrolled) if code}
+        self.classification = classification.capitalize() if classification else None
+
+    def resolve(self, code: str) -> str:
+        """The code this transcript stores `code` under (its cross-listing's canonical code)"""
+        return self.crosslist.find(code) if self.crosslist is not None else code
+
+    def meets(self, code: str, grade: str, concurrent: bool) -> bool:
+        got = self.grades.get(code)
+        if got is not None and got <= grade:
+            return True
+        return concurrent and code in self.enrolled
+
+    def has_classification(self, level: str) -> bool:
+        return classification_level(self.classification) >= CLASSIFICATIONS.index(level)
+
+
+def evaluate(compiled: tuple, transcript: Transcript) -> bool:
+    kind = compiled[0]
+    if kind == COURSE:
+        return transcript.meets(compiled[1], compiled[2], compiled[3])
+    if kind == AND:
+        return all(evaluate(c, transcript) for c in compiled[1])
+    if kind == OR:
+        return any(evaluate(c, transcript) for c in compiled[1])
+    if kind == CLASS:
+        return transcript.has_classification(compiled[1])
+    if kind == EXAM:
+        return False
+    raise ValueError(f"Unknown compiled node {compiled!r}")
+
+
+def check(courses_taken, courses_enrolled, compiled: tuple, classification: Optional[str] = None,
+          crosslist=None) -> bool:
+    """prereqchecker() for compiled trees; pass the catalog's crosslist for trees from a Catalog"""
+    return evaluate(compiled, Transcript(courses_taken, courses_enrolled, classification, crosslist))
+
+
+if __name__ == "__main__":
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    import CP10
+
+    text = ("Prerequisites: Grade of C or better in COMM 205 or COMM 243 or ENGL 210; "
+            "grade of C or better in ECEN 314, ECEN 325; senior classification.")
+    tree = compile_tree(CP10.parse_text_to_tree(text))
+    print(tree)
+    assert check(["COMM205 B", "ECEN314 C", "ECEN325 A"], [], tree, "Senior") == True
+    assert check(["COMM205 B", "ECEN314 C", "ECEN325 A"], [], tree, "Junior") == False
+    assert check(["COMM205 D", "ECEN314 C", "ECEN325 A"], [], tree, "Senior") == False
+
+    tree = compile_tree(CP10.parse_text_to_tree("Prerequisite: ACCT 209 or ACCT 229 or concurrent enrollment."))
+    assert check([], ["ACCT229 ^"], tree) == True
+    assert check(["ACCT_209"], [], tree) == True
+    assert check(["ACCT209 F"], [], tree) == False
+
+    tree = compile_tree(CP10.parse_text_to_tree("Prerequisite: MATH 151 or acceptable score on exam."))
+    assert tree == (OR, ((COURSE, "MATH151", "D", False), EXAM_LEAF)), tree
+    assert check(["MATH151 C"], [], tree) == True and check(["EXAM"], [], tree) == False
+    assert compile_bucket(["MATH151 C", ".", "EXAM"]) == (OR, ((COURSE, "MATH151", "C", False), EXAM_LEAF))
+
+    bucket = [["COMM205 C", ".", "COMM243 C"], "ECEN314 C", ["ECEN449 C ^", ".", "CSCE462 C ^"]]
+    tree = compile_bucket(bucket)
+    print(tree)
+    assert check(["COMM243 A", "ECEN314 C"], ["ECEN449 C ^"], tree) == True
+    assert check(["COMM243 A", "ECEN314 C"], [], tree) == False
+    assert compile_bucket(["A", ".", "B"]) == FALSE
+    assert compile_bucket([]) == TRUE
+
+    # a catalog's trees name cross-listed courses by their canonical code
+    from prereq_checker.crosslist import CrossListing, canonical_tree
+    crosslist = CrossListing([["ECEN 350", "CSCE 350"]]).flatten()
+    tree = canonical_tree(compile_bucket(["ECEN314 C", ["ECEN350 C", ".", "CSCE350 C"]]), crosslist)
+    assert check(["ECEN314 B", "ECEN350 B"], [], tree, crosslist=crosslist) == True
+    assert check(["ECEN314 B", "ECEN350 B"], [], tree) == False       # ECEN350 isn't the canonical code
+    assert check(["ECEN314 B", "CSCE_350"], [], tree, crosslist=crosslist) == False     # counts as a D
+    assert check(["ECEN314 B"], ["ECEN350 ^"], canonical_tree(compile_bucket(["ECEN314 C", "CSCE350 C ^"]), crosslist),
+                 crosslist=crosslist) == True
+
+    # The legacy bucket walker (prerecqchecker2, behind check before it went through
+    # EvaluationCache) keeps its own leaf rules. With every taken course graded and
+    # nothing enrolled the two agree; where they differ is pinned down here.
+    import contextlib
+    import io
+    from prereq_checker import prerecqchecker2
+    from synthetic.generator import generate_catalog_entry, generate_transcripts
+
+    def legacy(taken, enrolled, bucket):
+        with contextlib.redirect_stdout(io.StringIO()):     # it prints every bucket it walks
+            return prerecqchecker2.prereqchecker(taken, enrolled, bucket)
+
+    # ungraded taken course: never met by legacy, a D here
+    assert legacy(["CSCE_221"], [], ["CSCE221"]) == False and check(["CSCE_221"], [], compile_bucket(["CSCE221"])) == True
+    # enrollment without "^" on the leaf: met by legacy, not here
+    assert legacy([], ["ECEN314"], ["ECEN314 C"]) == True and check([], ["ECEN314"], compile_bucket(["ECEN314 C"])) == False
+    assert legacy([], ["ECEN314 C ^"], ["ECEN314 C ^"]) == check([], ["ECEN314 C ^"], compile_bucket(["ECEN314 C ^"])) == True
+    buckets = [entry["info"]["prereqs"] for _, entry in (generate_catalog_entry(i, 7, 400) for i in range(400))]
+    buckets += [bucket, [True, ".", "CSCE120"], [False, "CSCE120 C"]]
+    for student in generate_transcripts(40, 400, 7):
+        taken = student["taken"] + ["CSCE101 F"]
+        transcript = Transcript(taken, [])
+        for b in buckets:
+            assert legacy(taken, [], b) == evaluate(compile_bucket(b), transcript), (b, taken)
+    print("ok")
@@ -0,0 +1,217 @@
+"""
+Cross-listed courses as equivalence classes.
+
+"ECEN 350/CSCE 350" is one course under two codes. A CrossListing is a
+union-find over every cross-listing in a catalog: find(code) returns the
+canonical code of the course's class (the code itself for courses that are
+not cross-listed), so a transcript entry for either code and a tree leaf
+naming either code resolve to the same key in one step.
+
+Compiling with a CrossListing rewrites every leaf to its canonical code, so the
+OR a parser builds for "ECEN 350/CSCE 350" collapses to a single leaf:
+
+    crosslist = CrossListing([["ECEN350", "CSCE350"]])
+    canonical_tree(compile_bucket([["ECEN350 C", ".", "CSCE350 C"]]), crosslist)
+    # ("COURSE", "CSCE350", "C", False)
+
+Classes are merged by size (ties go to the alphabetically first code) with
+path halving. flatten() points every code straight at its root, after which
+find() is a single lookup that never writes, so a built CrossListing can be
+shared across threads like the rest of a Catalog.
+"""
+import re
+from typing import Dict, Iterable, List, Optional
+
+from prereq_checker.compiled import AND, COURSE, OR, _group, normalize_code
+
+# "Cross Listing: ECEN 350/CSCE 350." in catalog descriptions
+CROSS_LISTING = re.compile(r"Cross[- ]?Listing:?\s*([^.;]*)", re.IGNORECASE)
+CODE = re.compile(r"[A-Za-z]{2,4}[\s_]*\d{3}")
+
+
+class CrossListing:
+    def __init__(self, groups: Iterable[Iterable[str]] = ()):
+        self.parent: Dict[str, str] = {}    # only cross-listed codes are stored
+        self.size: Dict[str, int] = {}      # class size, kept on roots
+        for group in groups:
+            self.add(group)
+
+    def __len__(self):
+        """Number of cross-listed codes"""
+        return len(self.parent)
+
+    def find(self, code: str) -> str:
+        """Canonical code of `code`'s class"""
+        parent = self.parent
+        if code not in parent:
+            return code
+        while True:
+            up = parent[code]
+            if up == code:
+                return code
+            top = parent[up]
+            if top == up:
+                return up
+            parent[code] = top
+            code = top
+
+    def union(self, a: str, b: str) -> str:
+        """Merge the classes of a and b; returns the canonical code"""
+        for code in (a, b):
+            if code not in self.parent:
+                self.parent[code] = code
+                self.size[code] = 1
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if (-self.size[b], b) < (-self.size[a], a):
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size.pop(b)
+        return a
+
+    def add(self, codes: Iterable[str]):
+        """Record one cross-listing (any spellings: "ECEN 350", "CSCE_350")"""
+        codes = [code for code in map(normalize_code, codes) if code]
+        for code in codes[1:]:
+            self.union(codes[0], code)
+
+    def flatten(self) -> "CrossListing":
+        """Point every code at its root, so find() no longer writes"""
+        for code in self.parent:
+            self.parent[code] = self.find(code)
+        return self
+
+    def same(self, a: str, b: str) -> bool:
+        return self.find(a) == self.find(b)
+
+    def classes(self) -> Dict[str, List[str]]:
+        """{canonical code: every code in its class}"""
+        result: Dict[str, List[str]] = {}
+        for code in sorted(self.parent):
+            result.setdefault(self.find(code), []).append(code)
+        return result
+
+
+def cross_listings(text: str) -> List[List[str]]:
+    """Codes of each "Cross Listing: A/B" clause in a description"""
+    groups = []
+    for match in CROSS_LISTING.finditer(text or ""):
+        codes = [normalize_code(code) for code in CODE.findall(match.group(1))]
+        codes = [code for code in codes if code]
+        if len(codes) > 1:
+            groups.append(codes)
+    return groups
+
+
+def _merge_or(children: List[tuple]) -> List[tuple]:
+    """
+    Leaves for the same course in one OR merge into the least demanding one:
+    "X with a C, or X with a D" is "X with a D", and either allowing
+    concurrent enrollment allows it. Other children keep their order, duplicates dropped.
+    """
+    merged: List[tuple] = []
+    leaves: Dict[str, int] = {}
+    for child in children:
+        if child[0] == COURSE:
+            _, code, grade, concurrent = child
+            at = leaves.get(code)
+            if at is not None:
+                _, _, other, other_concurrent = merged[at]
+                merged[at] = (COURSE, code, max(grade, other), concurrent or other_concurrent)
+                continue
+            leaves[code] = len(merged)
+        elif child in merged:
+            continue
+        merged.append(child)
+    return merged
+
+
+def canonical_tree(compiled: tuple, crosslist: CrossListing, memo: Optional[dict] = None) -> tuple:
+    """
+    `compiled` with every course at its canonical code. ORs whose alternatives
+    were the same course under different codes collapse, and repeated children
+    of an AND are dropped. Pass one memo dict for a whole catalog so shared
+    subtrees are rewritten once.
+    """
+    if memo is None:
+        memo = {}
+    done = memo.get(compiled)
+    if done is not None:
+        return done
+    kind = compiled[0]
+    if kind == COURSE:
+        code = crosslist.find(compiled[1])
+        result = compiled if code == compiled[1] else (COURSE, code, compiled[2], compiled[3])
+    elif kind in (AND, OR):
+        result = _group(kind, [canonical_tree(child, crosslist, memo) for child in compiled[1]])
+        if result[0] == kind:
+            children = _merge_or(list(result[1])) if kind == OR else list(dict.fromkeys(result[1]))
+            result = _group(kind, children)
+        if result == compiled:
+            result = compiled
+    else:
+        result = compiled
+    memo[compiled] = result
+    return result
+
+
+if __name__ == "__main__":
+    from prereq_checker.compiled import FALSE, TRUE, Transcript, compile_bucket, evaluate
+
+    crosslist = CrossListing([["ECEN 350", "CSCE_350"], ["ECEN222", "CSCE222"], ["BIOL107", "BIOT107"]])
+    crosslist.add(["BIOT107", "BIOL 107"])      # repeats are harmless
+    crosslist.add(["CSCE222", "MATH222"])       # classes grow past pairs
+    crosslist.flatten()
+    assert crosslist.find("ECEN350") == crosslist.find("CSCE350") == "CSCE350"
+    assert crosslist.find("MATH222") == crosslist.find("ECEN222") == "CSCE222" and crosslist.same("MATH222", "ECEN222")
+    assert crosslist.find("CSCE120") == "CSCE120" and len(crosslist) == 7
+    assert crosslist.classes() == {"BIOL107": ["BIOL107", "BIOT107"], "CSCE222": ["CSCE222", "ECEN222", "MATH222"],
+                                   "CSCE350": ["CSCE350", "ECEN350"]}
+
+    # a flattened CrossListing is read-only under find
+    parent = dict(crosslist.parent)
+    assert [crosslist.find(c) for c in parent] and crosslist.parent == parent
+
+    # long chains still resolve, and union by size keeps them shallow
+    chain = CrossListing()
+    for i in range(1, 1000):
+        chain.union(f"AAAA{i - 1:03d}", f"AAAA{i:03d}")
+    assert chain.find("AAAA999") == "AAAA000" and max(chain.size.values()) == 1000
+    assert len(set(chain.flatten().parent.values())) == 1
+
+    assert cross_listings("Prerequisites: ECEN 248; junior classification. Cross Listing: ECEN 350/CSCE 350.") == \
+        [["ECEN350", "CSCE350"]]
+    assert cross_listings("Cross-listing: BIOL 107/BIOT 107/GENE 107") == [["BIOL107", "BIOT107", "GENE107"]]
+    assert cross_listings("Prerequisite: CSCE 221.") == []
+
+    bucket = [["ECEN350 C", ".", "CSCE350 C"], "CSCE120", ["ECEN222 C ^", ".", "CSCE222 D"], ["CSCE120", ".", "MATH151"]]
+    tree = canonical_tree(compile_bucket(bucket), crosslist)
+    assert tree == (AND, ((COURSE, "CSCE350", "C", False), (COURSE, "CSCE120", "D", False),
+                          (COURSE, "CSCE222", "D", True),
+                          (OR, ((COURSE, "CSCE120", "D", False), (COURSE, "MATH151", "D", False))))), tree
+    assert canonical_tree(TRUE, crosslist) == TRUE and canonical_tree(FALSE, crosslist) == FALSE
+    plain = compile_bucket(["CSCE120", ["MATH151", ".", "MATH171"]])
+    assert canonical_tree(plain, crosslist) is plain
+
+    # same answers as the uncollapsed tree, whichever code a transcript uses
+    compiled = compile_bucket(bucket)
+    for taken, enrolled in [(["ECEN350 B", "CSCE120", "ECEN222 A"], []), (["CSCE350 C", "CSCE_120"], ["ECEN222 ^"]),
+                            (["ECEN350 D", "CSCE120", "CSCE222"], []), (["CSCE350 A"], ["ECEN222"]), ([], [])]:
+        assert evaluate(compiled, Transcript(taken, enrolled)) == \
+            evaluate(tree, Transcript(taken, enrolled, crosslist=crosslist)), (taken, enrolled)
+    # and a code only the cross-listing knows about counts too
+    assert evaluate(tree, Transcript(["CSCE350 A", "CSCE120"], ["MATH222 ^"], crosslist=crosslist))
+
+    # a description's Cross Listing clause names the course itself, not a prerequisite
+    from prereq_checker.catalog import catalog_from_descriptions
+    from prereq_checker.integrity import check_integrity
+    catalog = catalog_from_descriptions([
+        ("ACCT_104", "Prerequisite: Grade of B or better in ACCT 100 or ACCT 103. Cross Listing: ACCT 104/AERO 104."),
+        ("AERO_104", "Prerequisite: Grade of B or better in ACCT 100 or ACCT 103. Cross Listing: ACCT 104/AERO 104."),
+    ])
+    assert not check_integrity(catalog).cycles
+    for code in ("ACCT104", "AERO104"):
+        assert evaluate(catalog.courses[code], Transcript(["ACCT103 A"], crosslist=catalog.crosslist)), code
+        assert not evaluate(catalog.courses[code], Transcript(["ACCT103 D"], crosslist=catalog.crosslist)), code
+    print("ok")
@@ -0,0 +1,155 @@
+"""
+Structural diff of two prerequisite catalogs.
+
+Every course's compiled tree gets a Merkle hash: a leaf hashes its contents,
+an AND/OR hashes its kind plus its children's hashes in sorted order, so
+clause order doesn't matter. Courses whose root hashes match are skipped
+without looking inside; for the rest the top-level clauses (the children of
+the root AND) are matched by hash and only the leftovers are reported:
+
+    ("add", clause)
+    ("remove", clause)
+    ("change", old clause, new clause)  a removed and an added clause naming the same courses
+
+Clauses are rendered in the bucket token style ("CSCE221 C ^" is a C or better,
+concurrent enrollment allowed; no grade means any passing grade).
+"""
+import hashlib
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from prereq_checker.catalog import Catalog
+from prereq_checker.compiled import AND, CLASS, COURSE, DEFAULT_GRADE, EXAM, FALSE, TRUE
+
+
+@lru_cache(maxsize=1 << 16)
+def _leaf_hash(compiled: tuple) -> bytes:
+    # the same few thousand leaves recur across the whole catalog
+    return hashlib.blake2b(repr(compiled).encode(), digest_size=16).digest()
+
+
+def merkle(compiled: tuple) -> bytes:
+    kind = compiled[0]
+    if kind in (COURSE, CLASS, EXAM):
+        return _leaf_hash(compiled)
+    children = sorted(merkle(c) for c in compiled[1])
+    return hashlib.blake2b(kind.encode() + b"".join(children), digest_size=16).digest()
+
+
+def course_hashes(catalog: Catalog) -> Dict[str, bytes]:
+    return {code: merkle(tree) for code, tree in catalog.courses.items()}
+
+
+def describe(compiled: tuple, nested: bool = False) -> str:
+    """Readable clause text"""
+    if compiled == TRUE:
+        return "none"
+    if compiled == FALSE:
+        return "never"
+    kind = compiled[0]
+    if kind == COURSE:
+        _, code, grade, concurrent = compiled
+        return code + (f" {grade}" if grade != DEFAULT_GRADE else "") + (" ^" if concurrent else "")
+    if kind == CLASS:
+        return f"{compiled[1]} classification"
+    if kind == EXAM:
+        return "exam"
+    text = f" {kind.lower()} ".join(sorted(describe(c, True) for c in compiled[1]))
+    return f"({text})" if nested else text
+
+
+def clauses(compiled: tuple) -> Tuple[tuple, ...]:
+    if compiled[0] == AND:
+        return compiled[1]
+    return (compiled,)
+
+
+def _names(compiled: tuple) -> set:
+    """Course codes and classifications a clause mentions"""
+    if compiled[0] in (COURSE, CLASS):
+        return {compiled[1]}
+    if compiled[0] == EXAM:
+        return {EXAM}
+    return set().union(*map(_names, compiled[1]))
+
+
+def diff_trees(old: tuple, new: tuple) -> List[tuple]:
+    """Clause-level edits turning old into new"""
+    old_clauses = {merkle(c): c for c in clauses(old)}
+    new_clauses = {merkle(c): c for c in clauses(new)}
+    removed = [c for h, c in old_clauses.items() if h not in new_clauses]
+    added = [c for h, c in new_clauses.items() if h not in old_clauses]
+
+    # pair up a removed and an added clause that name the same courses: an edited clause
+    edits = []
+    unmatched = []
+    for before in removed:
+        names = _names(before)
+        best, best_overlap = None, 0
+        for i, after in enumerate(added):
+            overlap = len(names & _names(after))
+            if overlap > best_overlap:
+                best, best_overlap = i, overlap
+        if best is None:
+            unmatched.append(("remove", describe(before)))
+        else:
+            edits.append(("change", describe(before), describe(added.pop(best))))
+    edits.extend(unmatched)
+    edits.extend(("add", describe(after)) for after in added)
+    return edits
+
+
+def diff_catalogs(old: Catalog, new: Catalog) -> dict:
+    """
+    {"added": [...], "removed": [...], "changed": {course: edits}, "unchanged": n},
+    courses named as written in the catalogs
+    """
+    old_hashes = course_hashes(old)
+    new_hashes = course_hashes(new)
+    changed = {}
+    unchanged = 0
+    for code, digest in new_hashes.items():
+        before = old_hashes.get(code)
+        if before is None:
+            continue
+        if before == digest:
+            unchanged += 1
+        else:
+            changed[new.name(code)] = diff_trees(old.courses[code], new.courses[code])
+    return {
+        "added": sorted(new.name(code) for code in new_hashes.keys() - old_hashes.keys()),
+        "removed": sorted(old.name(code) for code in old_hashes.keys() - new_hashes.keys()),
+        "changed": dict(sorted(changed.items())),
+        "unchanged": unchanged,
+    }
+
+
+def format_edit(edit: tuple) -> str:
+    if edit[0] == "add":
+        return f"+ {edit[1]}"
+    if edit[0] == "remove":
+        return f"- {edit[1]}"
+    return f"~ {edit[1]}  ->  {edit[2]}"
+
+
+if __name__ == "__main__":
+    from prereq_checker.compiled import compile_bucket
+
+    old = Catalog({
+        "ECEN403": compile_bucket([["ECEN303 C", ".", "STAT211 C"], "ECEN314 C", "ECEN325"]),
+        "CSCE221": compile_bucket(["CSCE120 C"]),
+        "CSCE120": compile_bucket([]),
+    })
+    new = Catalog({
+        "ECEN403": compile_bucket(["ECEN325", "ECEN314 C", ["STAT211 C", ".", "ECEN303 C", ".", "MATH411 C"], "ECEN350"]),
+        "CSCE221": compile_bucket([["CSCE120 C"]]),
+        "CSCE222": compile_bucket(["CSCE120 C"]),
+    })
+    result = diff_catalogs(old, new)
+    print(result)
+    assert result["added"] == ["CSCE222"] and result["removed"] == ["CSCE120"]
+    assert result["unchanged"] == 1
+    assert result["changed"]["ECEN403"] == [
+        ("change", "ECEN303 C or STAT211 C", "ECEN303 C or MATH411 C or STAT211 C"),
+        ("add", "ECEN350"),
+    ]
@@ -0,0 +1,238 @@
+"""
+Precomputed students x courses eligibility, one bit per pair.
+
+Advisor questions ("which of my advisees can take CSCE 421?", "what can
+student X take?") become a column or row lookup instead of a prereqchecker
+run per pair. Rows are the evaluate_batch bitmaps stacked into a uint8 array
+(bit i of a row is catalog.codes[i], least significant bit first), so 400
+students x 5000 courses is 250 KB. Like the CLI's eligible command, a course
+the student has already taken (under any cross-listed code) is never set.
+
+Classification comes from each transcript dict. The SQLite transcript store
+keeps none, so a matrix built from it (eligibility --build) treats every
+classification clause ("Senior classification") as unmet.
+
+Saved as two files: <name>.npy (the bits) and <name>.json (catalog version,
+course codes, student ids). load_matrix memory-maps the .npy, so opening a
+large matrix reads only the pages a query touches, and update() of an
+existing student writes its row straight through to the file.
+
+    matrix = EligibilityMatrix.build(catalog, {"s1": {"taken": [...], "enrolled": [...]}, ...})
+    matrix.column("CSCE 421")       students who can take it
+    matrix.row("s1")                courses s1 can take
+    matrix.update("s1", {...}, catalog)
+"""
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from prereq_checker.batch import FlatCatalog, SharedView, evaluate_batch, evaluate_student
+from prereq_checker.catalog import Catalog
+from prereq_checker.compiled import Transcript, normalize_code
+
+# set bits per byte value
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _taken_columns(catalog: Catalog) -> Dict[str, List[int]]:
+    """{code a transcript stores a course under: catalog columns for it}; cross-listed codes share an entry"""
+    columns: Dict[str, List[int]] = {}
+    for j, code in enumerate(catalog.codes):
+        columns.setdefault(catalog.crosslist.find(code), []).append(j)
+    return columns
+
+
+def _clear_taken(row: np.ndarray, transcript: dict, catalog: Catalog, columns: Dict[str, List[int]]):
+    """Clear the bits of courses the student has already taken"""
+    taken = Transcript(transcript.get("taken", ()), (), None, catalog.crosslist).grades
+    for code in taken:
+        for j in columns.get(code, ()):
+            row[j >> 3] &= ~np.uint8(1 << (j & 7))
+
+
+def _paths(filename: str):
+    stem = filename[:-4] if filename.endswith(".npy") else filename
+    return stem + ".npy", stem + ".json"
+
+
+class EligibilityMatrix:
+    def __init__(self, students: List[str], codes: List[str], bits: np.ndarray, version: str = ""):
+        self.students = list(students)
+        self.codes = list(codes)
+        self.bits = bits                    # uint8 [students, ceil(courses / 8)]
+        self.version = version              # catalog.version the bits were computed against
+        self.rows = {student: i for i, student in enumerate(self.students)}
+        self.columns = {code: j for j, code in enumerate(self.codes)}
+        self._view = None                   # flattened catalog for update(), built on first use
+        self._taken = None                  # _taken_columns for update(), likewise
+
+    @classmethod
+    def build(cls, catalog: Catalog, transcripts: Dict[str, dict], processes: Optional[int] = None) -> "EligibilityMatrix":
+        """transcripts: {student: {"taken", "enrolled", "classification"}}"""
+        students = list(transcripts)
+        width = (len(catalog.codes) + 7) // 8
+        results = evaluate_batch(catalog, (transcripts[s] for s in students), processes)
+        bits = np.frombuffer(b"".join(results), dtype=np.uint8).reshape(len(students), width).copy()
+        columns = _taken_columns(catalog)
+        for i, student in enumerate(students):
+            _clear_taken(bits[i], transcripts[student], catalog, columns)
+        return cls(students, catalog.codes, bits, catalog.version)
+
+    def __len__(self):
+        return len(self.students)
+
+    def _column(self, course: str) -> int:
+        code = normalize_code(course)
+        if code not in self.columns:
+            raise KeyError(course)
+        return self.columns[code]
+
+    def _mask(self, course: str) -> np.ndarray:
+        j = self._column(course)
+        return (self.bits[:, j >> 3] >> (j & 7)) & 1 == 1
+
+    # --- Queries ---
+    def eligible(self, student: str, course: str) -> bool:
+        j = self._column(course)
+        return bool(self.bits[self.rows[student], j >> 3] >> (j & 7) & 1)
+
+    def row(self, student: str) -> List[str]:
+        """Courses student can take (and hasn't taken)"""
+        flags = np.unpackbits(self.bits[self.rows[student]], count=len(self.codes), bitorder="little")
+        return [self.codes[j] for j in np.flatnonzero(flags)]
+
+    def column(self, course: str) -> List[str]:
+        """Students who can take course (any spelling) and haven't taken it"""
+        return [self.students[i] for i in np.flatnonzero(self._mask(course))]
+
+    def row_count(self, student: str) -> int:
+        return int(_POPCOUNT[self.bits[self.rows[student]]].sum())
+
+    def column_count(self, course: str) -> int:
+        return int(np.count_nonzero(self._mask(course)))
+
+    def column_counts(self, block: int = 65536) -> np.ndarray:
+        """Eligible students per course, in codes order; unpacks block rows at a time"""
+        counts = np.zeros(len(self.codes), dtype=np.int64)
+        for start in range(0, len(self.students), block):
+            chunk = np.unpackbits(self.bits[start:start + block], axis=1, count=len(self.codes), bitorder="little")
+            counts += chunk.sum(axis=0, dtype=np.int64)
+        return counts
+
+    # --- Incremental update ---
+    def update(self, student: str, transcript: dict, catalog: Catalog):
+        """
+        Recompute one student's row. An existing row is overwritten in place
+        (through to disk if memory-mapped); a new student is appended, which
+        needs save() to persist.
+        """
+        if catalog.version != self.version or catalog.codes != self.codes:
+            raise ValueError("catalog changed since the matrix was built; rebuild it")
+        if self._view is None:
+            self._view = SharedView(memoryview(FlatCatalog(catalog).to_bytes()))
+            self._taken = _taken_columns(catalog)
+        row = np.frombuffer(evaluate_student(self._view, transcript), dtype=np.uint8).copy()
+        _clear_taken(row, transcript, catalog, self._taken)
+        if student in self.rows:
+            self.bits[self.rows[student]] = row
+        else:
+            self.rows[student] = len(self.students)
+            self.students.append(student)
+            self.bits = np.vstack([self.bits, row[np.newaxis]])
+
+    # --- Persistence ---
+    def save(self, filename: str):
+        bits_file, meta_file = _paths(filename)
+        if isinstance(self.bits, np.memmap) and os.path.abspath(self.bits.filename) == os.path.abspath(bits_file):
+            self.bits.flush()
+        else:
+            np.save(bits_file, self.bits)
+        with open(meta_file, "w") as f:
+            json.dump({"catalog": self.version, "codes": self.codes, "students": self.students}, f)
+
+    def flush(self):
+        """Write in-place row updates of a memory-mapped matrix to disk"""
+        if isinstance(self.bits, np.memmap):
+            self.bits.flush()
+
+
+def load_matrix(filename: str, mmap: bool = True) -> EligibilityMatrix:
+    """Open a saved matrix; with mmap, rows are paged in on demand and writable in place"""
+    bits_file, meta_file = _paths(filename)
+    with open(meta_file) as f:
+        meta = json.load(f)
+    bits = np.load(bits_file, mmap_mode="r+" if mmap else None, allow_pickle=False)
+    if bits.shape != (len(meta["students"]), (len(meta["codes"]) + 7) // 8):
+        raise ValueError(f"{bits_file} doesn't match {meta_file}")
+    return EligibilityMatrix(meta["students"], meta["codes"], bits, meta["catalog"])
+
+
+if __name__ == "__main__":
+    import tempfile
+    from prereq_checker.catalog import catalog_from_json
+    from prereq_checker.compiled import AND, CLASS, COURSE, compile_bucket, evaluate
+
+    catalog = Catalog({
+        "CSCE120": compile_bucket([]),
+        "CSCE221": compile_bucket(["CSCE120 C"]),
+        "CSCE222": compile_bucket(["CSCE120 C ^"]),
+        "CSCE313": compile_bucket(["CSCE221 C", ["CSCE222 C", ".", "ECEN222 C"]]),
+        "CSCE421": compile_bucket(["CSCE221 C", "MATH304 C"]),
+        "MATH304": compile_bucket(["MATH152 C"]),
+        "MATH152": compile_bucket(["MATH151 C"]),
+        "MATH151": compile_bucket([]),
+        "ECEN222": compile_bucket([]),
+        "CSCE481": (AND, ((COURSE, "CSCE120", "D", False), (CLASS, "Senior"))),
+    }, version="v1")
+    transcripts = {
+        "s1": {"taken": ["CSCE120 A", "CSCE221 B", "MATH304 C"]},
+        "s2": {"taken": ["CSCE120 A"], "enrolled": ["CSCE222 ^"], "classification": "Senior"},
+        "s3": {"taken": ["CSCE120 D", "MATH151 A"]},
+    }
+    matrix = EligibilityMatrix.build(catalog, transcripts, processes=1)
+    for student, t in transcripts.items():
+        transcript = Transcript(t.get("taken", ()), t.get("enrolled", ()), t.get("classification"))
+        assert matrix.row(student) == [c for c in catalog.codes if c not in transcript.grades
+                                       and evaluate(catalog.courses[c], transcript)]
+        assert matrix.row_count(student) == len(matrix.row(student))
+    assert "CSCE120" not in matrix.row("s1") and matrix.column("CSCE120") == []     # taken, so not offered again
+    assert not matrix.eligible("s1", "CSCE221") and matrix.eligible("s3", "MATH152")
+    assert matrix.column("CSCE481") == ["s2"]      # no classification (as from the store): the clause is unmet
+    assert matrix.column("CSCE 421") == ["s1"]
+    assert matrix.column("CSCE_222") == ["s1", "s2"] and matrix.column_count("CSCE222") == 2
+    assert list(matrix.column_counts()) == [matrix.column_count(c) for c in catalog.codes]
+    assert matrix.eligible("s3", "MATH152") and not matrix.eligible("s3", "CSCE221")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "eligibility")
+        matrix.save(filename)
+        loaded = load_matrix(filename)
+        assert isinstance(loaded.bits, np.memmap) and loaded.row("s1") == matrix.row("s1")
+        loaded.update("s3", {"taken": ["CSCE120 A", "MATH151 A"]}, catalog)
+        loaded.flush()
+        assert load_matrix(filename).eligible("s3", "CSCE221")      # written through the mapping
+        loaded.update("s4", {"taken": ["CSCE120 A", "CSCE221 A", "MATH304 B"]}, catalog)
+        loaded.save(filename)
+        reloaded = load_matrix(filename, mmap=False)
+        assert reloaded.column("CSCE421") == ["s1", "s4"] and len(reloaded) == 4
+        catalog.version = "v2"
+        try:
+            reloaded.update("s1", {}, catalog)
+            raise AssertionError("stale catalog accepted")
+        except ValueError:
+            pass
+        del loaded
+
+    # a taken course is cleared under every cross-listed code
+    crosslisted = catalog_from_json({
+        "CSCE_350": {"info": {"prereqs": [], "cross": ["ECEN_350"]}},
+        "ECEN_350": {"info": {"prereqs": []}},
+        "ECEN_449": {"info": {"prereqs": [["ECEN350 C", ".", "CSCE350 C"]]}},
+    })
+    matrix = EligibilityMatrix.build(crosslisted, {"s1": {"taken": ["ECEN350 B"]}, "s2": {}}, processes=1)
+    assert matrix.row("s1") == ["ECEN449"] and matrix.row("s2") == ["CSCE350", "ECEN350"]
+    matrix.update("s2", {"taken": ["CSCE350 A"]}, crosslisted)
+    assert matrix.row("s2") == ["ECEN449"]
+    print("ok")
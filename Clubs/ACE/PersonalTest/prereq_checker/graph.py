@@ -0,0 +1,192 @@
+"""
+Catalog prerequisite graph as NumPy CSR arrays.
+
+Course codes are interned to ids 0..n-1 (catalog courses in catalog order,
+then codes that are only referenced). Row i of the CSR lists the courses that
+course i depends on:
+
+    indptr      int64[n + 1]    row i is indices[indptr[i]:indptr[i + 1]]
+    indices     int32[m]        prerequisite course ids
+    edge_type   int8[m]         EDGE_ALTERNATIVE when the clause has other options, EDGE_CONCURRENT flag
+    group       int32[m]        clause number within the course: edges in one group are ORed, groups are ANDed
+
+Classification clauses have no course to point at and are left out.
+
+    graph = CourseGraph.from_catalog(load_catalog("data.json"))
+    graph.save("graph.npz")
+    rank_by_in_degree(load_graph("graph.npz"), top=10)
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from prereq_checker.catalog import Catalog
+from prereq_checker.compiled import AND, COURSE, OR
+
+EDGE_REQUIRED = 0
+EDGE_ALTERNATIVE = 1
+EDGE_CONCURRENT = 2     # flag: concurrent enrollment also satisfies the edge
+
+
+def _course_leaves(compiled: tuple) -> List[tuple]:
+    if compiled[0] == COURSE:
+        return [compiled]
+    if compiled[0] in (AND, OR):
+        return [leaf for child in compiled[1] for leaf in _course_leaves(child)]
+    return []       # CLASS and EXAM leaves are not courses, so they get no node or edge
+
+
+class CourseGraph:
+    def __init__(self, codes, indptr, indices, edge_type, group):
+        self.codes = np.asarray(codes)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.edge_type = np.asarray(edge_type, dtype=np.int8)
+        self.group = np.asarray(group, dtype=np.int32)
+        self._ids: Optional[Dict[str, int]] = None
+
+    @property
+    def n(self) -> int:
+        return len(self.codes)
+
+    @property
+    def m(self) -> int:
+        return len(self.indices)
+
+    def id(self, code: str) -> int:
+        if self._ids is None:
+            self._ids = {str(c): i for i, c in enumerate(self.codes)}
+        return self._ids[code]
+
+    def row(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    @classmethod
+    def from_catalog(cls, catalog: Catalog) -> "CourseGraph":
+        codes = list(catalog.codes)
+        ids = {code: i for i, code in enumerate(codes)}
+        indptr = [0]
+        indices, edge_type, group = [], [], []
+        for code in catalog.codes:
+            tree = catalog.courses[code]
+            clauses = tree[1] if tree[0] == AND else (tree,)
+            for number, clause in enumerate(clauses):
+                leaves = _course_leaves(clause)
+                kind = EDGE_ALTERNATIVE if clause[0] != COURSE else EDGE_REQUIRED
+                for _, prereq, _, concurrent in leaves:
+                    if prereq not in ids:
+                        ids[prereq] = len(codes)
+                        codes.append(prereq)
+                    indices.append(ids[prereq])
+                    edge_type.append(kind | (EDGE_CONCURRENT if concurrent else 0))
+                    group.append(number)
+            indptr.append(len(indices))
+        # referenced-only courses have no rows of their own
+        indptr.extend([len(indices)] * (len(codes) - len(catalog.codes)))
+        return cls(np.array(codes, dtype=str), indptr, indices, edge_type, group)
+
+    def reverse(self) -> "CourseGraph":
+        """Transposed graph: row i lists the courses that depend on course i"""
+        sources = np.repeat(np.arange(self.n, dtype=np.int32), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind="stable")
+        indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.n), out=indptr[1:])
+        return CourseGraph(self.codes, indptr, sources[order], self.edge_type[order], self.group[order])
+
+    def in_degree(self) -> np.ndarray:
+        """How many course requirements name each course"""
+        return np.bincount(self.indices, minlength=self.n)
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def departments(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(department names, department id per course); a department is the 2-4 letters before the number"""
+        return np.unique(np.char.rstrip(self.codes, "0123456789"), return_inverse=True)
+
+    # --- .npz ---
+    def save(self, filename: str):
+        np.savez_compressed(filename, codes=self.codes, indptr=self.indptr, indices=self.indices,
+                            edge_type=self.edge_type, group=self.group)
+
+
+def load_graph(filename: str) -> CourseGraph:
+    with np.load(filename, allow_pickle=False) as data:
+        return CourseGraph(data["codes"], data["indptr"], data["indices"], data["edge_type"], data["group"])
+
+
+# --- Analytics ---
+def _gather(graph: CourseGraph, frontier: np.ndarray) -> np.ndarray:
+    """Every neighbour of every node in frontier, as one array"""
+    starts = graph.indptr[frontier]
+    lengths = graph.indptr[frontier + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int32)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return graph.indices[offsets + np.arange(total)]
+
+
+def bfs_levels(graph: CourseGraph, sources: Iterable[int]) -> np.ndarray:
+    """Hops from the nearest source along graph edges (-1 if unreachable)"""
+    levels = np.full(graph.n, -1, dtype=np.int32)
+    frontier = np.unique(np.asarray(list(sources), dtype=np.int64))
+    depth = 0
+    while frontier.size:
+        levels[frontier] = depth
+        nxt = _gather(graph, frontier)
+        frontier = np.unique(nxt[levels[nxt] < 0]).astype(np.int64)
+        depth += 1
+    return levels
+
+
+def reachability_counts(graph: CourseGraph, sources: Iterable[int]) -> np.ndarray:
+    """For each source, how many other courses it reaches. On graph.reverse() that is how many courses it unlocks"""
+    return np.array([int((bfs_levels(graph, [s]) > 0).sum()) for s in sources], dtype=np.int64)
+
+
+def rank_by_in_degree(graph: CourseGraph, top: int = 20) -> List[Tuple[str, int]]:
+    """The most depended-on courses"""
+    degree = graph.in_degree()
+    order = np.argsort(-degree, kind="stable")[:top]
+    return [(str(graph.codes[i]), int(degree[i])) for i in order]
+
+
+def department_degrees(graph: CourseGraph) -> Dict[str, Tuple[int, int]]:
+    """{department: (fan-in, fan-out)}: requirement edges into and out of each department's courses"""
+    names, dept = graph.departments()
+    fan_in = np.bincount(dept[graph.indices], minlength=len(names))
+    fan_out = np.bincount(dept, weights=graph.out_degree(), minlength=len(names)).astype(np.int64)
+    return {str(name): (int(fan_in[i]), int(fan_out[i])) for i, name in enumerate(names)}
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    from prereq_checker.compiled import compile_bucket
+
+    catalog = Catalog({
+        "CSCE120": compile_bucket([]),
+        "CSCE221": compile_bucket(["CSCE120 C"]),
+        "CSCE222": compile_bucket([["CSCE120 C", ".", "MATH151"]]),
+        "CSCE313": compile_bucket(["CSCE221 C", ["CSCE222 C ^", ".", "ECEN222 C ^"]]),
+    })
+    graph = CourseGraph.from_catalog(catalog)
+    assert list(graph.codes) == ["CSCE120", "CSCE221", "CSCE222", "CSCE313", "MATH151", "ECEN222"]
+    assert list(graph.row(graph.id("CSCE313"))) == [1, 2, 5]
+    assert list(graph.edge_type[graph.indptr[3]:]) == [EDGE_REQUIRED, EDGE_ALTERNATIVE | EDGE_CONCURRENT, EDGE_ALTERNATIVE | EDGE_CONCURRENT]
+    assert rank_by_in_degree(graph, 1) == [("CSCE120", 2)]
+    assert department_degrees(graph)["CSCE"] == (4, 6)
+    short = CourseGraph.from_catalog(Catalog({"CS101": compile_bucket(["CSE100"]), "CSCE101": compile_bucket([])}))
+    assert list(short.departments()[0]) == ["CS", "CSCE", "CSE"], short.departments()
+
+    unlocks = graph.reverse()
+    assert list(bfs_levels(unlocks, [graph.id("CSCE120")])) == [0, 1, 1, 2, -1, -1]
+    assert list(reachability_counts(unlocks, [0, 4])) == [3, 2]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "graph.npz")
+        graph.save(path)
+        loaded = load_graph(path)
+        assert (loaded.indices == graph.indices).all() and list(loaded.codes) == list(graph.codes)
+    print("ok")
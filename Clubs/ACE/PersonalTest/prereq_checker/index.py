@@ -0,0 +1,212 @@
+"""
+Secondary indexes over a loaded catalog, and the filter syntax that uses them.
+
+    department          "CSCE" -> its courses, sorted by number
+    course number       sorted number arrays (per department and catalog-wide),
+                        ranges found with bisect
+    classification      "Senior" -> courses with a Senior classification requirement
+    grade               "B" -> courses with a prerequisite needing exactly a B
+
+A filter is whitespace-separated terms, all of which must hold; commas OR
+values within a term:
+
+    CSCE  ECEN,CSCE          department (also dept:CSCE)
+    4xx  CSCE4xx  "CSCE 4xx" course level, optionally in a department
+    400-499  300+  -299      number range (also number:400-499)
+    senior  class:senior     requires that classification
+    grade:B                  some prerequisite needs a B or better
+
+select() starts from the narrowest index the filter names and intersects
+the rest, so a query never scans the whole catalog.
+"""
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from prereq_checker.catalog import Catalog
+from prereq_checker.compiled import AND, CLASS, CLASSIFICATIONS, COURSE, OR
+
+MAX_NUMBER = 999
+GRADES = "ABCD"
+
+_dept_re = re.compile(r"^[A-Z]{2,4}$")
+_level_re = re.compile(r"^([A-Z]{2,4})?\s*([0-9])XX$")
+_range_re = re.compile(r"^([0-9]{0,3})\s*(-|\+)\s*([0-9]{0,3})$")
+
+
+class Filter(NamedTuple):
+    departments: FrozenSet[str] = frozenset()       # empty: any department
+    low: int = 0
+    high: int = MAX_NUMBER
+    classifications: FrozenSet[str] = frozenset()
+    grade: Optional[str] = None                     # weakest grade that counts ("B": A or B)
+
+    @property
+    def empty(self) -> bool:
+        return self == Filter()
+
+
+def split_code(code: str) -> Tuple[str, int]:
+    """'CSCE221' -> ('CSCE', 221)"""
+    return code[:-3], int(code[-3:])
+
+
+def _requirements(compiled: tuple):
+    """(classification levels, minimum grades) named anywhere in a compiled tree"""
+    levels, grades = set(), set()
+    pending = [compiled]
+    while pending:
+        node = pending.pop()
+        kind = node[0]
+        if kind == COURSE:
+            grades.add(node[2])
+        elif kind == CLASS:
+            levels.add(node[1])
+        elif kind in (AND, OR):
+            pending.extend(node[1])
+    return levels, grades
+
+
+class CatalogIndex:
+    def __init__(self, catalog: Catalog):
+        self.catalog = catalog
+        self.departments: Dict[str, Tuple[List[int], List[str]]] = {}
+        self.classifications: Dict[str, List[str]] = {}
+        self.grades: Dict[str, List[str]] = {}
+        everything = []
+        for code in catalog.codes:          # sorted, so each department is contiguous and in number order
+            dept, number = split_code(code)
+            numbers, codes = self.departments.setdefault(dept, ([], []))
+            numbers.append(number)
+            codes.append(code)
+            everything.append((number, code))
+            levels, grades = _requirements(catalog.courses[code])
+            for level in levels:
+                self.classifications.setdefault(level, []).append(code)
+            for grade in grades:
+                self.grades.setdefault(grade, []).append(code)
+        everything.sort()
+        self.numbers = [number for number, _ in everything]
+        self.by_number = [code for _, code in everything]
+
+    # --- Single indexes ---
+    def department(self, dept: str) -> List[str]:
+        return list(self.departments.get(dept.upper(), ((), ()))[1])
+
+    def number_range(self, low: int, high: int, dept: Optional[str] = None) -> List[str]:
+        """Courses numbered low..high (inclusive), in one department or all of them"""
+        if dept is None:
+            numbers, codes = self.numbers, self.by_number
+        else:
+            numbers, codes = self.departments.get(dept.upper(), ([], []))
+        return codes[bisect_left(numbers, low):bisect_right(numbers, high)]
+
+    def requiring_classification(self, level: str) -> List[str]:
+        return list(self.classifications.get(level.capitalize(), ()))
+
+    def requiring_grade(self, grade: str) -> List[str]:
+        """Courses with a prerequisite needing grade or better"""
+        found = set()
+        for letter in GRADES[:GRADES.index(grade.upper()) + 1]:
+            found.update(self.grades.get(letter, ()))
+        return sorted(found)
+
+    # --- Filters ---
+    def select(self, query: Filter) -> List[str]:
+        """Catalog codes matching every part of query, sorted"""
+        if query.departments:
+            candidates = [code for dept in sorted(query.departments)
+                          for code in self.number_range(query.low, query.high, dept)]
+        elif query.low > 0 or query.high < MAX_NUMBER:
+            candidates = self.number_range(query.low, query.high)
+        else:
+            candidates = None
+        sets = []
+        if query.classifications:
+            sets.append({code for level in query.classifications for code in self.requiring_classification(level)})
+        if query.grade:
+            sets.append(set(self.requiring_grade(query.grade)))
+        if candidates is None:
+            if not sets:
+                return list(self.catalog.codes)
+            sets.sort(key=len)
+            candidates, sets = sets[0], sets[1:]
+        return sorted(code for code in candidates if all(code in s for s in sets))
+
+
+def parse_filter(text: str) -> Filter:
+    """'CSCE 4xx senior' -> Filter; raises ValueError on a term it doesn't understand"""
+    departments, classifications = set(), set()
+    low, high, grade = 0, MAX_NUMBER, None
+    # "CSCE 4xx" -> "CSCE4xx" so a department and its level stay one term
+    terms = re.sub(r"\b([A-Za-z]{2,4})\s+([0-9][xX]{2})\b", r"\1\2", text).split()
+    for term in terms:
+        key, _, value = term.partition(":") if ":" in term else ("", "", term)
+        key, value = key.lower(), value.upper()
+        if key in ("class", "classification") or (not key and value.capitalize() in CLASSIFICATIONS):
+            for level in value.split(","):
+                if level.capitalize() not in CLASSIFICATIONS:
+                    raise ValueError(f"unknown classification {level!r}")
+                classifications.add(level.capitalize())
+        elif key == "grade":
+            if len(value) != 1 or value not in GRADES:
+                raise ValueError(f"grade must be one of {', '.join(GRADES)}")
+            grade = value
+        elif key in ("dept", "department") or (not key and all(_dept_re.match(d) for d in value.split(","))):
+            departments.update(value.split(","))
+        elif key in ("", "number", "level") and _level_re.match(value):
+            dept, hundreds = _level_re.match(value).groups()
+            if dept:
+                departments.add(dept)
+            low, high = max(low, int(hundreds) * 100), min(high, int(hundreds) * 100 + 99)
+        elif key in ("", "number") and _range_re.match(value):
+            start, op, end = _range_re.match(value).groups()
+            if not start and not end:
+                raise ValueError(f"empty number range {term!r}")
+            low = max(low, int(start) if start else 0)
+            high = min(high, int(end) if end else MAX_NUMBER) if op == "-" else high
+        else:
+            raise ValueError(f"can't use filter term {term!r}")
+    return Filter(frozenset(departments), low, high, frozenset(classifications), grade)
+
+
+if __name__ == "__main__":
+    from prereq_checker.compiled import compile_bucket
+
+    catalog = Catalog({
+        "CSCE120": compile_bucket([]),
+        "CSCE221": compile_bucket(["CSCE120 C"]),
+        "CSCE411": compile_bucket(["CSCE221 B"]),
+        "CSCE482": (AND, ((COURSE, "CSCE411", "C", False), (CLASS, "Senior"))),
+        "ECEN403": (AND, ((COURSE, "ECEN314", "C", False), (CLASS, "Senior"))),
+        "ECEN314": compile_bucket(["MATH308 A"]),
+        "MATH308": compile_bucket([]),
+        "MATH411": (OR, ((CLASS, "Junior"), (CLASS, "Senior"))),
+    })
+    index = CatalogIndex(catalog)
+    assert index.department("csce") == ["CSCE120", "CSCE221", "CSCE411", "CSCE482"]
+    assert index.number_range(400, 499) == ["ECEN403", "CSCE411", "MATH411", "CSCE482"]
+    assert index.number_range(200, 420, "CSCE") == ["CSCE221", "CSCE411"]
+    assert index.requiring_classification("senior") == ["CSCE482", "ECEN403", "MATH411"]
+    assert index.requiring_grade("B") == ["CSCE411", "ECEN314"]
+
+    assert parse_filter("CSCE 4xx") == Filter(frozenset({"CSCE"}), 400, 499)
+    assert parse_filter("dept:ecen,csce 300+ class:senior grade:b") == Filter(
+        frozenset({"ECEN", "CSCE"}), 300, MAX_NUMBER, frozenset({"Senior"}), "B")
+    assert parse_filter("-299").high == 299 and parse_filter("").empty
+    for bad in ("grade:E", "class:postdoc", "CSCE-ish", "-"):
+        try:
+            parse_filter(bad)
+            raise AssertionError(bad)
+        except ValueError:
+            pass
+
+    def scan(query):
+        return sorted(code for code in catalog.codes if (
+            (not query.departments or split_code(code)[0] in query.departments)
+            and query.low <= split_code(code)[1] <= query.high
+            and (not query.classifications or query.classifications & _requirements(catalog.courses[code])[0])
+            and (not query.grade or any(g <= query.grade for g in _requirements(catalog.courses[code])[1]))))
+    for text in ("CSCE 4xx", "ECEN senior", "4xx senior", "grade:B", "senior grade:C", "CSCE,MATH 300-450", "", "junior"):
+        assert index.select(parse_filter(text)) == scan(parse_filter(text)), text
+    print("ok")
@@ -0,0 +1,141 @@
+"""
+Catalog integrity: prerequisite cycles and dangling references.
+
+Cycles are found with an iterative Tarjan SCC pass over the course reference
+graph (no recursion, so catalog size and chain length don't matter), and a
+course that names itself ("CHEM 107" requiring CHEM 107) counts as a cycle
+of one. A dangling reference is a prerequisite naming a course that isn't in
+the catalog. Both passes are linear in courses + references.
+
+load_catalog attaches the report as catalog.integrity.
+"""
+from typing import Dict, List
+
+from prereq_checker.compiled import AND, COURSE, OR
+
+
+def references(compiled: tuple) -> List[str]:
+    """Course codes a compiled tree names, in order, without repeats"""
+    found = {}
+    pending = [compiled]
+    while pending:
+        node = pending.pop()
+        if node[0] == COURSE:
+            found.setdefault(node[1], None)
+        elif node[0] in (AND, OR):
+            pending.extend(reversed(node[1]))
+        # CLASS and EXAM leaves name no course
+    return list(found)
+
+
+def strongly_connected(adjacency: List[List[int]]) -> List[List[int]]:
+    """Tarjan's SCCs over nodes 0..n-1, iteratively; components come out dependencies first"""
+    n = len(adjacency)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, i = work[-1]
+            if index[v] == -1:
+                index[v] = low[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack[v] = True
+            neighbours = adjacency[v]
+            while i < len(neighbours):
+                w = neighbours[i]
+                i += 1
+                if index[w] == -1:
+                    work[-1] = (v, i)
+                    work.append((w, 0))
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+    return components
+
+
+class IntegrityReport:
+    def __init__(self, cycles: List[List[str]], dangling: Dict[str, List[str]]):
+        self.cycles = cycles            # each a sorted list of courses; self-references are length 1
+        self.dangling = dangling        # course -> referenced codes missing from the catalog
+
+    @property
+    def ok(self) -> bool:
+        return not self.cycles and not self.dangling
+
+    @property
+    def cyclic(self) -> set:
+        return {code for cycle in self.cycles for code in cycle}
+
+    def summary(self) -> str:
+        missing = {code for refs in self.dangling.values() for code in refs}
+        return (f"{len(self.cycles)} prerequisite cycle(s), "
+                f"{len(self.dangling)} course(s) naming {len(missing)} course(s) missing from the catalog")
+
+
+def check_integrity(catalog) -> IntegrityReport:
+    codes = catalog.codes
+    ids = {code: i for i, code in enumerate(codes)}
+    adjacency: List[List[int]] = []
+    dangling: Dict[str, List[str]] = {}
+    self_loops = set()
+    for code in codes:
+        refs = references(catalog.courses[code])
+        adjacency.append([ids[ref] for ref in refs if ref in ids])
+        missing = [ref for ref in refs if ref not in ids]
+        if missing:
+            dangling[catalog.name(code)] = missing
+        if code in refs:
+            self_loops.add(code)
+    cycles = []
+    for component in strongly_connected(adjacency):
+        if len(component) > 1 or codes[component[0]] in self_loops:
+            cycles.append(sorted(codes[i] for i in component))
+    cycles.sort()
+    return IntegrityReport(cycles, dangling)
+
+
+if __name__ == "__main__":
+    from prereq_checker.catalog import Catalog
+    from prereq_checker.compiled import compile_bucket
+
+    catalog = Catalog({
+        "CHEM107": compile_bucket(["CHEM107"]),
+        "ECEN222": compile_bucket([["CSCE222", ".", "MATH151"]]),
+        "CSCE222": compile_bucket(["ECEN222"]),
+        "STAT211": compile_bucket(["MATH151", "CSCE222"]),
+        "MATH151": compile_bucket([]),
+        "ECEN403": compile_bucket(["ECEN350 C", "STAT211"]),
+    })
+    report = check_integrity(catalog)
+    assert report.cycles == [["CHEM107"], ["CSCE222", "ECEN222"]], report.cycles
+    assert report.dangling == {"ECEN403": ["ECEN350"]}
+    assert not report.ok
+    print(report.summary())
+
+    # a long chain: no recursion limit
+    chain = {f"XAAA{i:03d}": compile_bucket([f"XAAA{i + 1:03d}"]) for i in range(999)}
+    chain["XAAA999"] = compile_bucket(["XAAA000"])
+    assert len(check_integrity(Catalog(chain)).cycles[0]) == 1000
@@ -0,0 +1,156 @@
+"""
+Near-eligibility: how many courses a student is from being able to take each course.
+
+For one transcript every catalog course gets a distance, the fewest courses
+still to take before enrolling in it:
+
+    leaf already met                0
+    other leaf                      1 + distance(that course)   take it, after its own prerequisites
+    AND                             sum of children
+    OR                              min of children
+    classification not reached      math.inf                    no course fixes that
+    exam alternative                math.inf                    nor an exam score
+
+Courses that are only referenced (not in the catalog) count as having no
+prerequisites. Courses are visited in topological order, so each course's
+distance is computed once and reused by every tree that names it (one pass
+over the catalog, however deep the chains); courses on a prerequisite cycle
+are relaxed until they stop changing.
+
+A course named in two branches of an AND is counted in both, so where
+branches share prerequisites the distance is an upper bound; missing_courses()
+lists each course once.
+"""
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from prereq_checker.catalog import Catalog
+from prereq_checker.compiled import AND, CLASS, COURSE, EXAM, OR, Transcript
+from prereq_checker.semesters import topological_order
+
+
+def _distance(compiled: tuple, transcript: Transcript, distance: Dict[str, float]) -> float:
+    kind = compiled[0]
+    if kind == COURSE:
+        _, code, grade, concurrent = compiled
+        if transcript.meets(code, grade, concurrent):
+            return 0
+        return 1 + distance.get(code, 0)
+    if kind == AND:
+        return sum(_distance(c, transcript, distance) for c in compiled[1])
+    if kind == OR:
+        return min((_distance(c, transcript, distance) for c in compiled[1]), default=math.inf)
+    if kind == CLASS:
+        return 0 if transcript.has_classification(compiled[1]) else math.inf
+    if kind == EXAM:
+        return math.inf
+    raise ValueError(f"Unknown compiled node {compiled!r}")
+
+
+def distances(catalog: Catalog, transcript: Transcript,
+              order: Optional[Tuple[List[str], List[str]]] = None) -> Dict[str, float]:
+    """{course: courses still to take before it can be taken}; pass topological_order(catalog) to reuse it"""
+    acyclic, cyclic = order or topological_order(catalog)
+    distance: Dict[str, float] = {}
+    for code in acyclic:
+        distance[code] = _distance(catalog.courses[code], transcript, distance)
+    for code in cyclic:
+        distance[code] = math.inf
+    for _ in range(len(cyclic)):
+        changed = False
+        for code in cyclic:
+            value = _distance(catalog.courses[code], transcript, distance)
+            if value < distance[code]:
+                distance[code] = value
+                changed = True
+        if not changed:
+            break
+    return distance
+
+
+def _plan(compiled: tuple, transcript: Transcript, catalog: Catalog, distance: Dict[str, float],
+          planned: List[str], seen: set):
+    kind = compiled[0]
+    if kind == COURSE:
+        _, code, grade, concurrent = compiled
+        if transcript.meets(code, grade, concurrent) or code in seen:
+            return
+        seen.add(code)
+        if code in catalog.courses:
+            _plan(catalog.courses[code], transcript, catalog, distance, planned, seen)
+        planned.append(code)
+    elif kind == AND:
+        for child in compiled[1]:
+            _plan(child, transcript, catalog, distance, planned, seen)
+    elif kind == OR and compiled[1]:
+        best = min(compiled[1], key=lambda child: _distance(child, transcript, distance))
+        _plan(best, transcript, catalog, distance, planned, seen)
+
+
+def missing_courses(catalog: Catalog, transcript: Transcript, code: str,
+                    distance: Optional[Dict[str, float]] = None) -> List[str]:
+    """Courses to take before `code`, prerequisites first, along the cheapest alternatives"""
+    if distance is None:
+        distance = distances(catalog, transcript)
+    planned: List[str] = []
+    _plan(catalog.courses[code], transcript, catalog, distance, planned, {code})
+    return planned
+
+
+def near_eligible(catalog: Catalog, transcript: Transcript, k: int = 2,
+                  codes: Optional[Iterable[str]] = None,
+                  distance: Optional[Dict[str, float]] = None) -> List[Tuple[str, float]]:
+    """
+    (course, distance) for courses not taken or enrolled in that are at most
+    k courses away, nearest first. codes narrows the courses considered (e.g. a filter).
+    """
+    if distance is None:
+        distance = distances(catalog, transcript)
+    candidates = catalog.codes if codes is None else codes
+    near = [(code, distance[code]) for code in candidates
+            if distance[code] <= k and transcript.resolve(code) not in transcript.grades
+            and transcript.resolve(code) not in transcript.enrolled]
+    near.sort(key=lambda item: (item[1], item[0]))
+    return near
+
+
+if __name__ == "__main__":
+    from itertools import combinations
+    from prereq_checker.compiled import compile_bucket, evaluate
+
+    catalog = Catalog({
+        "CSCE120": compile_bucket([]),
+        "CSCE221": compile_bucket(["CSCE120 C"]),
+        "CSCE222": compile_bucket(["CSCE120 C ^"]),
+        "CSCE313": compile_bucket(["CSCE221 C", ["CSCE222 C", ".", "ECEN222 C"]]),
+        "CSCE411": compile_bucket(["CSCE313 C", "MATH304 C"]),
+        "CSCE481": (AND, ((COURSE, "CSCE313", "D", False), (CLASS, "Senior"))),
+        "MATH304": compile_bucket(["MATH152 C"]),
+        "MATH251": compile_bucket([["MATH152 C", ".", "EXAM"]]),    # an exam alternative is never the way in
+        "MATH001": compile_bucket(["MATH002"]),     # a cycle with a way out
+        "MATH002": compile_bucket([["MATH001", ".", "MATH151"]]),
+    })
+    fresh = Transcript(classification="Freshman")
+    result = distances(catalog, fresh)
+    assert result == {"CSCE120": 0, "CSCE221": 1, "CSCE222": 1, "CSCE313": 3, "CSCE411": 6, "CSCE481": math.inf,
+                      "MATH304": 1, "MATH251": 1, "MATH001": 2, "MATH002": 1}, result
+    assert missing_courses(catalog, fresh, "CSCE313") == ["CSCE120", "CSCE221", "ECEN222"]
+    assert missing_courses(catalog, fresh, "MATH001") == ["MATH151", "MATH002"]
+    assert missing_courses(catalog, fresh, "MATH251") == ["MATH152"]
+
+    student = Transcript(["CSCE120 A", "CSCE221 B"], ["CSCE222 ^"], "Junior")
+    assert near_eligible(catalog, student, k=1) == [("CSCE313", 1), ("MATH002", 1), ("MATH251", 1), ("MATH304", 1)]
+    assert missing_courses(catalog, student, "CSCE411") == ["CSCE222", "CSCE313", "MATH152", "MATH304"]
+
+    # distance 0 is exactly "eligible now", and distance d is never beaten by taking fewer than d courses
+    taken = ["CSCE120 A"]
+    transcript = Transcript(taken, [], "Senior")
+    result = distances(catalog, transcript)
+    assert all((result[c] == 0) == evaluate(catalog.courses[c], transcript) for c in catalog.codes)
+    pool = ["CSCE221", "CSCE222", "ECEN222", "CSCE313", "MATH152", "MATH304", "MATH151", "MATH002"]
+    for code in catalog.codes:
+        fewest = next((n for n in range(len(pool) + 1) for extra in combinations(pool, n)
+                       if evaluate(catalog.courses[code], Transcript(taken + [f"{c} A" for c in extra], [], "Senior"))),
+                      math.inf)
+        assert fewest <= result[code], (code, fewest, result[code])
+    print("ok")
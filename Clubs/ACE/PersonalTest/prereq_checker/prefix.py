@@ -0,0 +1,188 @@
+"""
+Prefix lookup over catalog course codes, for autocomplete and forgiving input.
+
+The index is the sorted course codes as fixed-width records (8 bytes, NUL
+padded), so a prefix like "CSCE2" is the record range between two bisects.
+It has no per-code objects, so it can be memory-mapped from disk and
+searched without reading the rest of the file. That is what lets `complete`
+answer without loading the catalog: load_catalog builds the index in memory
+(catalog.prefix), and prefix_index_for() keeps a "<catalog>.prefix" copy next
+to the catalog file, rebuilt when the catalog is newer.
+
+resolve() turns what a user typed into a course:
+
+    exact code ("csce_221")                 that course
+    prefix with one match ("ECEN35")        that course
+    prefix with several ("csce 2")          no course, the matches as suggestions
+    nothing matches ("CSEC221")             no course, close spellings as suggestions
+"""
+import difflib
+import mmap
+import os
+from bisect import bisect_left
+from typing import Iterable, List, NamedTuple, Optional
+
+WIDTH = 8
+FUZZY_POOL = 5000       # most codes compared for close spellings
+
+
+def normalize_prefix(text: str) -> str:
+    """'csce 2' -> 'CSCE2', 'ecen_35' -> 'ECEN35'"""
+    return "".join(text.split()).replace("_", "").upper()
+
+
+def key_for(code: str) -> str:
+    """'CSCE221' -> 'CSCE_221', how catalog keys are written"""
+    return f"{code[:-3]}_{code[-3:]}"
+
+
+class _Records:
+    """Sequence view of the fixed-width records, for bisect"""
+
+    def __init__(self, buf):
+        self.buf = buf
+
+    def __len__(self):
+        return len(self.buf) // WIDTH
+
+    def __getitem__(self, i):
+        return self.buf[i * WIDTH:(i + 1) * WIDTH]
+
+
+class PrefixIndex:
+    def __init__(self, buf):
+        self.buf = buf                  # bytes or mmap of sorted records
+        self.records = _Records(buf)
+        self._file = None
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[str]) -> "PrefixIndex":
+        records = []
+        for code in sorted(codes):
+            raw = code.encode("ascii")
+            if len(raw) > WIDTH:
+                raise ValueError(f"course code {code!r} is longer than {WIDTH} characters")
+            records.append(raw.ljust(WIDTH, b"\0"))
+        return cls(b"".join(records))
+
+    def __len__(self):
+        return len(self.records)
+
+    def code(self, i: int) -> str:
+        return bytes(self.records[i]).rstrip(b"\0").decode("ascii")
+
+    def span(self, prefix: str):
+        """(first, end) record positions of codes starting with prefix"""
+        raw = normalize_prefix(prefix).encode("ascii", "replace")
+        return bisect_left(self.records, raw), bisect_left(self.records, raw + b"\xff")
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        first, end = self.span(prefix)
+        if limit is not None:
+            end = min(end, first + limit)
+        return [self.code(i) for i in range(first, end)]
+
+    def count(self, prefix: str) -> int:
+        first, end = self.span(prefix)
+        return end - first
+
+    def __contains__(self, code: str):
+        code = normalize_prefix(code)
+        first, end = self.span(code)
+        return first < end and self.code(first) == code
+
+    def save(self, filename: str):
+        tmp = filename + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.buf)
+        os.replace(tmp, filename)
+
+    def close(self):
+        if self._file is not None:
+            self.buf.close()
+            self._file.close()
+            self._file = None
+
+
+def load_prefix_index(filename: str) -> PrefixIndex:
+    """Memory-map a saved index; nothing is read until a lookup touches it"""
+    f = open(filename, "rb")
+    if os.fstat(f.fileno()).st_size == 0:
+        f.close()
+        return PrefixIndex(b"")
+    index = PrefixIndex(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    index._file = f
+    return index
+
+
+def prefix_index_for(catalog_file: str) -> PrefixIndex:
+    """The saved index beside catalog_file, rebuilt (by loading the catalog) if missing or stale"""
+    filename = catalog_file + ".prefix"
+    try:
+        if os.path.getmtime(filename) >= os.path.getmtime(catalog_file):
+            return load_prefix_index(filename)
+    except OSError:
+        pass
+    from prereq_checker.catalog import load_catalog
+    index = load_catalog(catalog_file).prefix
+    try:
+        index.save(filename)
+    except OSError:
+        pass        # read-only location: still usable in memory
+    return index
+
+
+class Resolution(NamedTuple):
+    code: Optional[str]         # the course, if the input picks out exactly one
+    suggestions: List[str]      # otherwise what it might have meant
+
+
+def resolve(index: PrefixIndex, text: str, limit: int = 10) -> Resolution:
+    prefix = normalize_prefix(text)
+    if not prefix:
+        return Resolution(None, [])
+    first, end = index.span(prefix)
+    if end - first == 1 or (first < end and index.code(first) == prefix):
+        return Resolution(index.code(first), [])
+    if first < end:
+        return Resolution(None, index.complete(prefix, limit))
+    # no match: compare against the codes that share the longest prefix with the input
+    for size in range(len(prefix) - 1, 0, -1):
+        first, end = index.span(prefix[:size])
+        if first < end:
+            pool = [index.code(i) for i in range(first, min(end, first + FUZZY_POOL))]
+            return Resolution(None, difflib.get_close_matches(prefix, pool, n=limit, cutoff=0.75))
+    return Resolution(None, [])
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    codes = ["CSCE120", "CSCE121", "CSCE221", "CSCE222", "CSCE313", "ECEN350", "ECEN449", "MATH151"]
+    index = PrefixIndex.from_codes(codes)
+    assert index.complete("csce 2") == ["CSCE221", "CSCE222"]
+    assert index.complete("CSCE", limit=3) == ["CSCE120", "CSCE121", "CSCE221"]
+    assert index.complete("ECEN_4") == ["ECEN449"] and index.complete("ZZZ") == []
+    assert index.count("") == len(codes) and "csce 221" in index and "CSCE22" not in index
+    assert resolve(index, "csce_221") == Resolution("CSCE221", [])
+    assert resolve(index, "ECEN35") == Resolution("ECEN350", [])
+    assert resolve(index, "csce 2") == Resolution(None, ["CSCE221", "CSCE222"])
+    assert resolve(index, "CSEC221").suggestions[0] == "CSCE221"
+    assert resolve(index, "   ") == Resolution(None, [])
+
+    # 100k codes from a saved, memory-mapped file
+    many = [f"{a}{b}{c}{d}{n:03d}" for a in "ABCDEFGHIJ" for b in "AEIOU" for c in "KLMNR" for d in "STX"
+            for n in range(100, 235)]
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "codes.prefix")
+        PrefixIndex.from_codes(many).save(filename)
+        loaded = load_prefix_index(filename)
+        assert len(loaded) == len(many) and loaded.complete("CUNX23") == [f"CUNX23{d}" for d in range(5)]
+        start = time.perf_counter()
+        for _ in range(1000):
+            loaded.complete("DOMT1", limit=20)
+        per_lookup = (time.perf_counter() - start) / 1000
+        assert per_lookup < 1e-3, per_lookup
+        loaded.close()
+    print(f"ok ({per_lookup * 1e6:.0f} us per completion over {len(many):,} codes)")
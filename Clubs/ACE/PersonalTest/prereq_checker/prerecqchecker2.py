@@ -1,5 +1,6 @@
 import json
-import re
+
+from prereq_parser.coursecode import CourseCode
 
 def parse_prereq(filename, course_name):
     try:
@@ -55,39 +56,34 @@ def evaluate_single_requirement(courses_taken, courses_enrolled, token):
     if token == ".":
         return token
 
-    # Regex for base course pattern, e.g., "CHEM107 C" or "CHEM107 C ^"
-    pattern = r"^([A-Z]{4}\d{3})\s*([A-F])?(?:\s*\^)?$"
-    match = re.match(pattern, token)
-    if not match:
+    # Base course pattern, e.g., "CHEM107 C" or "CHEM107 C ^" (parsed once per spelling)
+    required = CourseCode.parse(token)
+    if required is None:
         return False
 
-    course_code, min_grade = match.groups()
-    min_grade = min_grade or "D"  # default to D if unspecified (most lenient)
+    course_code = required.code
+    min_grade = required.grade or "D"  # default to D if unspecified (most lenient)
 
     # Build both possible representations
     required_with_grade = f"{course_code} {min_grade}"
     required_concurrent = f"{required_with_grade} ^"
 
-    # Helper: function to extract grade letter
-    def extract_grade(entry):
-        parts = entry.split()
-        return parts[-1] if len(parts) > 1 and parts[-1].isalpha() else None
-
     # --- 1️⃣ Check if concurrently enrolled ---
     if required_concurrent in courses_enrolled:
         return True  # currently taking it → satisfies "C ^" type prereq
 
     # --- 2️⃣ Check if already taken with sufficient grade ---
     for taken_course in courses_taken:
-        if taken_course.startswith(course_code):
-            grade = extract_grade(taken_course)
-            if grade and grade <= min_grade:
+        taken = CourseCode.parse(taken_course)
+        if taken is not None and taken.code == course_code:
+            if taken.grade and taken.grade <= min_grade:
                 # e.g., A <= C (satisfied)
                 return True
 
     # --- 3️⃣ Check if enrolled in base course (not marked with ^)
     for enrolled_course in courses_enrolled:
-        if enrolled_course.startswith(course_code):
+        enrolled = CourseCode.parse(enrolled_course)
+        if enrolled is not None and enrolled.code == course_code:
             return True
 
     return False
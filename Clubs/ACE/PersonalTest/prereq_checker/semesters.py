@@ -0,0 +1,209 @@
+"""
+Minimum semesters before a course can be taken.
+
+For one transcript, every course gets the number of semesters that must pass
+before the student could enroll in it (0: eligible now). Courses are visited
+in topological order, so a course's prerequisites are settled first:
+
+    leaf already met                0
+    leaf allowing concurrent        earliest(prereq)        take both in the same semester
+    other leaf                      earliest(prereq) + 1
+    AND                             max of children         longest chain
+    OR                              min of children         best alternative
+    classification                  2 semesters per level still to go
+    classification, none given      math.inf                    as in evaluate and near
+
+Courses that are only referenced (not in the catalog) count as having no
+prerequisites. A requirement that can never be met is math.inf. Courses on a
+prerequisite cycle are relaxed until they stop changing.
+
+min_semesters_many does the same for many students at once with one NumPy
+vector per compiled node.
+"""
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from prereq_checker.batch import grade_rank
+from prereq_checker.catalog import Catalog
+from prereq_checker.compiled import AND, CLASS, CLASSIFICATIONS, COURSE, EXAM, OR, Transcript, classification_level
+from prereq_checker.integrity import references
+
+SEMESTERS_PER_CLASSIFICATION = 2
+
+
+def topological_order(catalog: Catalog) -> Tuple[List[str], List[str]]:
+    """(catalog courses with prerequisites before dependents, courses on or behind a cycle)"""
+    dependents: Dict[str, List[str]] = {}
+    waiting = {}
+    for code, tree in catalog.courses.items():
+        prereqs = {ref for ref in references(tree) if ref in catalog.courses and ref != code}
+        waiting[code] = len(prereqs)
+        for ref in prereqs:
+            dependents.setdefault(ref, []).append(code)
+    order = [code for code in catalog.codes if waiting[code] == 0]
+    for code in order:
+        for dependent in dependents.get(code, ()):
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                order.append(dependent)
+    done = set(order)
+    return order, [code for code in catalog.codes if code not in done]
+
+
+# --- One transcript ---
+def _cost(compiled: tuple, transcript: Transcript, earliest: Dict[str, float]) -> float:
+    kind = compiled[0]
+    if kind == COURSE:
+        _, code, grade, concurrent = compiled
+        if transcript.meets(code, grade, concurrent):
+            return 0
+        before = earliest.get(code, 0)
+        return before if concurrent else before + 1
+    if kind == AND:
+        return max((_cost(c, transcript, earliest) for c in compiled[1]), default=0)
+    if kind == OR:
+        return min((_cost(c, transcript, earliest) for c in compiled[1]), default=math.inf)
+    if kind == CLASS:
+        return max(0, CLASSIFICATIONS.index(compiled[1]) - classification_level(transcript.classification)) * SEMESTERS_PER_CLASSIFICATION
+    if kind == EXAM:
+        return math.inf     # no course leads to an exam score
+    raise ValueError(f"Unknown compiled node {compiled!r}")
+
+
+def min_semesters(catalog: Catalog, transcript: Transcript,
+                  order: Optional[Tuple[List[str], List[str]]] = None) -> Dict[str, float]:
+    """{course: semesters before it can be taken}; pass topological_order(catalog) to reuse it"""
+    acyclic, cyclic = order or topological_order(catalog)
+    earliest: Dict[str, float] = {}
+    for code in acyclic:
+        earliest[code] = _cost(catalog.courses[code], transcript, earliest)
+    for code in cyclic:
+        earliest[code] = math.inf
+    for _ in range(len(cyclic)):
+        changed = False
+        for code in cyclic:
+            value = _cost(catalog.courses[code], transcript, earliest)
+            if value < earliest[code]:
+                earliest[code] = value
+                changed = True
+        if not changed:
+            break
+    return earliest
+
+
+def longest_chains(catalog: Catalog) -> Dict[str, float]:
+    """Semesters of prerequisites in front of each course for a student with nothing taken"""
+    return min_semesters(catalog, Transcript(classification=CLASSIFICATIONS[-1]))
+
+
+# --- Many transcripts ---
+def min_semesters_many(catalog: Catalog, students: List[dict],
+                       order: Optional[Tuple[List[str], List[str]]] = None) -> Tuple[List[str], np.ndarray]:
+    """
+    (course codes, float array [students, courses]) for transcript dicts
+    ({"taken", "enrolled", "classification"}), same values as min_semesters.
+    """
+    acyclic, cyclic = order or topological_order(catalog)
+    transcripts = [Transcript(s.get("taken", ()), s.get("enrolled", ()), s.get("classification"), catalog.crosslist)
+                   for s in students]
+    count = len(transcripts)
+    # sparse per-course columns: who took it (and their best grade rank), who is enrolled
+    taken: Dict[str, Tuple[list, list]] = {}
+    enrolled: Dict[str, list] = {}
+    for i, t in enumerate(transcripts):
+        for code, grade in t.grades.items():
+            who, ranks = taken.setdefault(code, ([], []))
+            who.append(i)
+            ranks.append(grade_rank(grade))
+        for code in t.enrolled:
+            enrolled.setdefault(code, []).append(i)
+    taken_arrays = {code: (np.array(who), np.array(ranks)) for code, (who, ranks) in taken.items()}
+    enrolled_arrays = {code: np.array(who) for code, who in enrolled.items()}
+    levels = np.array([classification_level(t.classification) for t in transcripts], dtype=np.float64)
+    zeros = np.zeros(count)
+    earliest: Dict[str, np.ndarray] = {}
+    memo: Dict[tuple, np.ndarray] = {}
+
+    def met(code, grade, concurrent):
+        result = np.zeros(count, dtype=bool)
+        if code in taken_arrays:
+            who, ranks = taken_arrays[code]
+            result[who[ranks <= grade_rank(grade)]] = True
+        if concurrent and code in enrolled_arrays:
+            result[enrolled_arrays[code]] = True
+        return result
+
+    def cost(compiled):
+        if compiled in memo:
+            return memo[compiled]
+        kind = compiled[0]
+        if kind == COURSE:
+            _, code, grade, concurrent = compiled
+            before = earliest.get(code, zeros)
+            value = np.where(met(code, grade, concurrent), 0.0, before if concurrent else before + 1)
+        elif kind == AND:
+            value = np.max([cost(c) for c in compiled[1]], axis=0) if compiled[1] else zeros
+        elif kind == OR:
+            value = np.min([cost(c) for c in compiled[1]], axis=0) if compiled[1] else np.full(count, np.inf)
+        elif kind == EXAM:
+            value = np.full(count, np.inf)
+        else:
+            value = np.maximum(0, CLASSIFICATIONS.index(compiled[1]) - levels) * SEMESTERS_PER_CLASSIFICATION
+        memo[compiled] = value
+        return value
+
+    for code in acyclic:
+        earliest[code] = cost(catalog.courses[code])
+    for code in cyclic:
+        earliest[code] = np.full(count, np.inf)
+    for _ in range(len(cyclic)):
+        changed = False
+        for code in cyclic:
+            memo.clear()        # values along a cycle change between passes
+            value = np.minimum(earliest[code], cost(catalog.courses[code]))
+            if not np.array_equal(value, earliest[code]):
+                earliest[code] = value
+                changed = True
+        if not changed:
+            break
+
+    codes = list(catalog.codes)
+    matrix = np.stack([earliest[code] for code in codes], axis=1) if codes else np.zeros((count, 0))
+    return codes, matrix
+
+
+if __name__ == "__main__":
+    from prereq_checker.compiled import compile_bucket, evaluate
+    from prereq_checker.near import distances
+
+    catalog = Catalog({
+        "CSCE120": compile_bucket([]),
+        "CSCE221": compile_bucket(["CSCE120 C"]),
+        "CSCE222": compile_bucket(["CSCE120 C ^"]),
+        "CSCE313": compile_bucket(["CSCE221 C", ["CSCE222 C", ".", "ECEN222 C"]]),
+        "CSCE481": (AND, ((COURSE, "CSCE313", "D", False), (CLASS, "Senior"))),
+        "MATH001": compile_bucket(["MATH002"]),     # a cycle with a way out
+        "MATH002": compile_bucket([["MATH001", ".", "MATH151"]]),
+    })
+    fresh = Transcript(classification="Freshman")
+    result = min_semesters(catalog, fresh)
+    assert result == {"CSCE120": 0, "CSCE221": 1, "CSCE222": 0, "CSCE313": 2, "CSCE481": 6,
+                      "MATH001": 2, "MATH002": 1}, result
+    later = Transcript(["CSCE120 B", "CSCE221 A"], [], "Junior")
+    assert min_semesters(catalog, later)["CSCE313"] == 1
+    assert min_semesters(catalog, later)["CSCE481"] == 2
+    assert longest_chains(catalog)["CSCE481"] == 3
+    # no classification: the clause is unmet, as evaluate and near_eligible treat it
+    unknown = Transcript(["CSCE120 B", "CSCE221 A", "CSCE313 A"])
+    assert min_semesters(catalog, unknown)["CSCE481"] == math.inf
+    assert distances(catalog, unknown)["CSCE481"] == math.inf and not evaluate(catalog.courses["CSCE481"], unknown)
+
+    students = [{"classification": "Freshman"}, {"taken": ["CSCE120 B", "CSCE221 A"], "classification": "Junior"},
+                {"taken": ["CSCE120 B", "CSCE221 A", "CSCE313 A"]}]
+    codes, matrix = min_semesters_many(catalog, students)
+    for row, transcript in zip(matrix, (fresh, later, unknown)):
+        single = min_semesters(catalog, transcript)
+        assert [single[code] for code in codes] == list(row)
+    print("ok")
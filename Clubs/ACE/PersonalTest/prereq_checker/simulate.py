@@ -0,0 +1,243 @@
+"""
+What-if schedules: "if I enroll in these 4 of my 12 candidates next term,
+what can I take the term after?"
+
+A schedule is a set of up to `load` candidates the student could enroll in
+together (co-requisites "^" may be met by another course in the same
+schedule). Its score is the number of catalog courses it unlocks: courses
+not available before that become available once the schedule is passed.
+Courses the student is enrolled in now are assumed passed by then.
+
+Rather than evaluating every subset against the whole catalog:
+
+    only dependents of a scheduled course (reverse references) can change,
+    and only those not already available are evaluated at all
+
+    a dependent's result depends only on which of its referenced candidates
+    are in the schedule, so results are memoized on that slice and shared
+    between every schedule with the same slice
+
+    the search is depth-first over candidates sorted by how many courses they
+    could unlock, adding grades to one working transcript and undoing them on
+    backtrack; a branch is cut once even every remaining candidate couldn't
+    reach more courses than the worst schedule already in the top list
+
+Adding a passed course never makes a requirement fail, so a full schedule
+always unlocks at least as much as any part of it: only schedules of exactly
+min(load, candidates) courses are ranked.
+"""
+import heapq
+from typing import Dict, List, NamedTuple, Tuple
+
+from prereq_checker.catalog import Catalog
+from prereq_checker.compiled import Transcript, evaluate, normalize_code
+from prereq_checker.integrity import references
+
+ASSUMED_GRADE = "C"     # grade assumed for every scheduled / enrolled course
+
+
+class Schedule(NamedTuple):
+    courses: Tuple[str, ...]
+    unlocked: Tuple[str, ...]
+
+
+def _copy(transcript: Transcript, enrolled=()) -> Transcript:
+    result = Transcript(classification=transcript.classification, crosslist=transcript.crosslist)
+    result.grades = dict(transcript.grades)
+    result.enrolled = set(map(result.resolve, enrolled))
+    return result
+
+
+def _pass(transcript: Transcript, courses, grade: str) -> list:
+    """Record courses as passed with grade; returns an undo list for _restore"""
+    undo = []
+    for code in map(transcript.resolve, courses):
+        previous = transcript.grades.get(code)
+        if previous is None or grade < previous:
+            undo.append((code, previous))
+            transcript.grades[code] = grade
+    return undo
+
+
+def _restore(transcript: Transcript, undo: list):
+    for code, previous in reversed(undo):
+        if previous is None:
+            del transcript.grades[code]
+        else:
+            transcript.grades[code] = previous
+
+
+class Simulator:
+    """
+    Reusable over one catalog: the reverse reference index is built once.
+    After run(), skipped holds candidates that were left out and why.
+    """
+
+    def __init__(self, catalog: Catalog, grade: str = ASSUMED_GRADE):
+        self.catalog = catalog
+        self.grade = grade
+        self.refs: Dict[str, Tuple[str, ...]] = {}
+        self.dependents: Dict[str, List[str]] = {}
+        for code in catalog.codes:
+            self.refs[code] = tuple(references(catalog.courses[code]))
+            for ref in self.refs[code]:
+                self.dependents.setdefault(ref, []).append(code)
+        self.skipped: Dict[str, str] = {}
+        self.schedules = self.pruned = self.evaluations = self.memo_hits = 0
+
+    def run(self, transcript: Transcript, candidates, load: int, top: int = 5) -> List[Schedule]:
+        """The top schedules of min(load, candidates) courses, most courses unlocked first"""
+        self.skipped = {}
+        self.schedules = self.pruned = self.evaluations = self.memo_hits = 0
+        courses = self.catalog.courses
+        # next term: what's enrolled now has been passed
+        base = _copy(transcript)
+        _pass(base, transcript.enrolled, self.grade)
+
+        codes = []
+        for raw in candidates:
+            code = normalize_code(raw)
+            if code is None or code not in courses:
+                self.skipped[str(raw)] = "not in the catalog"
+            elif base.resolve(code) in base.grades:
+                self.skipped[code] = "already taken"
+            elif code not in codes:
+                codes.append(code)
+        # co-requisites can come from the same schedule, but nothing else can
+        together = _copy(base, codes)
+        for code in [c for c in codes if not evaluate(courses[c], together)]:
+            self.skipped[code] = "prerequisites not met"
+            codes.remove(code)
+        needs_corequisite = {c for c in codes if not evaluate(courses[c], base)}
+
+        # the courses a schedule could unlock: dependents of a candidate, not available yet
+        reach: Dict[str, frozenset] = {}
+        for code in codes:
+            reach[code] = frozenset(d for d in self.dependents.get(base.resolve(code), ())
+                                    if base.resolve(d) not in base.grades and d not in codes)
+        closed = {d for d in set().union(*reach.values()) if not evaluate(courses[d], base)}
+        reach = {code: dependents & closed for code, dependents in reach.items()}
+        candidate_set = set(map(base.resolve, codes))
+        slices = {d: tuple(ref for ref in self.refs[d] if ref in candidate_set) for d in closed}
+
+        codes.sort(key=lambda c: (-len(reach[c]), c))
+        size = min(load, len(codes))
+        if size <= 0:
+            return []
+        # suffix[i]: everything the candidates from i on could unlock between them
+        suffix = [frozenset()] * (len(codes) + 1)
+        for i in range(len(codes) - 1, -1, -1):
+            suffix[i] = suffix[i + 1] | reach[codes[i]]
+
+        memo: Dict[tuple, bool] = {}
+        best: List[tuple] = []      # min-heap of (score, -order, schedule)
+        working = _copy(base)
+        chosen: List[str] = []
+
+        def unlocked(scheduled: set) -> Tuple[str, ...]:
+            found = []
+            for d in set().union(*(reach[c] for c in chosen)):
+                key = (d, tuple(ref for ref in slices[d] if ref in scheduled))
+                result = memo.get(key)
+                if result is None:
+                    self.evaluations += 1
+                    result = memo[key] = evaluate(courses[d], working)
+                else:
+                    self.memo_hits += 1
+                if result:
+                    found.append(d)
+            return tuple(sorted(found))
+
+        def valid(scheduled: set) -> bool:
+            together = None
+            for code in chosen:
+                if code in needs_corequisite:
+                    together = together or _copy(base, scheduled)
+                    if not evaluate(courses[code], together):
+                        return False
+            return True
+
+        def search(start: int, covered: frozenset):
+            if len(chosen) == size:
+                scheduled = set(map(base.resolve, chosen))
+                if not valid(scheduled):
+                    return
+                self.schedules += 1
+                found = unlocked(scheduled)
+                entry = (len(found), -self.schedules, Schedule(tuple(sorted(chosen)), found))
+                if len(best) < top:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+                return
+            for i in range(start, len(codes) - (size - len(chosen)) + 1):
+                if len(best) == top and len(covered | suffix[i]) <= best[0][0]:
+                    self.pruned += 1
+                    return      # later i only see fewer candidates
+                code = codes[i]
+                chosen.append(code)
+                undo = _pass(working, (code,), self.grade)
+                search(i + 1, covered | reach[code])
+                _restore(working, undo)
+                chosen.pop()
+
+        search(0, frozenset())
+        return [entry[2] for entry in sorted(best, reverse=True)]
+
+    def stats(self) -> dict:
+        return {
+            "schedules": self.schedules,
+            "pruned": self.pruned,
+            "evaluations": self.evaluations,
+            "memo_hits": self.memo_hits,
+        }
+
+
+def simulate(catalog: Catalog, transcript: Transcript, candidates, load: int,
+             top: int = 5, grade: str = ASSUMED_GRADE) -> List[Schedule]:
+    """Simulator(catalog, grade).run(transcript, candidates, load, top)"""
+    return Simulator(catalog, grade).run(transcript, candidates, load, top)
+
+
+if __name__ == "__main__":
+    from itertools import combinations
+    from prereq_checker.compiled import compile_bucket
+
+    catalog = Catalog({
+        "CSCE120": compile_bucket([]),
+        "CSCE121": compile_bucket([]),
+        "MATH151": compile_bucket([]),
+        "MATH152": compile_bucket(["MATH151 C"]),
+        "CSCE221": compile_bucket(["CSCE120 C", "MATH151 C"]),
+        "CSCE222": compile_bucket([["CSCE120 C", ".", "CSCE121 C"]]),
+        "CSCE312": compile_bucket(["CSCE221 C", "CSCE222 C ^"]),
+        "CSCE313": compile_bucket(["CSCE221 C", "CSCE222 C"]),
+        "CSCE314": compile_bucket(["CSCE221 C"]),
+        "ECEN214": compile_bucket(["MATH151 C ^"]),
+        "ECEN248": compile_bucket(["CSCE120 C", "ECEN214 C"]),
+    })
+    transcript = Transcript(["CSCE120 A"], ["MATH151 ^"])
+    candidates = ["CSCE 221", "CSCE_222", "ECEN214", "MATH152", "CSCE121", "CSCE313", "HIST105"]
+    simulator = Simulator(catalog)
+    schedules = simulator.run(transcript, candidates, load=2, top=3)
+    assert simulator.skipped == {"HIST105": "not in the catalog", "CSCE313": "prerequisites not met"}
+    assert schedules[0] == Schedule(("CSCE221", "CSCE222"), ("CSCE312", "CSCE313", "CSCE314")), schedules
+    assert [len(s.unlocked) for s in schedules] == [3, 2, 1]
+
+    # same ranking as evaluating every pair against the whole catalog
+    base = Transcript(["CSCE120 A", "MATH151 C"])
+    available = {c for c in catalog.codes if evaluate(catalog.courses[c], base)}
+    def brute(pair):
+        after = Transcript(["CSCE120 A", "MATH151 C"] + [f"{c} C" for c in pair])
+        return tuple(sorted(c for c in catalog.codes
+                            if c not in available and c not in pair and evaluate(catalog.courses[c], after)))
+    pairs = combinations(["CSCE221", "CSCE222", "ECEN214", "MATH152", "CSCE121"], 2)
+    scores = sorted((len(brute(p)) for p in pairs), reverse=True)
+    assert [len(s.unlocked) for s in simulator.run(transcript, candidates, 2, top=10)] == scores
+    assert simulate(catalog, transcript, ["CSCE221"], load=4) == [Schedule(("CSCE221",), ("CSCE314",))]
+
+    # a co-requisite can come from the same schedule
+    catalog.courses["CSCE314"] = compile_bucket(["CSCE120 C", "CSCE222 C ^"])
+    assert simulate(catalog, Transcript(["CSCE120 A"]), ["CSCE314"], 2) == []
+    assert simulate(catalog, Transcript(["CSCE120 A"]), ["CSCE314", "CSCE222"], 2)[0].courses == ("CSCE222", "CSCE314")
+    print("ok")
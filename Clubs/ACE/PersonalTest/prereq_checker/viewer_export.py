@@ -0,0 +1,129 @@
+"""
+Export status-annotated trees for Diagram/prereq-viewer.
+
+Writes one JSON chunk per department ({"ECEN_403": RootNode, ...}) plus a
+manifest.json, so the viewer can fetch only the department on screen instead
+of the whole catalog and re-running evaluateTree.ts. Nodes use the viewer's
+types.ts shapes (root / and / or / single) with status already filled in:
+
+    "met"           satisfied by taken courses
+    "concurrent"    satisfied only through current enrollment
+    "needed"        not satisfied
+
+Catalog codes are sorted, so each department's courses are contiguous: one
+chunk is built, written and dropped at a time, and memory stays bounded by
+the largest department.
+
+manifest.json:
+    {"catalog": version, "transcript": fingerprint,
+     "departments": {"ECEN": {"file": "ECEN.json", "courses": 120, "met": 41}, ...}}
+"""
+import json
+import os
+from itertools import count, groupby
+from typing import Optional
+
+from prereq_checker.cache import fingerprint
+from prereq_checker.catalog import Catalog
+from prereq_checker.compiled import AND, CLASS, COURSE, EXAM, Transcript
+from prereq_checker.diff import describe
+
+MET = "met"
+CONCURRENT = "concurrent"
+NEEDED = "needed"
+
+
+def _combine(kind: str, statuses) -> str:
+    if kind == AND:
+        if NEEDED in statuses:
+            return NEEDED
+        return CONCURRENT if CONCURRENT in statuses else MET
+    if MET in statuses:
+        return MET
+    return CONCURRENT if CONCURRENT in statuses else NEEDED
+
+
+def annotate(compiled: tuple, transcript: Transcript, ids) -> dict:
+    """Compiled tree -> viewer Node with statuses; ids yields node ids"""
+    kind = compiled[0]
+    if kind == COURSE:
+        _, code, grade, concurrent = compiled
+        if transcript.meets(code, grade, False):
+            status = MET
+        elif concurrent and code in transcript.enrolled:
+            status = CONCURRENT
+        else:
+            status = NEEDED
+        return {"type": "single", "id": next(ids), "course": describe(compiled), "status": status}
+    if kind == CLASS:
+        status = MET if transcript.has_classification(compiled[1]) else NEEDED
+        return {"type": "single", "id": next(ids), "course": describe(compiled), "status": status}
+    if kind == EXAM:
+        return {"type": "single", "id": next(ids), "course": describe(compiled), "status": NEEDED}
+    children = [annotate(c, transcript, ids) for c in compiled[1]]
+    node = {"type": kind.lower(), "id": next(ids), "children": children}
+    node["status"] = _combine(kind, [c["status"] for c in children]) if children else (MET if kind == AND else NEEDED)
+    return node
+
+
+def course_root(catalog: Catalog, code: str, transcript: Transcript) -> dict:
+    """RootNode for one course, laid out the way App.tsx wraps evaluateTree's result"""
+    name = catalog.name(code)
+    ids = (f"{code}-{i}" for i in count())
+    tree = annotate(catalog.courses[code], transcript, ids)
+    children = tree["children"] if tree["type"] == "and" else [tree]
+    return {
+        "type": "root",
+        "id": f"root-{code}",
+        "courseName": name.replace("_", " "),
+        "status": tree["status"],
+        "children": children,
+    }
+
+
+def export_viewer(catalog: Catalog, transcript: Transcript, out_dir: str,
+                  departments: Optional[set] = None) -> dict:
+    """Write <out_dir>/<DEPT>.json chunks and manifest.json; returns the manifest"""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {"catalog": catalog.version, "transcript": fingerprint(transcript), "departments": {}}
+    for dept, codes in groupby(catalog.codes, key=lambda code: code[:-3]):
+        if departments and dept not in departments:
+            continue
+        chunk = {catalog.name(code): course_root(catalog, code, transcript) for code in codes}
+        filename = f"{dept}.json"
+        with open(os.path.join(out_dir, filename), "w") as f:
+            json.dump(chunk, f, separators=(",", ":"))
+        manifest["departments"][dept] = {
+            "file": filename,
+            "courses": len(chunk),
+            "met": sum(1 for root in chunk.values() if root["status"] != NEEDED),
+        }
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+
+if __name__ == "__main__":
+    import tempfile
+    from prereq_checker.compiled import compile_bucket
+
+    catalog = Catalog({
+        "ECEN403": compile_bucket([["COMM205 C", ".", "COMM243 C"], "ECEN314 C", ["ECEN449 C ^", ".", "CSCE462 C ^"]]),
+        "CSCE221": compile_bucket(["CSCE120 C"]),
+        "CSCE120": compile_bucket([]),
+    }, {"ECEN403": "ECEN_403", "CSCE221": "CSCE_221", "CSCE120": "CSCE_120"})
+    transcript = Transcript(["COMM243 A", "ECEN314 B"], ["ECEN449 C ^"])
+    root = course_root(catalog, "ECEN403", transcript)
+    assert root["courseName"] == "ECEN 403" and root["status"] == CONCURRENT
+    assert [c["status"] for c in root["children"]] == [MET, MET, CONCURRENT]
+    assert root["children"][2]["children"][0] == {"type": "single", "id": "ECEN403-4", "course": "ECEN449 C ^", "status": CONCURRENT}
+    assert course_root(catalog, "CSCE120", transcript) == {"type": "root", "id": "root-CSCE120", "courseName": "CSCE 120",
+                                                          "status": MET, "children": []}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = export_viewer(catalog, transcript, tmp)
+        assert manifest["departments"] == {"CSCE": {"file": "CSCE.json", "courses": 2, "met": 1},
+                                           "ECEN": {"file": "ECEN.json", "courses": 1, "met": 1}}
+        with open(os.path.join(tmp, "CSCE.json")) as f:
+            assert set(json.load(f)) == {"CSCE_120", "CSCE_221"}
+    print("ok")
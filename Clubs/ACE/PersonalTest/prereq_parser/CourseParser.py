@@ -85,7 +85,8 @@ def parse_relation(text, target_course):
 
     return node
 
-exTxt = ex = "Prerequisite: Grade of C or better in MATH 142, MATH 147, MATH 151, or MATH 171, or concurrent enrollment. Concurrent enrollment in CHEM 117; Cross Listing: ECEN 222/CSCE 222."
-target = "STAT 211"
-node = parse_relation(exTxt, target)
-print(node)
\ No newline at end of file
+if __name__ == "__main__":
+    exTxt = ex = "Prerequisite: Grade of C or better in MATH 142, MATH 147, MATH 151, or MATH 171, or concurrent enrollment. Concurrent enrollment in CHEM 117; Cross Listing: ECEN 222/CSCE 222."
+    target = "STAT 211"
+    node = parse_relation(exTxt, target)
+    print(node)
\ No newline at end of file
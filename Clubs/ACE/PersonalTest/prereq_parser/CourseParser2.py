@@ -140,15 +140,16 @@ def parse_relation(text, target_course):
 # Test
 # ===============================
 
-exTxt = "Prerequisite: Grade of C or better in MATH 142, MATH 147, MATH 151, or MATH 171, or concurrent enrollment. Concurrent enrollment in CHEM 117; Cross Listing: ECEN 222/CSCE 222."
-target = "STAT 211"
-
-nodes, edges = parse_relation(exTxt, target)
-
-with open('output.txt', "w") as f:
-    print("NODES:", file=f)
-    for n in nodes:
-        print(n, file=f)
-    print("\nEDGES:", file=f)
-    for e in edges:
-        print(e, file=f)
+if __name__ == "__main__":
+    exTxt = "Prerequisite: Grade of C or better in MATH 142, MATH 147, MATH 151, or MATH 171, or concurrent enrollment. Concurrent enrollment in CHEM 117; Cross Listing: ECEN 222/CSCE 222."
+    target = "STAT 211"
+
+    nodes, edges = parse_relation(exTxt, target)
+
+    with open('output.txt', "w") as f:
+        print("NODES:", file=f)
+        for n in nodes:
+            print(n, file=f)
+        print("\nEDGES:", file=f)
+        for e in edges:
+            print(e, file=f)
@@ -0,0 +1,87 @@
+"""
+Bulk parse a catalog of prerequisite descriptions into CP10 trees.
+
+    python prereq_parser/bulk_parse.py descriptions.jsonl --stats stats.json
+    python prereq_parser/bulk_parse.py descriptions.jsonl --profile-memory memory.json
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# CP10, parse_stats and memory_stats live in Clubs/ACE
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import CP10
+import memory_stats
+import parse_stats
+
+
+def load_descriptions(filename: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (course, description) pairs from either
+    - JSON lines of {"course": ..., "text": ...} (synthetic/generator.py output), or
+    - a JSON object keyed by course whose values are the text or {"info": {"description": ...}}
+    """
+    with open(filename) as f:
+        first = f.read(1)
+        f.seek(0)
+        if first == "{" and not filename.endswith(".jsonl"):
+            data = json.load(f)
+            for course, value in data.items():
+                if isinstance(value, dict):
+                    value = value.get("info", {}).get("description", "")
+                yield course, value
+        else:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    yield row["course"], row["text"]
+
+
+def parse_catalog(descriptions: Iterable[Tuple[str, str]],
+                  stats: Optional[parse_stats.ParseStats] = None) -> Dict[str, CP10.Node]:
+    """Parse every description; pass a ParseStats to record per-phase timings for the run"""
+    if stats is not None:
+        parse_stats.enable(stats)
+    try:
+        return {course: CP10.parse_text_to_tree(text) for course, text in descriptions}
+    finally:
+        if stats is not None:
+            parse_stats.disable()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk parse prerequisite descriptions with CP10")
+    parser.add_argument("descriptions", help="Descriptions file (JSON lines or catalog JSON)")
+    parser.add_argument("--stats", nargs="?", const="-", help="Record per-phase timings; write JSON to this file ('-' prints only the table)")
+    parser.add_argument("--profile-memory", nargs="?", const="-", metavar="OUT",
+                        help="Trace memory while reading and parsing; write JSON to OUT ('-' prints only the table)")
+    args = parser.parse_args()
+
+    stats = parse_stats.ParseStats() if args.stats else None
+    profile = memory_stats.enable() if args.profile_memory else None
+    descriptions = load_descriptions(args.descriptions)
+    if profile is not None:
+        # read everything first so the description strings and the trees are separate phases
+        descriptions = list(descriptions)
+        memory_stats.mark("read")
+    trees = parse_catalog(descriptions, stats)
+    if profile is not None:
+        memory_stats.mark("parse")
+        memory_stats.disable()
+    print(f"Parsed {len(trees)} courses")
+    if stats is not None:
+        print(stats.table())
+        if args.stats != "-":
+            stats.to_json(args.stats)
+            print(f"Saved stats to {args.stats}")
+    if profile is not None:
+        print(profile.table())
+        if args.profile_memory != "-":
+            profile.to_json(args.profile_memory)
+            print(f"Saved memory profile to {args.profile_memory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+One course code type for the parsers, checkers and CLI.
+
+Every spelling in the project parses to the same value:
+
+    "CSCE_221"      catalog keys, cmd_update_taken
+    "CSCE 221"      CP10 tokens, prose
+    "CSCE221 A"     taken list, with a grade
+    "ECEN449 C ^"   bucket leaves / enrolled list, grade and concurrent flag
+    "CSCE221C^"     prereq-viewer course strings
+    "csce221"       user input
+
+parse() is memoized: each distinct spelling is matched once, so comparing
+course codes on a hot path is a dict lookup and tuple compare, not a regex.
+"""
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+_course_re = re.compile(r"^([A-Z]{2,4})[\s_]*(\d{3})\s*([A-Z])?\s*(\^)?$")
+
+
+class CourseCode(NamedTuple):
+    dept: str
+    number: str
+    grade: Optional[str] = None     # minimum grade (requirements) or grade earned (taken list)
+    concurrent: bool = False        # "^": concurrent enrollment allowed / currently enrolled
+
+    @staticmethod
+    def parse(raw) -> Optional["CourseCode"]:
+        """Any known spelling (or a CourseCode) -> CourseCode, or None if it isn't a course"""
+        if isinstance(raw, CourseCode):
+            return raw
+        return _parse(raw)
+
+    @property
+    def code(self) -> str:
+        """'CSCE221': the checker's format"""
+        return self.dept + self.number
+
+    @property
+    def key(self) -> str:
+        """'CSCE_221': catalog keys"""
+        return f"{self.dept}_{self.number}"
+
+    @property
+    def text(self) -> str:
+        """'CSCE 221': how descriptions and CP10 write it"""
+        return f"{self.dept} {self.number}"
+
+    @property
+    def base(self) -> "CourseCode":
+        """The course without grade or concurrent flag"""
+        return CourseCode(self.dept, self.number) if self.grade or self.concurrent else self
+
+    def __str__(self):
+        """Taken / enrolled list entry: 'CSCE221', 'CSCE221 A', 'ECEN449 C ^'"""
+        return self.code + (f" {self.grade}" if self.grade else "") + (" ^" if self.concurrent else "")
+
+
+@lru_cache(maxsize=1 << 16)
+def _parse(raw: str) -> Optional[CourseCode]:
+    m = _course_re.match(raw.strip().upper())
+    if not m:
+        return None
+    dept, number, grade, caret = m.groups()
+    return CourseCode(dept, number, grade, caret is not None)
+
+
+if __name__ == "__main__":
+    for spelling in ("CSCE_221", "CSCE 221", "CSCE221", "csce221", " CSCE221 "):
+        assert CourseCode.parse(spelling) == CourseCode("CSCE", "221")
+    assert CourseCode.parse("CSCE221 A") == CourseCode("CSCE", "221", "A")
+    assert CourseCode.parse("ECEN449 C ^") == CourseCode("ECEN", "449", "C", True)
+    assert CourseCode.parse("CSCE221C^") == CourseCode("CSCE", "221", "C", True)
+    assert CourseCode.parse("ACCT328 ^") == CourseCode("ACCT", "328", None, True)
+    assert CourseCode.parse("ECEN_403").key == "ECEN_403"
+    assert CourseCode.parse("ECEN 403").code == "ECEN403"
+    assert str(CourseCode.parse("ecen449c ^")) == "ECEN449 C ^"
+    assert CourseCode.parse("ECEN449 C ^").base == CourseCode.parse("ECEN_449")
+    assert CourseCode.parse(".") is None and CourseCode.parse("Senior") is None
+    assert CourseCode.parse("CSCE 221") is CourseCode.parse("CSCE 221")     # memoized
+    print("ok")
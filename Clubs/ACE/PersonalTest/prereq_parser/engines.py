@@ -0,0 +1,226 @@
+"""
+Parser engine registry.
+
+Every parser in the project has its own output shape: bucket dicts
+(CourseParser3-8, CP9_test.parse_prerequisites), Node trees (CP9_test, CP10, CP11)
+or graph nodes/edges (CourseParser, CourseParser2). Each engine here pairs a
+parser with an adapter into one canonical tree so they can be swapped and
+compared:
+
+    ("AND" | "OR", child, ...)      children sorted, same-op groups flattened
+    ("NOT", child)
+    ("COURSE", "CSCE 221")
+    ("CLASSIFICATION", "Senior")
+    ("CONCURRENT",)                 "or concurrent enrollment" alternative
+    ("EXAM",)
+
+Grade requirements are not part of the canonical tree; most engines drop them.
+An empty requirement is ("AND",).
+
+The engine used by default is CP10; set PREREQ_ENGINE to pick another.
+"""
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+# CP10, CP11 and CP9_test live in Clubs/ACE
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import CP10
+import CP11
+import CP9_test
+import CourseParser8_v2
+from prereq_parser import (CourseParser, CourseParser2, CourseParser3, CourseParser4,
+                           CourseParser5, CourseParser7, CourseParser8)
+from prereq_parser.coursecode import CourseCode
+
+DEFAULT_ENGINE = "CP10"
+EMPTY = ("AND",)
+CLASSIFICATIONS = ("Freshman", "Sophomore", "Junior", "Senior")
+
+
+# --- Canonical form ---
+def leaf(value) -> Optional[tuple]:
+    """Canonical leaf for a raw string from any engine, or None for noise tokens"""
+    value = str(value).strip()
+    course = CourseCode.parse(value)
+    if course is not None and not course.grade and not course.concurrent:
+        return ("COURSE", course.text)
+    if value.capitalize() in CLASSIFICATIONS:
+        return ("CLASSIFICATION", value.capitalize())
+    if value.upper() == "EXAM":
+        return ("EXAM",)
+    return None
+
+
+def canonical(tree) -> Optional[tuple]:
+    """Normalize a tree built from the canonical vocabulary (flatten, dedupe, sort, collapse)"""
+    if tree is None:
+        return None
+    kind = tree[0]
+    if kind not in ("AND", "OR", "NOT"):
+        return tree
+    children = [canonical(c) for c in tree[1:]]
+    children = [c for c in children if c is not None]
+    if kind == "NOT":
+        return ("NOT", children[0]) if children else None
+    flat = set()
+    for c in children:
+        if c[0] == kind:
+            flat.update(c[1:])
+        else:
+            flat.add(c)
+    if not flat:
+        return None
+    if len(flat) == 1:
+        return flat.pop()
+    return (kind,) + tuple(sorted(flat))
+
+
+def group(op: str, children) -> tuple:
+    return (op,) + tuple(children)
+
+
+# --- Adapters ---
+def from_cp10(node) -> Optional[tuple]:
+    if node.type == "COURSE":
+        return leaf(node.value)
+    if node.type == "CLASSIFICATION":
+        return ("CLASSIFICATION", node.value)
+    if node.type == "CONCURRENT/PASSED":
+        return ("CONCURRENT",)
+    op = "OR" if node.type == "OR" else "AND"   # ROOT is an AND of its children
+    return group(op, (from_cp10(c) for c in node.children))
+
+
+def from_cp9(node) -> Optional[tuple]:
+    if node.type in ("COURSE", "CLASSIFICATION"):
+        return leaf(node.value)
+    if node.type == "CONCURRENT":
+        # CP9 wraps a whole segment that mentions concurrent enrollment
+        return group("OR", [from_cp9(c) for c in node.children] + [("CONCURRENT",)])
+    op = "OR" if node.type == "OR" else "AND"
+    return group(op, (from_cp9(c) for c in node.children))
+
+
+def _values(values, op="OR") -> tuple:
+    return group(op, (leaf(v) for v in values))
+
+
+def _labelled(entry) -> Optional[tuple]:
+    """One bucket group: {"OR"/"AND"/"NOT": [...]}, a plain list (OR group) or a set ("/" group)"""
+    if not isinstance(entry, dict):
+        return _values(entry)
+    label, values = next(iter(entry.items()))
+    if values and isinstance(next(iter(values)), dict):
+        # CP9_test stack entries: [{"op": "OR", "values": [...]}, ...] folded left to right
+        result = None
+        for item in values:
+            op = "AND" if item["op"] == "AND" else "OR"
+            parts = ([result] if result is not None else []) + [leaf(v) for v in item["values"]]
+            result = group(op, parts)
+        body = result
+    else:
+        body = _values(values, "AND" if label == "AND" else "OR")
+    return ("NOT", body) if label == "NOT" else body
+
+
+def from_buckets(buckets: dict) -> tuple:
+    """Bucket dicts from CourseParser4-8 and CP9_test.parse_prerequisites"""
+    parts = []
+    for name, groups in buckets.items():
+        if name == "Cross":
+            continue   # cross-listing names an equivalent course, not a requirement
+        for g in groups:
+            node = _labelled(g)
+            if name == "Concurrent":
+                node = group("OR", [node, ("CONCURRENT",)])
+            elif name == "Exclusion" and node[0] != "NOT":
+                node = ("NOT", node)
+            parts.append(node)
+    return group("AND", parts)
+
+
+def from_course_info(courses: dict) -> tuple:
+    """CourseParser3: {course: {"prereq": [[or group], ...], "concurrent": [...], "cross": [...]}}"""
+    parts = []
+    for info in courses.values():
+        parts.extend(_values(g) for g in info["prereq"])
+        parts.extend(group("OR", [_values(g), ("CONCURRENT",)]) for g in info["concurrent"])
+    return group("AND", parts)
+
+
+def from_course_node(node) -> tuple:
+    """CourseParser: CourseNode with prerequisite / concurrent sets"""
+    parts = [_values(node.prerequisites)]
+    if node.concurrent:
+        parts.append(group("OR", [_values(node.concurrent), ("CONCURRENT",)]))
+    return group("AND", parts)
+
+
+def from_graph(graph) -> tuple:
+    """CourseParser2: (nodes, edges) hanging off a root COURSE node with id 1"""
+    nodes, edges = graph
+    by_id = {n.id: n for n in nodes}
+    children: Dict[int, list] = {}
+    for e in edges:
+        children.setdefault(e.parent_id, []).append(e.child_id)
+
+    def build(node_id):
+        node = by_id[node_id]
+        if node.type == "COURSE":
+            return leaf(node.value)
+        kids = [build(c) for c in children.get(node_id, [])]
+        if node.type == "CONCURRENT":
+            return group("OR", kids + [("CONCURRENT",)])
+        return group(node.type, kids)
+
+    return group("AND", (build(c) for c in children.get(1, [])))
+
+
+# --- Registry ---
+class Engine:
+    def __init__(self, name: str, parse_raw: Callable, adapter: Callable, description: str = ""):
+        self.name = name
+        self.parse_raw = parse_raw      # text -> engine-specific output
+        self.adapter = adapter          # engine-specific output -> canonical vocabulary
+        self.description = description
+
+    def parse(self, text: str) -> tuple:
+        """text -> canonical tree"""
+        return canonical(self.adapter(self.parse_raw(text))) or EMPTY
+
+    def __repr__(self):
+        return f"Engine({self.name})"
+
+
+ENGINES: Dict[str, Engine] = {}
+
+
+def register(name: str, parse_raw: Callable, adapter: Callable, description: str = "") -> Engine:
+    engine = Engine(name, parse_raw, adapter, description)
+    ENGINES[name] = engine
+    return engine
+
+
+def get_engine(name: Optional[str] = None) -> Engine:
+    """Engine by name, else $PREREQ_ENGINE, else DEFAULT_ENGINE"""
+    name = name or os.environ.get("PREREQ_ENGINE") or DEFAULT_ENGINE
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown parser engine {name!r} (available: {', '.join(ENGINES)})") from None
+
+
+register("CP10", CP10.parse_text_to_tree, from_cp10, "recursive descent over segments, Node tree")
+register("CP11", CP11.parse_text_to_tree, from_cp10, "table-driven Pratt parser over integer tokens, CP10's trees")
+register("CP9", CP9_test.parse_text_to_tree, from_cp9, "recursive descent with CONCURRENT wrappers, Node tree")
+register("CP9.buckets", CP9_test.parse_prerequisites, from_buckets, "nested op stacks per bucket")
+register("CourseParser8_v2", CourseParser8_v2.parse_prerequisites, from_buckets, "AND/OR/NOT bucket groups")
+register("CourseParser8", CourseParser8.parse_prerequisites, from_buckets, "AND/OR/NOT bucket groups")
+register("CourseParser7", CourseParser7.parse_prerequisites, from_buckets, "AND/OR bucket groups with exclusions")
+register("CourseParser5", CourseParser5.parse_prerequisites, from_buckets, "list bucket groups")
+register("CourseParser4", CourseParser4.parse_prerequisites, from_buckets, "list bucket groups")
+register("CourseParser3", lambda text: CourseParser3.parse_course_info("SELF 000. " + text), from_course_info, "regex relation extraction")
+register("CourseParser2", lambda text: CourseParser2.parse_relation(text, "SELF 000"), from_graph, "graph nodes and edges")
+register("CourseParser", lambda text: CourseParser.parse_relation(text, "SELF 000"), from_course_node, "CourseNode sets")
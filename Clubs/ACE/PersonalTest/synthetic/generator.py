@@ -0,0 +1,408 @@
+"""
+Seeded generator for synthetic prerequisite catalogs and student transcripts.
+
+Descriptions are written in the same grammar the parsers handle, e.g.
+"Prerequisites: Grade of C or better in CSCE 221 or CSCE 222; junior or senior classification."
+Every course and every student is generated from its own RNG (seed + index), so
+any slice can be regenerated without building the ones before it and the
+writers below stream straight to disk.
+
+    python synthetic/generator.py catalog --courses 100000 --out catalog.json --descriptions descriptions.jsonl
+    python synthetic/generator.py transcripts --students 1000000 --courses 100000 --out transcripts.jsonl
+"""
+import argparse
+import json
+import random
+from typing import Iterator, List, Optional, Tuple
+
+# --- Course universe ---
+REAL_DEPARTMENTS = [
+    "ACCT", "AERO", "BIOL", "BIOT", "CHEM", "COMM", "CSCE", "ECEN", "ENGL", "ENGR",
+    "FINC", "HIST", "MATH", "MEEN", "MGMT", "MKTG", "PHYS", "POLS", "PSYC", "STAT",
+]
+COURSES_PER_DEPT = 390          # numbers 100..489
+FIRST_NUMBER = 100
+GRADES = ["A", "B", "C", "D"]
+TRANSCRIPT_GRADES = ["A", "A", "A", "B", "B", "B", "C", "C", "D", "F"]
+CLASSIFICATIONS = ["freshman", "sophomore", "junior", "senior"]
+EXAMS = ["Texas A&M University math placement exam", "AP Calculus exam", "departmental proficiency exam"]
+CROSS_LIST_RATE = 0.1
+
+
+def department(dept_index: int) -> str:
+    """Real department codes first, then synthetic 4-letter codes (XAAA, XAAB, ...)"""
+    if dept_index < len(REAL_DEPARTMENTS):
+        return REAL_DEPARTMENTS[dept_index]
+    n = dept_index - len(REAL_DEPARTMENTS)
+    letters = []
+    for _ in range(3):
+        n, r = divmod(n, 26)
+        letters.append(chr(ord("A") + r))
+    return "X" + "".join(reversed(letters))
+
+
+def course_parts(index: int) -> Tuple[str, int]:
+    dept_index, offset = divmod(index, COURSES_PER_DEPT)
+    return department(dept_index), FIRST_NUMBER + offset
+
+
+def course_text(index: int) -> str:
+    """'CSCE 221' (description / CP10 token format)"""
+    dept, num = course_parts(index)
+    return f"{dept} {num}"
+
+
+def course_key(index: int) -> str:
+    """'CSCE_221' (catalog key format)"""
+    dept, num = course_parts(index)
+    return f"{dept}_{num}"
+
+
+def course_checker(index: int) -> str:
+    """'CSCE221' (bucket / transcript format, grade and ^ are appended)"""
+    dept, num = course_parts(index)
+    return f"{dept}{num}"
+
+
+def cross_listed_twin(index: int, seed: int = 0) -> Optional[int]:
+    """
+    Departments are paired (0-1, 2-3, ...) and a course may be cross-listed with the
+    course of the same number in its paired department. Decided per pair so both
+    sides of a cross-listing agree.
+    """
+    dept_index, offset = divmod(index, COURSES_PER_DEPT)
+    pair = dept_index // 2
+    if random.Random(f"{seed}:cross:{pair}:{offset}").random() >= CROSS_LIST_RATE:
+        return None
+    twin = (dept_index ^ 1) * COURSES_PER_DEPT + offset
+    return twin
+
+
+# --- Clause model ---
+# A course option is a tuple of course indices: one course, or a cross-list (A/B).
+# A segment is one of:
+#   ("courses", options, op, grade, concurrent, exam, equivalent)
+#                                                      op is "or" / "and", grade is a letter or None,
+#                                                      exam names an extra "or" alternative and
+#                                                      equivalent adds ", or equivalent"
+#   ("concurrent_in", options)                          "concurrent enrollment in CHEM 117"
+#   ("classification", levels)
+#   ("not_open", level)
+Segment = tuple
+
+
+def _pick_prereq(rng: random.Random, index: int) -> Optional[int]:
+    """Pick a lower-numbered course, mostly from the same department"""
+    dept_index, offset = divmod(index, COURSES_PER_DEPT)
+    if offset > 0 and (dept_index == 0 or rng.random() < 0.8):
+        return dept_index * COURSES_PER_DEPT + rng.randrange(0, offset)
+    if dept_index > 0:
+        other = rng.randrange(0, dept_index)
+        return other * COURSES_PER_DEPT + rng.randrange(0, min(offset + 1, COURSES_PER_DEPT))
+    return None
+
+
+def _pick_option(rng: random.Random, index: int, seed: int) -> Optional[tuple]:
+    first = _pick_prereq(rng, index)
+    if first is None:
+        return None
+    twin = cross_listed_twin(first, seed)
+    if twin is not None and twin < index and rng.random() < 0.5:
+        # written as "ECEN 350/CSCE 350", in either order
+        return (first, twin) if rng.random() < 0.5 else (twin, first)
+    return (first,)
+
+
+def generate_segments(rng: random.Random, index: int, seed: int = 0) -> List[Segment]:
+    segments: List[Segment] = []
+    for _ in range(rng.choice((1, 1, 1, 2, 2, 3))):
+        options = []
+        for _ in range(rng.choice((1, 2, 2, 3, 4))):
+            opt = _pick_option(rng, index, seed)
+            if opt is not None and opt not in options:
+                options.append(opt)
+        if not options:
+            continue
+        op = "and" if rng.random() < 0.25 else "or"
+        grade = rng.choice(GRADES[1:3]) if rng.random() < 0.5 else None
+        concurrent = op == "or" and rng.random() < 0.2
+        exam = rng.choice(EXAMS) if op == "or" and rng.random() < 0.03 else None
+        equivalent = op == "or" and rng.random() < 0.05
+        segments.append(("courses", options, op, grade, concurrent, exam, equivalent))
+    if segments and rng.random() < 0.05:
+        opt = _pick_option(rng, index, seed)
+        if opt is not None:
+            segments.append(("concurrent_in", [opt]))
+    if rng.random() < 0.15:
+        start = rng.randrange(1, len(CLASSIFICATIONS))
+        segments.append(("classification", CLASSIFICATIONS[start:]))
+    elif rng.random() < 0.03:
+        segments.append(("not_open", "senior"))
+    return segments
+
+
+# --- Text rendering ---
+def _join(items: List[str], op: str) -> str:
+    if len(items) == 1:
+        return items[0]
+    if len(items) == 2:
+        return f"{items[0]} {op} {items[1]}"
+    return ", ".join(items[:-1]) + f", {op} {items[-1]}"
+
+
+def render_segment(segment: Segment) -> str:
+    kind = segment[0]
+    if kind == "courses":
+        _, options, op, grade, concurrent, exam, equivalent = segment
+        names = ["/".join(course_text(c) for c in opt) for opt in options]
+        if exam:
+            names.append(f"acceptable score on {exam}")
+        text = _join(names, op)
+        if grade:
+            text = f"grade of {grade} or better in {text}"
+        if equivalent:
+            text += ", or equivalent"
+        if concurrent:
+            text += ", or concurrent enrollment"
+        return text
+    if kind == "concurrent_in":
+        names = ["/".join(course_text(c) for c in opt) for opt in segment[1]]
+        return f"concurrent enrollment in {_join(names, 'or')}"
+    if kind == "classification":
+        return f"{_join(segment[1], 'or')} classification"
+    if kind == "not_open":
+        return f"not open to {segment[1]} classification"
+    raise ValueError(f"unknown segment kind {kind}")
+
+
+def render_description(segments: List[Segment], cross: Optional[Tuple[int, int]] = None) -> str:
+    parts = []
+    if segments:
+        label = "Prerequisite" if len(segments) == 1 else "Prerequisites"
+        body = "; ".join(render_segment(s) for s in segments)
+        parts.append(f"{label}: {body[0].upper()}{body[1:]}.")
+    if cross:
+        parts.append(f"Cross Listing: {course_text(cross[0])}/{course_text(cross[1])}.")
+    return " ".join(parts)
+
+
+# --- Bucket rendering ---
+# Same layout as the Spring2026 prereq JSON: top-level entries are ANDed, "." between
+# two entries ORs them, and leaves look like "CSCE221 C" or "CSCE221 C ^". Exam and
+# "or equivalent" alternatives are the non-course leaves "EXAM" and "EQUIVALENT",
+# which no transcript meets.
+EXAM_LEAF = "EXAM"
+EQUIVALENT_LEAF = "EQUIVALENT"
+
+
+def _leaf(course: int, grade: Optional[str], concurrent: bool) -> str:
+    leaf = f"{course_checker(course)} {grade or 'D'}"
+    return leaf + " ^" if concurrent else leaf
+
+
+def _or_list(items: list) -> list:
+    out = []
+    for item in items:
+        if out:
+            out.append(".")
+        out.append(item)
+    return out
+
+
+def render_bucket(segments: List[Segment]) -> list:
+    bucket = []
+    for segment in segments:
+        kind = segment[0]
+        if kind == "courses":
+            _, options, op, grade, concurrent, exam, equivalent = segment
+            if op == "or":
+                leaves = [_leaf(c, grade, concurrent) for opt in options for c in opt]
+                if exam:
+                    leaves.append(EXAM_LEAF)
+                if equivalent:
+                    leaves.append(EQUIVALENT_LEAF)
+                bucket.append(leaves[0] if len(leaves) == 1 else _or_list(leaves))
+            else:
+                group = []
+                for opt in options:
+                    leaves = [_leaf(c, grade, concurrent) for c in opt]
+                    group.append(leaves[0] if len(leaves) == 1 else _or_list(leaves))
+                bucket.append(group)
+        elif kind == "concurrent_in":
+            leaves = [_leaf(c, None, True) for opt in segment[1] for c in opt]
+            bucket.append(leaves[0] if len(leaves) == 1 else _or_list(leaves))
+        # classification and not-open-to clauses have no bucket form; they go in "info"
+    return bucket
+
+
+def render_info(segments: List[Segment], description: str, twin: Optional[int]) -> dict:
+    info = {"prereqs": render_bucket(segments), "description": description}
+    for segment in segments:
+        if segment[0] == "classification":
+            info["classification"] = [level.capitalize() for level in segment[1]]
+        elif segment[0] == "not_open":
+            info["not_open"] = segment[1].capitalize()
+        elif segment[0] == "courses" and segment[5]:
+            info["exam"] = segment[5]
+    if twin is not None:
+        info["cross"] = [course_key(twin)]
+    return info
+
+
+# --- Expected tree ---
+# What a correct parser should produce, in the canonical vocabulary of
+# prereq_parser/engines.py (before engines.canonical() normalizes it).
+def render_tree(segments: List[Segment]) -> tuple:
+    parts = []
+    for segment in segments:
+        kind = segment[0]
+        if kind == "courses":
+            # "or equivalent" names no course a parser could check, so it adds nothing here
+            _, options, op, _grade, concurrent, exam, _equivalent = segment
+            alts = [("OR",) + tuple(("COURSE", course_text(c)) for c in opt) for opt in options]
+            if op == "and":
+                parts.append(("AND",) + tuple(alts))
+                continue
+            if exam:
+                alts.append(("EXAM",))
+            if concurrent:
+                alts.append(("CONCURRENT",))
+            parts.append(("OR",) + tuple(alts))
+        elif kind == "concurrent_in":
+            alts = [("COURSE", course_text(c)) for opt in segment[1] for c in opt]
+            parts.append(("OR",) + tuple(alts) + (("CONCURRENT",),))
+        elif kind == "classification":
+            parts.append(("OR",) + tuple(("CLASSIFICATION", level.capitalize()) for level in segment[1]))
+        elif kind == "not_open":
+            parts.append(("NOT", ("CLASSIFICATION", segment[1].capitalize())))
+    return ("AND",) + tuple(parts)
+
+
+def _course_rng(index: int, seed: int) -> random.Random:
+    return random.Random(seed * 1_000_003 + index)
+
+
+def _cross_pair(index: int, seed: int, count: Optional[int]) -> Tuple[Optional[int], Optional[Tuple[int, int]]]:
+    twin = cross_listed_twin(index, seed)
+    if twin is None or (count is not None and twin >= count):
+        return None, None
+    return twin, (min(index, twin), max(index, twin))
+
+
+def generate_course(index: int, seed: int = 0, count: Optional[int] = None) -> Tuple[str, str]:
+    """(catalog key, description text) for course number `index` of a `count`-course catalog"""
+    segments = generate_segments(_course_rng(index, seed), index, seed)
+    _, cross = _cross_pair(index, seed, count)
+    return course_key(index), render_description(segments, cross)
+
+
+def generate_catalog_entry(index: int, seed: int = 0, count: Optional[int] = None) -> Tuple[str, dict]:
+    """(catalog key, {"info": {...}}) in the bucket JSON layout, with the matching description"""
+    segments = generate_segments(_course_rng(index, seed), index, seed)
+    twin, cross = _cross_pair(index, seed, count)
+    description = render_description(segments, cross)
+    return course_key(index), {"info": render_info(segments, description, twin)}
+
+
+def generate_expected(index: int, seed: int = 0) -> tuple:
+    """The tree a correct parser builds from generate_course(index, seed)"""
+    return render_tree(generate_segments(_course_rng(index, seed), index, seed))
+
+
+def generate_descriptions(count: int, seed: int = 0) -> Iterator[Tuple[str, str]]:
+    for index in range(count):
+        yield generate_course(index, seed, count)
+
+
+# --- Transcripts ---
+def generate_transcript(student: int, course_count: int, seed: int = 0) -> dict:
+    """
+    One student: a home department, a classification, taken courses with grades
+    ("CSCE221 B") and current enrollments ("CSCE313 ^"). Courses are drawn from the
+    lower numbers first, the way a real degree plan progresses.
+    """
+    rng = random.Random(f"{seed}:student:{student}")
+    dept_count = max(1, -(-course_count // COURSES_PER_DEPT))
+    home = rng.randrange(dept_count)
+    year = rng.randrange(len(CLASSIFICATIONS))
+    depth = min(COURSES_PER_DEPT, 60 + 100 * year)
+
+    picked = set()
+    for _ in range(rng.randint(4 * year, 8 * year + 6)):
+        dept = home if rng.random() < 0.7 else rng.randrange(dept_count)
+        index = dept * COURSES_PER_DEPT + int(depth * rng.random() ** 1.5)
+        if index < course_count:
+            picked.add(index)
+    ordered = sorted(picked)
+    enrolled_count = min(len(ordered), rng.randint(0, 5))
+    enrolled = ordered[len(ordered) - enrolled_count:]
+    taken = ordered[:len(ordered) - enrolled_count]
+
+    return {
+        "student": f"S{student:07d}",
+        "classification": CLASSIFICATIONS[year].capitalize(),
+        "taken": [f"{course_checker(c)} {rng.choice(TRANSCRIPT_GRADES)}" for c in taken],
+        "enrolled": [f"{course_checker(c)} ^" for c in enrolled],
+    }
+
+
+def generate_transcripts(students: int, course_count: int, seed: int = 0) -> Iterator[dict]:
+    for student in range(students):
+        yield generate_transcript(student, course_count, seed)
+
+
+# --- Streaming writers (one course / student in memory at a time) ---
+def write_catalog(path: str, count: int, seed: int = 0) -> None:
+    """Bucket-format catalog JSON: {"ACCT_100": {"info": {"prereqs": [...], ...}}, ...}"""
+    with open(path, "w") as f:
+        f.write("{\n")
+        for index in range(count):
+            key, entry = generate_catalog_entry(index, seed, count)
+            f.write(f"{json.dumps(key)}: {json.dumps(entry)}")
+            f.write(",\n" if index < count - 1 else "\n")
+        f.write("}\n")
+
+
+def write_descriptions(path: str, count: int, seed: int = 0) -> None:
+    """One {"course": "ACCT_100", "text": "..."} object per line"""
+    with open(path, "w") as f:
+        for key, text in generate_descriptions(count, seed):
+            f.write(json.dumps({"course": key, "text": text}) + "\n")
+
+
+def write_transcripts(path: str, students: int, course_count: int, seed: int = 0) -> None:
+    """One {"student", "classification", "taken", "enrolled"} object per line"""
+    with open(path, "w") as f:
+        for transcript in generate_transcripts(students, course_count, seed):
+            f.write(json.dumps(transcript) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic catalog and transcript generator")
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    catalog_parser = subparsers.add_parser("catalog", help="Generate a prerequisite catalog")
+    catalog_parser.add_argument("--courses", type=int, default=1000, help="Number of courses")
+    catalog_parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    catalog_parser.add_argument("--out", required=True, help="Bucket-format catalog JSON")
+    catalog_parser.add_argument("--descriptions", help="Also write description text as JSON lines")
+
+    transcript_parser = subparsers.add_parser("transcripts", help="Generate student transcripts")
+    transcript_parser.add_argument("--students", type=int, default=1000, help="Number of students")
+    transcript_parser.add_argument("--courses", type=int, default=1000, help="Catalog size the transcripts draw from")
+    transcript_parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    transcript_parser.add_argument("--out", required=True, help="Transcript JSON lines file")
+
+    args = parser.parse_args()
+    if args.command == "catalog":
+        write_catalog(args.out, args.courses, args.seed)
+        if args.descriptions:
+            write_descriptions(args.descriptions, args.courses, args.seed)
+    elif args.command == "transcripts":
+        write_transcripts(args.out, args.students, args.courses, args.seed)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Opt-in cProfile capture of a command or request, saved as a pstats file.
+
+run() profiles one call and writes the pstats file (load it later with
+pstats.Stats or snakeviz) plus a top-N table of where the time went,
+cumulative time first. With sample < 1 only that fraction of calls is
+profiled; the rest run untouched, so it can stay switched on in production.
+
+    result = cpu_profile.run(cmd_check, args, out="check.pstats", top=25)
+
+profiled() does the same for a function called over and over (a request
+handler, a per-student loop): sampled calls are folded into one pstats file,
+rewritten after each, so it always holds every sampled call so far.
+
+    @cpu_profile.profiled("requests.pstats", sample=0.01)
+    def handle(request): ...
+"""
+import cProfile
+import functools
+import io
+import pstats
+import random
+import time
+from typing import Callable, Optional
+
+DEFAULT_OUT = "profile.pstats"
+TOP = 25                # rows in the printed summary
+SORT = "cumulative"
+
+
+def summary(stats: pstats.Stats, top: int = TOP, sort: str = SORT) -> str:
+    """The top rows of a profile, as pstats prints them"""
+    text = io.StringIO()
+    stats.stream = text
+    stats.sort_stats(sort).print_stats(top)
+    return text.getvalue().strip("\n")
+
+
+def sampled(sample: float, rng: Callable[[], float] = random.random) -> bool:
+    """Whether to profile this call: always at 1, never at 0, else with probability `sample`"""
+    return sample >= 1 or (sample > 0 and rng() < sample)
+
+
+class Result:
+    """What run() recorded; stats is None when the call wasn't sampled"""
+
+    def __init__(self, value, stats: Optional[pstats.Stats] = None, seconds: float = 0.0,
+                 out: Optional[str] = None):
+        self.value = value
+        self.stats = stats
+        self.seconds = seconds
+        self.out = out
+
+    def table(self, top: int = TOP, sort: str = SORT) -> str:
+        return summary(self.stats, top, sort) if self.stats is not None else ""
+
+
+def run(func, *args, out: Optional[str] = DEFAULT_OUT, sample: float = 1.0, **kwargs) -> Result:
+    """
+    Call func(*args, **kwargs) under cProfile, for a `sample` fraction of calls.
+    The pstats file goes to out (None keeps it in memory only). The profile is
+    saved even if func raises.
+    """
+    if not sampled(sample):
+        return Result(func(*args, **kwargs))
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        value = profiler.runcall(func, *args, **kwargs)
+    finally:
+        seconds = time.perf_counter() - start
+        if out:
+            profiler.dump_stats(out)
+    return Result(value, pstats.Stats(profiler), seconds, out)
+
+
+def profiled(out: str = DEFAULT_OUT, sample: float = 1.0):
+    """
+    Decorator: profile a `sample` fraction of calls, accumulating them in out.
+    The wrapper counts calls and sampled calls, and keeps the combined
+    pstats.Stats in .stats (None until a call is sampled).
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            wrapper.calls += 1
+            if not sampled(sample):
+                return func(*args, **kwargs)
+            wrapper.sampled += 1
+            profiler = cProfile.Profile()
+            try:
+                return profiler.runcall(func, *args, **kwargs)
+            finally:
+                if wrapper.stats is None:
+                    wrapper.stats = pstats.Stats(profiler)
+                else:
+                    wrapper.stats.add(profiler)
+                wrapper.stats.dump_stats(out)
+        wrapper.calls = wrapper.sampled = 0
+        wrapper.stats = None
+        return wrapper
+    return decorate
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    def work(n):
+        return sum(sorted(str(i) for i in range(n)) == [] for _ in range(3)) + n
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "work.pstats")
+        result = run(work, 20000, out=out)
+        assert result.value == 20000 and result.seconds > 0
+        loaded = pstats.Stats(out)
+        assert any(name == "work" for _, _, name in loaded.stats), "work() missing from the profile"
+        table = result.table(top=5)
+        assert "cumulative" in table and "work" in table, table
+
+        assert run(work, 10, out=out, sample=0).stats is None
+        assert not sampled(0) and sampled(1) and sampled(0.5, lambda: 0.2) and not sampled(0.5, lambda: 0.7)
+
+        try:
+            run(lambda: 1 / 0, out=out)
+        except ZeroDivisionError:
+            assert os.path.getsize(out) > 0
+        else:
+            raise AssertionError("run() swallowed the exception")
+
+        many = os.path.join(tmp, "many.pstats")
+        handle = profiled(many, sample=0.5)(work)
+        random.seed(1)
+        assert [handle(100) for _ in range(40)] == [100] * 40
+        assert handle.calls == 40 and 0 < handle.sampled < 40 and handle.__name__ == "work"
+        calls = {name: stat[1] for (_, _, name), stat in pstats.Stats(many).stats.items()}
+        assert calls["work"] == handle.sampled, (calls["work"], handle.sampled)
+    print("ok")
@@ -0,0 +1,156 @@
+"""
+Opt-in tracemalloc memory profile of catalog loading and parsing, by phase.
+
+Nothing is traced until enable() is called; until then every mark() in the
+loader and bulk parser is a single `is not None` check. While enabled,
+tracemalloc traces every allocation (a few times slower, so this is a
+diagnostic mode, not something to leave on) and each mark(phase) ends a phase:
+
+    peak        most memory traced at any point during the phase
+    retained    memory still traced when the phase ended, and how much the
+                phase added to it (transient structures, like token lists,
+                show up in the peak but not here)
+    top         allocation sites (file:line) that grew the most in the phase
+
+    profile = memory_stats.enable()
+    catalog = load_catalog("catalog.json")      # marks read, decode, compile, ...
+    memory_stats.disable()
+    print(profile.table())
+    profile.to_json("memory.json")
+"""
+import json
+import time
+import tracemalloc
+from typing import List, Optional
+
+# Allocations made by the profiler itself, not the code being profiled
+_IGNORE = (tracemalloc.Filter(False, tracemalloc.__file__),
+           tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+           tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+           tracemalloc.Filter(False, "<unknown>"))
+
+
+MIN_SITE = 1024        # smaller growth is mostly the profiler's own bookkeeping
+
+
+def _site(stat) -> str:
+    frame = stat.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+class MemoryProfile:
+    def __init__(self, top: int = 10):
+        self.top = top                      # allocation sites kept per phase
+        self.phases: List[dict] = []
+        self._started_tracing = False
+        self._first = self._last = None     # snapshots at start and at the last mark
+        self._time = 0.0
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._first = self._last = tracemalloc.take_snapshot().filter_traces(_IGNORE)
+        tracemalloc.reset_peak()
+        self._time = time.perf_counter()
+
+    def mark(self, phase: str):
+        """End `phase`: record its peak, what it retained, and its top allocation sites"""
+        now = time.perf_counter()
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORE)
+        retained = sum(stat.size for stat in snapshot.statistics("filename"))
+        before = sum(stat.size for stat in self._last.statistics("filename"))
+        growth = snapshot.compare_to(self._last, "lineno")
+        self.phases.append({
+            "phase": phase,
+            "seconds": now - self._time,
+            "peak": peak,
+            "retained": retained,
+            "retained_delta": retained - before,
+            "top": [{"site": _site(stat), "size_diff": stat.size_diff, "count_diff": stat.count_diff,
+                     "size": stat.size} for stat in growth[:self.top] if stat.size_diff >= MIN_SITE],
+        })
+        self._last = snapshot
+        # the snapshot itself is untraced, but taking it moves the peak
+        tracemalloc.reset_peak()
+        self._time = time.perf_counter()
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def summary(self) -> dict:
+        retained = self.phases[-1]["retained"] if self.phases else 0
+        start = sum(stat.size for stat in self._first.statistics("filename")) if self._first else 0
+        return {
+            "peak": max((p["peak"] for p in self.phases), default=0),
+            "retained": retained,
+            "retained_delta": retained - start,
+            "phases": self.phases,
+        }
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        text = json.dumps(self.summary(), indent=4)
+        if path:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def table(self) -> str:
+        mb = 1 / (1 << 20)
+        lines = [f"{'phase':<20} {'seconds':>9} {'peak MB':>10} {'retained MB':>12} {'delta MB':>10}"]
+        for p in self.phases:
+            lines.append(f"{p['phase']:<20} {p['seconds']:>9.3f} {p['peak'] * mb:>10.2f} "
+                         f"{p['retained'] * mb:>12.2f} {p['retained_delta'] * mb:>+10.2f}")
+        for p in self.phases:
+            if p["top"]:
+                lines.append("")
+                lines.append(f"top allocation sites in {p['phase']}:")
+                for stat in p["top"][:5]:
+                    lines.append(f"  {stat['size_diff'] * mb:>+9.2f} MB {stat['count_diff']:>+10,}  {stat['site']}")
+        return "\n".join(lines)
+
+
+# The profile marks record into; None means profiling is off
+ACTIVE: Optional[MemoryProfile] = None
+
+
+def enable(profile: Optional[MemoryProfile] = None) -> MemoryProfile:
+    """Start tracing into `profile` (or a fresh MemoryProfile) and return it"""
+    global ACTIVE
+    ACTIVE = profile if profile is not None else MemoryProfile()
+    ACTIVE.start()
+    return ACTIVE
+
+
+def disable() -> Optional[MemoryProfile]:
+    """Stop tracing and return the profile"""
+    global ACTIVE
+    profile, ACTIVE = ACTIVE, None
+    if profile is not None:
+        profile.stop()
+    return profile
+
+
+def mark(phase: str):
+    """End a phase of the active profile; nothing when profiling is off"""
+    if ACTIVE is not None:
+        ACTIVE.mark(phase)
+
+
+if __name__ == "__main__":
+    profile = enable(MemoryProfile(top=3))
+    kept = [list(range(100)) for _ in range(2000)]
+    mark("build")
+    scratch = [str(i) * 50 for i in range(20000)]
+    del scratch
+    mark("transient")
+    disable()
+    build, transient = profile.phases
+    assert build["retained_delta"] > 1_000_000 and "memory_stats.py" in build["top"][0]["site"], build
+    assert transient["peak"] > transient["retained"] + 1_000_000 and abs(transient["retained_delta"]) < 100_000
+    assert not tracemalloc.is_tracing() and mark("ignored") is None
+    print(profile.table())
+    print("ok")
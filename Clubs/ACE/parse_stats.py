@@ -0,0 +1,92 @@
+"""
+Opt-in per-phase counters and timers for the CP10 parsing pipeline.
+
+Nothing is recorded until enable() is called; while disabled every probe in
+CP10 is a single `is not None` check. While enabled each probe is one
+perf_counter_ns() pair and a dict update, so it is cheap enough to leave on
+for a whole production run.
+
+    stats = parse_stats.enable()
+    trees = [CP10.parse_text_to_tree(t) for t in texts]
+    parse_stats.disable()
+    print(stats.table())
+"""
+import json
+from typing import Dict, Optional
+
+# Phase names recorded by CP10
+PHASES = ("split", "tokenize", "descent", "parse_text_to_tree")
+
+
+class ParseStats:
+    def __init__(self):
+        self.calls: Dict[str, int] = {}      # phase -> number of timed calls
+        self.time_ns: Dict[str, int] = {}    # phase -> total nanoseconds
+        self.counters: Dict[str, int] = {}   # event -> count (tokens, segments, parse_factor calls...)
+
+    def add_time(self, phase: str, elapsed_ns: int):
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        self.time_ns[phase] = self.time_ns.get(phase, 0) + elapsed_ns
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, other: "ParseStats"):
+        """Fold another run (e.g. from a worker) into this one"""
+        for phase, n in other.calls.items():
+            self.calls[phase] = self.calls.get(phase, 0) + n
+        for phase, ns in other.time_ns.items():
+            self.time_ns[phase] = self.time_ns.get(phase, 0) + ns
+        for name, n in other.counters.items():
+            self.count(name, n)
+
+    def summary(self) -> dict:
+        phases = {}
+        for phase in sorted(self.time_ns, key=lambda p: PHASES.index(p) if p in PHASES else len(PHASES)):
+            ns = self.time_ns[phase]
+            calls = self.calls[phase]
+            phases[phase] = {
+                "calls": calls,
+                "total_ms": ns / 1e6,
+                "mean_us": ns / calls / 1e3 if calls else 0.0,
+            }
+        return {"phases": phases, "counters": dict(sorted(self.counters.items()))}
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        text = json.dumps(self.summary(), indent=4)
+        if path:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def table(self) -> str:
+        summary = self.summary()
+        total = self.time_ns.get("parse_text_to_tree") or sum(self.time_ns.values()) or 1
+        lines = [f"{'phase':<20} {'calls':>10} {'total ms':>12} {'mean us':>10} {'share':>7}"]
+        for phase, row in summary["phases"].items():
+            share = self.time_ns[phase] / total
+            lines.append(f"{phase:<20} {row['calls']:>10,} {row['total_ms']:>12.2f} {row['mean_us']:>10.2f} {share:>7.1%}")
+        if summary["counters"]:
+            lines.append("")
+            lines.append(f"{'counter':<20} {'count':>10}")
+            for name, n in summary["counters"].items():
+                lines.append(f"{name:<20} {n:>10,}")
+        return "\n".join(lines)
+
+
+# The stats object CP10 records into; None means instrumentation is off
+ACTIVE: Optional[ParseStats] = None
+
+
+def enable(stats: Optional[ParseStats] = None) -> ParseStats:
+    """Start recording into `stats` (or a fresh ParseStats) and return it"""
+    global ACTIVE
+    ACTIVE = stats if stats is not None else ParseStats()
+    return ACTIVE
+
+
+def disable() -> Optional[ParseStats]:
+    """Stop recording and return what was collected"""
+    global ACTIVE
+    stats, ACTIVE = ACTIVE, None
+    return stats